@@ -0,0 +1,166 @@
+"""
+CPU latency / peak-memory benchmarks for the Depth Anything V2 inference paths.
+
+    python benchmark.py attention --encoder vits --input-size 518
+    python benchmark.py fuse --encoder vits --input-size 518 --use-bn
+"""
+
+import argparse
+import multiprocessing as mp
+import resource
+import time
+
+import torch
+
+from depth_anything_v2.dpt import DepthAnythingV2
+from depth_anything_v2.dinov2_layers.attention import Attention, SDPA_AVAILABLE
+from depth_anything_v2.util.fuse import fuse_for_inference
+
+
+model_configs = {
+    'vits': {'encoder': 'vits', 'features': 64, 'out_channels': [48, 96, 192, 384]},
+    'vitb': {'encoder': 'vitb', 'features': 128, 'out_channels': [96, 192, 384, 768]},
+    'vitl': {'encoder': 'vitl', 'features': 256, 'out_channels': [256, 512, 1024, 1024]},
+    'vitg': {'encoder': 'vitg', 'features': 384, 'out_channels': [1536, 1536, 1536, 1536]}
+}
+
+
+def timeit(fn, warmup=3, iters=10):
+    with torch.no_grad():
+        for _ in range(warmup):
+            fn()
+        start = time.perf_counter()
+        for _ in range(iters):
+            fn()
+    return (time.perf_counter() - start) * 1000 / iters
+
+
+def _peak_rss_worker(fn, queue):
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    with torch.no_grad():
+        fn()
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    queue.put((after - before) / 1024)  # ru_maxrss is KiB on Linux
+
+
+def peak_memory_mb(fn):
+    """Peak RSS increase (MiB) of a single call, measured in a forked child so runs don't mask each other."""
+    ctx = mp.get_context('fork')
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_peak_rss_worker, args=(fn, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def set_fused_attn(model, enabled):
+    for module in model.modules():
+        if isinstance(module, Attention):
+            module.fused_attn = enabled
+
+
+def bench_attention(args):
+    torch.set_num_threads(args.threads)
+
+    model = DepthAnythingV2(**model_configs[args.encoder]).eval()
+    patch = args.input_size // 14
+    x = torch.randn(1, 3, patch * 14, patch * 14)
+
+    # tokens as the blocks see them: cls + patch tokens
+    tokens = model.pretrained.prepare_tokens_with_masks(x).detach()
+    block = model.pretrained.blocks[0]
+
+    print(f'encoder={args.encoder}, input={patch * 14}px, tokens={tokens.shape[1]}, threads={args.threads}, SDPA available: {SDPA_AVAILABLE}')
+
+    # numerical equivalence first
+    with torch.no_grad():
+        set_fused_attn(model, False)
+        ref_block, ref_model = block(tokens), model(x)
+        set_fused_attn(model, True)
+        new_block, new_model = block(tokens), model(x)
+    print(f'max |diff| block: {(ref_block - new_block).abs().max().item():.3e}, '
+          f'end-to-end: {(ref_model - new_model).abs().max().item():.3e}')
+
+    rows = []
+    for name, fused in (('manual', False), ('sdpa', True)):
+        set_fused_attn(model, fused)
+        rows.append((
+            name,
+            timeit(lambda: block(tokens), iters=args.iters * 5),
+            peak_memory_mb(lambda: block(tokens)),
+            timeit(lambda: model(x), iters=args.iters),
+            peak_memory_mb(lambda: model(x)),
+        ))
+
+    print('{:>8} | {:>14} | {:>15} | {:>12} | {:>13}'.format('attn', 'block ms', 'block peak MiB', 'e2e ms', 'e2e peak MiB'))
+    for row in rows:
+        print('{:>8} | {:14.2f} | {:15.1f} | {:12.2f} | {:13.1f}'.format(*row))
+
+
+def bench_fuse(args):
+    torch.set_num_threads(args.threads)
+
+    model = DepthAnythingV2(**model_configs[args.encoder], use_bn=args.use_bn).eval()
+    if args.use_bn:
+        # untrained BN is the identity; give it real statistics so folding is actually exercised
+        for module in model.modules():
+            if isinstance(module, torch.nn.BatchNorm2d):
+                module.running_mean.uniform_(-0.5, 0.5)
+                module.running_var.uniform_(0.5, 2.0)
+                torch.nn.init.uniform_(module.weight, 0.5, 1.5)
+                torch.nn.init.uniform_(module.bias, -0.5, 0.5)
+
+    patch = args.input_size // 14
+    x = torch.randn(1, 3, patch * 14, patch * 14)
+
+    with torch.no_grad():
+        traced = torch.jit.freeze(torch.jit.trace(model, x))
+    fused = fuse_for_inference(model, x)
+
+    # the head alone (eager, the grid size is a python int), on the encoder features it would receive
+    with torch.no_grad():
+        features = model.pretrained.get_intermediate_layers(x, model.layer_idx, return_class_token=True)
+    head = model.depth_head
+    fused_head = fuse_for_inference(head)
+
+    print(f'encoder={args.encoder}, input={patch * 14}px, use_bn={args.use_bn}, threads={args.threads}')
+
+    with torch.no_grad():
+        ref = model(x)
+        ref_head = head(features, patch, patch)
+        print(f'max |diff| head: {(ref_head - fused_head(features, patch, patch)).abs().max().item():.3e}, '
+              f'end-to-end: {(ref - fused(x)).abs().max().item():.3e} (depth range {ref.min().item():.3f}..{ref.max().item():.3f})')
+
+    rows = [
+        ('eager', timeit(lambda: head(features, patch, patch), iters=args.iters * 5), timeit(lambda: model(x), iters=args.iters)),
+        ('traced', None, timeit(lambda: traced(x), iters=args.iters)),
+        ('fused', timeit(lambda: fused_head(features, patch, patch), iters=args.iters * 5), timeit(lambda: fused(x), iters=args.iters)),
+    ]
+
+    print('{:>8} | {:>10} | {:>10}'.format('mode', 'head ms', 'e2e ms'))
+    for name, head_ms, e2e_ms in rows:
+        print('{:>8} | {:>10} | {:10.2f}'.format(name, '-' if head_ms is None else f'{head_ms:.2f}', e2e_ms))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Depth Anything V2 CPU benchmarks')
+    subparsers = parser.add_subparsers(dest='bench', required=True)
+
+    attention = subparsers.add_parser('attention', help='manual softmax attention vs fused scaled_dot_product_attention')
+    attention.add_argument('--encoder', type=str, default='vits', choices=['vits', 'vitb', 'vitl', 'vitg'])
+    attention.add_argument('--input-size', type=int, default=518)
+    attention.add_argument('--threads', type=int, default=torch.get_num_threads())
+    attention.add_argument('--iters', type=int, default=10)
+    attention.set_defaults(func=bench_attention)
+
+    fuse = subparsers.add_parser('fuse', help='eager vs traced vs fuse_for_inference (BN folding, conv/upsample reorder)')
+    fuse.add_argument('--encoder', type=str, default='vits', choices=['vits', 'vitb', 'vitl', 'vitg'])
+    fuse.add_argument('--input-size', type=int, default=518)
+    fuse.add_argument('--use-bn', action='store_true', help='build the head with BatchNorm to measure BN folding')
+    fuse.add_argument('--threads', type=int, default=torch.get_num_threads())
+    fuse.add_argument('--iters', type=int, default=10)
+    fuse.set_defaults(func=bench_fuse)
+
+    args = parser.parse_args()
+    args.func(args)
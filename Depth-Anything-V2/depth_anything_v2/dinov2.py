@@ -18,6 +18,7 @@ import torch.utils.checkpoint
 from torch.nn.init import trunc_normal_
 
 from .dinov2_layers import Mlp, PatchEmbed, SwiGLUFFNFused, MemEffAttention, NestedTensorBlock as Block
+from .dinov2_layers.token_merge import TokenMerger
 
 
 logger = logging.getLogger("dinov2")
@@ -268,19 +269,27 @@ class DinoVisionTransformer(nn.Module):
             "masks": masks,
         }
 
-    def _get_intermediate_layers_not_chunked(self, x, n=1):
+    def _get_intermediate_layers_not_chunked(self, x, n=1, merge_ratio=0.0):
         x = self.prepare_tokens_with_masks(x)
         # If n is an int, take the n last blocks. If it's a list, take them
         output, total_block_len = [], len(self.blocks)
         blocks_to_take = range(total_block_len - n, total_block_len) if isinstance(n, int) else n
+        # Token merging: shrink the sequence between blocks, restore the full grid for every read-out
+        merger = TokenMerger(x, merge_ratio, protected=1 + self.num_register_tokens) if merge_ratio > 0 else None
         for i, blk in enumerate(self.blocks):
             x = blk(x)
             if i in blocks_to_take:
-                output.append(x)
+                output.append(merger.unmerge(x) if merger is not None else x)
+            if i >= max(blocks_to_take):
+                # nothing after the last read-out layer is used
+                break
+            if merger is not None:
+                x = merger.step(x)
         assert len(output) == len(blocks_to_take), f"only {len(output)} / {len(blocks_to_take)} blocks found"
         return output
 
-    def _get_intermediate_layers_chunked(self, x, n=1):
+    def _get_intermediate_layers_chunked(self, x, n=1, merge_ratio=0.0):
+        assert merge_ratio == 0, "token merging is not supported with chunked blocks"
         x = self.prepare_tokens_with_masks(x)
         output, i, total_block_len = [], 0, len(self.blocks[-1])
         # If n is an int, take the n last blocks. If it's a list, take them
@@ -300,12 +309,13 @@ class DinoVisionTransformer(nn.Module):
         n: Union[int, Sequence] = 1,  # Layers or n last layers to take
         reshape: bool = False,
         return_class_token: bool = False,
-        norm=True
+        norm=True,
+        merge_ratio: float = 0.0,  # Fraction of tokens merged after each block (ToMe), 0 disables
     ) -> Tuple[Union[torch.Tensor, Tuple[torch.Tensor]]]:
         if self.chunked_blocks:
-            outputs = self._get_intermediate_layers_chunked(x, n)
+            outputs = self._get_intermediate_layers_chunked(x, n, merge_ratio)
         else:
-            outputs = self._get_intermediate_layers_not_chunked(x, n)
+            outputs = self._get_intermediate_layers_not_chunked(x, n, merge_ratio)
         if norm:
             outputs = [self.norm(out) for out in outputs]
         class_tokens = [out[:, 0] for out in outputs]
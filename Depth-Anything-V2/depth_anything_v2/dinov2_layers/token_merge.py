@@ -0,0 +1,116 @@
+# References:
+#   Token Merging: Your ViT But Faster (Bolya et al., ICLR 2023)
+#   https://github.com/facebookresearch/ToMe/blob/main/tome/merge.py
+
+import math
+from typing import Callable, Tuple
+
+import torch
+from torch import Tensor
+
+
+def do_nothing(x: Tensor) -> Tensor:
+    return x
+
+
+def bipartite_soft_matching(
+    metric: Tensor,
+    r: int,
+    protected: int = 1,
+) -> Tuple[Callable[[Tensor], Tensor], Callable[[Tensor], Tensor]]:
+    """
+    Split the tokens into alternating sets A and B and merge the r most similar A tokens into their
+    best match in B. The first `protected` tokens (class / register tokens) are never merged.
+
+    Returns (merge, unmerge). `merge` maps (B, N, C) -> (B, N - r, C) by summing merged tokens
+    (callers divide by the merged size to get a weighted mean), `unmerge` maps (B, N - r, C) back to
+    (B, N, C) by copying every merged token to all of its source positions.
+    """
+    N = metric.shape[1]
+    # only tokens in A can be merged away and the protected ones live in A too
+    r = min(r, (N - protected) // 2)
+    if r <= 0:
+        return do_nothing, do_nothing
+
+    with torch.no_grad():
+        metric = metric / metric.norm(dim=-1, keepdim=True)
+        a, b = metric[..., ::2, :], metric[..., 1::2, :]
+        scores = a @ b.transpose(-1, -2)
+
+        # protected tokens sit at even positions < protected, i.e. at the head of A, or at odd
+        # positions, i.e. at the head of B; exclude both from matching
+        scores[..., : math.ceil(protected / 2), :] = -math.inf
+        scores[..., :, : protected // 2] = -math.inf
+
+        node_max, node_idx = scores.max(dim=-1)
+        edge_idx = node_max.argsort(dim=-1, descending=True)[..., None]
+
+        unm_idx = edge_idx[..., r:, :]  # unmerged tokens in A
+        src_idx = edge_idx[..., :r, :]  # merged tokens in A
+        dst_idx = node_idx[..., None].gather(dim=-2, index=src_idx)
+
+        # keep the surviving A tokens in their original order (class token stays first)
+        unm_idx = unm_idx.sort(dim=-2)[0]
+
+    def merge(x: Tensor) -> Tensor:
+        src, dst = x[..., ::2, :], x[..., 1::2, :]
+        n, t1, c = src.shape
+        unm = src.gather(dim=-2, index=unm_idx.expand(n, t1 - r, c))
+        src = src.gather(dim=-2, index=src_idx.expand(n, r, c))
+        dst = dst.scatter_reduce(-2, dst_idx.expand(n, r, c), src, reduce="sum")
+        return torch.cat([unm, dst], dim=1)
+
+    def unmerge(x: Tensor) -> Tensor:
+        unm_len = unm_idx.shape[1]
+        unm, dst = x[..., :unm_len, :], x[..., unm_len:, :]
+        n, _, c = unm.shape
+
+        src = dst.gather(dim=-2, index=dst_idx.expand(n, r, c))
+
+        out = torch.zeros(n, N, c, device=x.device, dtype=x.dtype)
+        out[..., 1::2, :] = dst
+        out.scatter_(dim=-2, index=(2 * unm_idx).expand(n, unm_len, c), src=unm)
+        out.scatter_(dim=-2, index=(2 * src_idx).expand(n, r, c), src=src)
+        return out
+
+    return merge, unmerge
+
+
+def merge_wavg(merge: Callable[[Tensor], Tensor], x: Tensor, size: Tensor) -> Tuple[Tensor, Tensor]:
+    """
+    Apply `merge` as a size-weighted average. `size` (B, N, 1) counts how many original
+    patch tokens each current token represents.
+    """
+    x = merge(x * size)
+    size = merge(size)
+    return x / size, size
+
+
+class TokenMerger:
+    """
+    Bookkeeping for merging tokens between transformer blocks and restoring the full
+    token grid for the layers that are read out.
+
+    Each call to `step` removes `ratio` of the current mergeable tokens (at most half of them,
+    the bipartite matching limit); `unmerge` undoes all steps taken so far.
+    """
+
+    def __init__(self, x: Tensor, ratio: float, protected: int = 1):
+        self.ratio = ratio
+        self.protected = protected
+        self.size = torch.ones_like(x[..., :1])
+        self.unmerges = []
+
+    def step(self, x: Tensor) -> Tensor:
+        r = int((x.shape[1] - self.protected) * self.ratio)
+        merge, unmerge = bipartite_soft_matching(x, r, self.protected)
+        if merge is do_nothing:
+            return x
+        x, self.size = merge_wavg(merge, x, self.size)
+        self.unmerges.append(unmerge)
+        return x
+
+    def unmerge(self, x: Tensor) -> Tensor:
+        for unmerge in reversed(self.unmerges):
+            x = unmerge(x)
+        return x
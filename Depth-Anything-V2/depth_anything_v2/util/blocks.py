@@ -120,6 +120,9 @@ class FeatureFusionBlock(nn.Module):
 
         self.size=size
 
+        # 1x1 out_conv commutes with bilinear upsampling; fuse_for_inference runs it first
+        self.conv_before_upsample = False
+
     def forward(self, *xs, size=None):
         """Forward pass.
 
@@ -141,8 +144,12 @@ class FeatureFusionBlock(nn.Module):
         else:
             modifier = {"size": size}
 
+        if self.conv_before_upsample:
+            output = self.out_conv(output)
+
         output = nn.functional.interpolate(output, **modifier, mode="bilinear", align_corners=self.align_corners)
         
-        output = self.out_conv(output)
+        if not self.conv_before_upsample:
+            output = self.out_conv(output)
 
         return output
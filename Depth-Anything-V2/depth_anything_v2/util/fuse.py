@@ -0,0 +1,80 @@
+"""
+Inference-time graph folding for the DPT head.
+
+    model = DepthAnythingV2(...).eval()
+    fused = fuse_for_inference(model, torch.randn(1, 3, 518, 518))
+
+- BatchNorm (use_bn=True) is folded into the preceding conv.
+- The 1x1 `out_conv` of each FeatureFusionBlock runs before the bilinear upsample instead of
+  after it. Both are linear per pixel and the interpolation weights sum to one, so the result
+  is the same while the conv touches 4x fewer pixels.
+- `Identity` layers are dropped from Sequentials (tracing removes the remaining ones).
+
+The traced module is specialized to the example input's resolution.
+"""
+
+import copy
+
+import torch
+import torch.nn as nn
+
+from .blocks import FeatureFusionBlock, ResidualConvUnit
+
+
+@torch.no_grad()
+def fuse_conv_bn(conv, bn):
+    """Return a new conv equivalent to bn(conv(x)) in eval mode."""
+    fused = copy.deepcopy(conv)
+
+    scale = bn.weight / torch.sqrt(bn.running_var + bn.eps)
+    bias = conv.bias if conv.bias is not None else torch.zeros_like(bn.running_mean)
+
+    fused.weight.copy_(conv.weight * scale.reshape(-1, 1, 1, 1))
+    fused.bias = nn.Parameter(bn.bias + (bias - bn.running_mean) * scale)
+
+    return fused
+
+
+def _fuse_sequential(seq):
+    layers = []
+    for layer in seq:
+        if isinstance(layer, nn.BatchNorm2d) and layers and isinstance(layers[-1], nn.Conv2d):
+            layers[-1] = fuse_conv_bn(layers[-1], layer)
+        elif not isinstance(layer, nn.Identity):
+            layers.append(layer)
+    return nn.Sequential(*layers)
+
+
+def _fuse_modules(module):
+    for name, child in module.named_children():
+        if isinstance(child, nn.Sequential):
+            setattr(module, name, _fuse_sequential(child))
+        _fuse_modules(getattr(module, name))
+
+    if isinstance(module, ResidualConvUnit) and module.bn:
+        module.conv1 = fuse_conv_bn(module.conv1, module.bn1)
+        module.conv2 = fuse_conv_bn(module.conv2, module.bn2)
+        del module.bn1, module.bn2
+        module.bn = False
+
+    if isinstance(module, FeatureFusionBlock):
+        module.conv_before_upsample = True
+
+
+def fuse_for_inference(model, example_input=None, freeze=True):
+    """
+    Fold the model for inference. The input model is left untouched.
+
+    Returns the fused eager module when `example_input` is None (e.g. for ONNX export),
+    otherwise a module traced on `example_input` and, with `freeze`, passed through
+    torch.jit.freeze.
+    """
+    fused = copy.deepcopy(model).eval()
+    _fuse_modules(fused)
+
+    if example_input is None:
+        return fused
+
+    with torch.no_grad():
+        traced = torch.jit.trace(fused, example_input)
+    return torch.jit.freeze(traced) if freeze else traced
@@ -0,0 +1,52 @@
+import cv2
+import torch
+from torch.utils.data import Dataset
+from torchvision.transforms import Compose
+
+from dataset.transform import Resize, NormalizeImage, PrepareForNet, Crop
+
+
+class UnlabeledFrames(Dataset):
+    """Plain RGB frames (one path per line) for distillation; depth targets come from the teacher."""
+    
+    def __init__(self, filelist_path, mode, size=(518, 518)):
+        if mode != 'train':
+            raise NotImplementedError
+        
+        self.mode = mode
+        self.size = size
+        
+        with open(filelist_path, 'r') as f:
+            self.filelist = [line.split(' ')[0] for line in f.read().splitlines() if line.strip()]
+        
+        net_w, net_h = size
+        self.transform = Compose([
+            Resize(
+                width=net_w,
+                height=net_h,
+                resize_target=False,
+                keep_aspect_ratio=True,
+                ensure_multiple_of=14,
+                resize_method='lower_bound',
+                image_interpolation_method=cv2.INTER_CUBIC,
+            ),
+            NormalizeImage(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
+            PrepareForNet(),
+            Crop(size[0]),
+        ])
+    
+    def __getitem__(self, item):
+        img_path = self.filelist[item]
+        
+        image = cv2.imread(img_path)
+        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB) / 255.0
+        
+        sample = self.transform({'image': image})
+        
+        sample['image'] = torch.from_numpy(sample['image'])
+        sample['image_path'] = img_path
+        
+        return sample
+    
+    def __len__(self):
+        return len(self.filelist)
@@ -12,6 +12,7 @@ import logging
 
 from torch import Tensor
 from torch import nn
+import torch.nn.functional as F
 
 
 logger = logging.getLogger("dinov2")
@@ -26,6 +27,11 @@ except ImportError:
     XFORMERS_AVAILABLE = False
 
 
+# PyTorch >= 2.0 ships a fused attention kernel (flash / memory-efficient / math
+# backends) that also works on CPU, so we can skip materializing the N x N matrix.
+SDPA_AVAILABLE = hasattr(F, "scaled_dot_product_attention")
+
+
 class Attention(nn.Module):
     def __init__(
         self,
@@ -45,18 +51,26 @@ class Attention(nn.Module):
         self.attn_drop = nn.Dropout(attn_drop)
         self.proj = nn.Linear(dim, dim, bias=proj_bias)
         self.proj_drop = nn.Dropout(proj_drop)
+        self.fused_attn = SDPA_AVAILABLE
 
     def forward(self, x: Tensor) -> Tensor:
         B, N, C = x.shape
         qkv = self.qkv(x).reshape(B, N, 3, self.num_heads, C // self.num_heads).permute(2, 0, 3, 1, 4)
 
-        q, k, v = qkv[0] * self.scale, qkv[1], qkv[2]
-        attn = q @ k.transpose(-2, -1)
+        if self.fused_attn:
+            q, k, v = qkv[0], qkv[1], qkv[2]
+            # default SDPA scale is head_dim ** -0.5, identical to self.scale
+            x = F.scaled_dot_product_attention(q, k, v, dropout_p=self.attn_drop.p if self.training else 0.0)
+        else:
+            q, k, v = qkv[0] * self.scale, qkv[1], qkv[2]
+            attn = q @ k.transpose(-2, -1)
+
+            attn = attn.softmax(dim=-1)
+            attn = self.attn_drop(attn)
 
-        attn = attn.softmax(dim=-1)
-        attn = self.attn_drop(attn)
+            x = attn @ v
 
-        x = (attn @ v).transpose(1, 2).reshape(B, N, C)
+        x = x.transpose(1, 2).reshape(B, N, C)
         x = self.proj(x)
         x = self.proj_drop(x)
         return x
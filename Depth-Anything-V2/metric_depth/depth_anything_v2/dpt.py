@@ -157,7 +157,8 @@ class DepthAnythingV2(nn.Module):
         out_channels=[256, 512, 1024, 1024], 
         use_bn=False, 
         use_clstoken=False,
-        max_depth=20.0
+        max_depth=20.0,
+        shallow=False
     ):
         super(DepthAnythingV2, self).__init__()
         
@@ -168,6 +169,17 @@ class DepthAnythingV2(nn.Module):
             'vitg': [9, 19, 29, 39]
         }
         
+        # Shallow (fast) mode: tap earlier layers and stop the encoder after the last one,
+        # ~2/3 of the encoder cost. The DPT head needs fine-tuning for these features
+        # (metric_depth/train.py --shallow).
+        self.shallow_layer_idx = {
+            'vits': [1, 3, 5, 7],
+            'vitb': [1, 3, 5, 7],
+            'vitl': [3, 7, 11, 15],
+            'vitg': [6, 13, 19, 26]
+        }
+        self.shallow = shallow
+        
         self.max_depth = max_depth
         
         self.encoder = encoder
@@ -175,20 +187,26 @@ class DepthAnythingV2(nn.Module):
         
         self.depth_head = DPTHead(self.pretrained.embed_dim, features, use_bn, out_channels=out_channels, use_clstoken=use_clstoken)
     
-    def forward(self, x):
+    @property
+    def layer_idx(self):
+        return self.shallow_layer_idx[self.encoder] if self.shallow else self.intermediate_layer_idx[self.encoder]
+    
+    def forward(self, x, merge_ratio=0.0):
         patch_h, patch_w = x.shape[-2] // 14, x.shape[-1] // 14
         
-        features = self.pretrained.get_intermediate_layers(x, self.intermediate_layer_idx[self.encoder], return_class_token=True)
+        features = self.pretrained.get_intermediate_layers(
+            x, self.layer_idx, return_class_token=True, merge_ratio=merge_ratio
+        )
         
         depth = self.depth_head(features, patch_h, patch_w) * self.max_depth
         
         return depth.squeeze(1)
     
     @torch.no_grad()
-    def infer_image(self, raw_image, input_size=518):
+    def infer_image(self, raw_image, input_size=518, merge_ratio=0.0):
         image, (h, w) = self.image2tensor(raw_image, input_size)
         
-        depth = self.forward(image)
+        depth = self.forward(image, merge_ratio=merge_ratio)
         
         depth = F.interpolate(depth[:, None], (h, w), mode="bilinear", align_corners=True)[0, 0]
         
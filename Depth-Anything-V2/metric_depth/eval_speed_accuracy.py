@@ -0,0 +1,122 @@
+import argparse
+import time
+
+import torch
+import torch.nn.functional as F
+from torch.utils.data import DataLoader
+
+from dataset.hypersim import Hypersim
+from dataset.kitti import KITTI
+from depth_anything_v2.dpt import DepthAnythingV2
+from student.tiny_depth import TinyDepthNet
+from util.metric import eval_depth
+
+
+parser = argparse.ArgumentParser(description='Depth Anything V2 accuracy vs. latency for the fast inference modes')
+
+parser.add_argument('--encoder', default='vits', choices=['vits', 'vitb', 'vitl', 'vitg'])
+parser.add_argument('--dataset', default='hypersim', choices=['hypersim', 'kitti'])
+parser.add_argument('--img-size', default=518, type=int)
+parser.add_argument('--min-depth', default=0.001, type=float)
+parser.add_argument('--max-depth', default=20, type=float)
+parser.add_argument('--load-from', type=str, required=True)
+parser.add_argument('--max-samples', default=200, type=int)
+parser.add_argument('--threads', default=torch.get_num_threads(), type=int)
+parser.add_argument('--merge-ratios', default=[0.0, 0.1, 0.2, 0.3], type=float, nargs='+',
+                    help='token merging ratios to evaluate (0 = full model)')
+parser.add_argument('--shallow-load-from', type=str,
+                    help='checkpoint trained with train.py --shallow, adds a shallow-encoder row')
+parser.add_argument('--student-load-from', type=str,
+                    help='checkpoint trained with train.py --distill, adds a TinyDepthNet student row')
+
+
+def evaluate(model, valloader, args, device, **forward_kwargs):
+    metrics = {'d1': 0.0, 'd2': 0.0, 'd3': 0.0, 'abs_rel': 0.0, 'sq_rel': 0.0, 'rmse': 0.0, 'rmse_log': 0.0, 'log10': 0.0, 'silog': 0.0}
+    nsamples, total_time = 0, 0.0
+
+    for i, sample in enumerate(valloader):
+        if i >= args.max_samples:
+            break
+
+        img, depth, valid_mask = sample['image'].to(device).float(), sample['depth'].to(device)[0], sample['valid_mask'].to(device)[0]
+
+        # Skip before inference so skipped samples do not count towards the timing
+        valid_mask = (valid_mask == 1) & (depth >= args.min_depth) & (depth <= args.max_depth)
+
+        if valid_mask.sum() < 10:
+            continue
+
+        with torch.no_grad():
+            # CUDA launches are asynchronous: synchronize so only this forward pass is timed
+            if device == 'cuda':
+                torch.cuda.synchronize()
+            start = time.perf_counter()
+            pred = model(img, **forward_kwargs)
+            if device == 'cuda':
+                torch.cuda.synchronize()
+            total_time += time.perf_counter() - start
+            pred = F.interpolate(pred[:, None], depth.shape[-2:], mode='bilinear', align_corners=True)[0, 0]
+
+        cur_results = eval_depth(pred[valid_mask], depth[valid_mask])
+
+        for k in metrics.keys():
+            metrics[k] += cur_results[k]
+        nsamples += 1
+
+    metrics = {k: v / max(nsamples, 1) for k, v in metrics.items()}
+    metrics['ms'] = total_time * 1000 / max(nsamples, 1)
+    metrics['params_m'] = sum(p.numel() for p in model.parameters()) / 1e6
+    return metrics
+
+
+def load_checkpoint(model, path):
+    state_dict = torch.load(path, map_location='cpu')
+    state_dict = state_dict.get('model', state_dict)  # train.py checkpoints wrap the (DDP) state dict
+    model.load_state_dict({k.replace('module.', '', 1): v for k, v in state_dict.items()})
+    return model
+
+
+def main():
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+
+    size = (args.img_size, args.img_size)
+    if args.dataset == 'hypersim':
+        valset = Hypersim('dataset/splits/hypersim/val.txt', 'val', size=size)
+    else:
+        valset = KITTI('dataset/splits/kitti/val.txt', 'val', size=size)
+    valloader = DataLoader(valset, batch_size=1, num_workers=2, drop_last=True)
+
+    model_configs = {
+        'vits': {'encoder': 'vits', 'features': 64, 'out_channels': [48, 96, 192, 384]},
+        'vitb': {'encoder': 'vitb', 'features': 128, 'out_channels': [96, 192, 384, 768]},
+        'vitl': {'encoder': 'vitl', 'features': 256, 'out_channels': [256, 512, 1024, 1024]},
+        'vitg': {'encoder': 'vitg', 'features': 384, 'out_channels': [1536, 1536, 1536, 1536]}
+    }
+    model = DepthAnythingV2(**{**model_configs[args.encoder], 'max_depth': args.max_depth})
+    model.load_state_dict(torch.load(args.load_from, map_location='cpu'))
+    model = model.to(device).eval()
+
+    rows = []
+    for ratio in args.merge_ratios:
+        rows.append((f'merge={ratio:.2f}', evaluate(model, valloader, args, device, merge_ratio=ratio)))
+
+    if args.shallow_load_from:
+        shallow_model = DepthAnythingV2(**{**model_configs[args.encoder], 'max_depth': args.max_depth, 'shallow': True})
+        shallow_model = load_checkpoint(shallow_model, args.shallow_load_from).to(device).eval()
+        rows.append(('shallow', evaluate(shallow_model, valloader, args, device)))
+
+    if args.student_load_from:
+        student = load_checkpoint(TinyDepthNet(max_depth=args.max_depth), args.student_load_from).to(device).eval()
+        rows.append(('student', evaluate(student, valloader, args, device)))
+
+    keys = ['params_m', 'ms', 'd1', 'abs_rel', 'rmse', 'silog']
+    print('{:>14} | '.format('mode') + ' | '.join('{:>8}'.format(k) for k in keys))
+    for name, metrics in rows:
+        print('{:>14} | '.format(name) + ' | '.join('{:8.3f}'.format(metrics[k]) for k in keys))
+
+
+if __name__ == '__main__':
+    main()
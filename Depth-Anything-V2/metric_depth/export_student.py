@@ -0,0 +1,59 @@
+import argparse
+import os
+
+import torch
+
+from student.tiny_depth import TinyDepthNet
+
+
+parser = argparse.ArgumentParser(description='Export the distilled TinyDepthNet student to ONNX / OpenVINO IR')
+
+parser.add_argument('--load-from', type=str, required=True, help='checkpoint saved by train.py --distill')
+parser.add_argument('--max-depth', default=20, type=float)
+parser.add_argument('--height', default=256, type=int)
+parser.add_argument('--width', default=320, type=int)
+parser.add_argument('--outdir', type=str, default='../../backend/models/openvino')
+parser.add_argument('--name', type=str, default='DepthStudent')
+parser.add_argument('--fp16', action='store_true', help='compress OpenVINO IR weights to FP16')
+
+
+def main():
+    args = parser.parse_args()
+
+    model = TinyDepthNet(max_depth=args.max_depth)
+    state_dict = torch.load(args.load_from, map_location='cpu')
+    state_dict = state_dict.get('model', state_dict)  # train.py checkpoints wrap the (DDP) state dict
+    model.load_state_dict({k.replace('module.', '', 1): v for k, v in state_dict.items()})
+    model.eval()
+
+    os.makedirs(args.outdir, exist_ok=True)
+    onnx_path = os.path.join(args.outdir, f'{args.name}.onnx')
+
+    dummy_input = torch.randn(1, 3, args.height, args.width)
+    torch.onnx.export(
+        model,
+        dummy_input,
+        onnx_path,
+        input_names=['input'],
+        output_names=['depth'],
+        opset_version=17,
+    )
+    print(f'ONNX model saved to {onnx_path}')
+
+    try:
+        import openvino as ov
+    except ImportError:
+        print('OpenVINO not installed, skipping IR conversion (pip install openvino)')
+        return
+
+    xml_path = os.path.join(args.outdir, f'{args.name}.xml')
+    ov_model = ov.convert_model(onnx_path)
+    ov.save_model(ov_model, xml_path, compress_to_fp16=args.fp16)
+    print(f'OpenVINO IR saved to {xml_path}')
+
+    num_params = sum(p.numel() for p in model.parameters())
+    print(f'params: {num_params / 1e6:.2f}M, ONNX size: {os.path.getsize(onnx_path) / 2**20:.2f} MiB')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Tiny CNN student for distilling Depth Anything V2 (metric) on CPU / edge devices.
+
+MobileNetV2-style inverted residual encoder (output stride 32) with a light U-Net decoder.
+Fully convolutional: any input size works, the prediction is resized back to the input.
+Output matches DepthAnythingV2.forward of the metric model: (B, H, W) depth in meters.
+"""
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+def conv_bn_act(in_channels, out_channels, kernel_size=3, stride=1, groups=1, act=True):
+    return nn.Sequential(
+        nn.Conv2d(in_channels, out_channels, kernel_size, stride, kernel_size // 2, groups=groups, bias=False),
+        nn.BatchNorm2d(out_channels),
+        nn.ReLU6(True) if act else nn.Identity()
+    )
+
+
+class InvertedResidual(nn.Module):
+    def __init__(self, in_channels, out_channels, stride, expand_ratio):
+        super().__init__()
+
+        hidden = in_channels * expand_ratio
+        self.use_residual = stride == 1 and in_channels == out_channels
+
+        layers = []
+        if expand_ratio != 1:
+            layers.append(conv_bn_act(in_channels, hidden, kernel_size=1))
+        layers += [
+            conv_bn_act(hidden, hidden, stride=stride, groups=hidden),
+            conv_bn_act(hidden, out_channels, kernel_size=1, act=False),
+        ]
+        self.conv = nn.Sequential(*layers)
+
+    def forward(self, x):
+        return x + self.conv(x) if self.use_residual else self.conv(x)
+
+
+class UpBlock(nn.Module):
+    def __init__(self, in_channels, skip_channels, out_channels):
+        super().__init__()
+
+        self.conv = nn.Sequential(
+            conv_bn_act(in_channels + skip_channels, out_channels, kernel_size=1),
+            conv_bn_act(out_channels, out_channels, groups=out_channels),
+            conv_bn_act(out_channels, out_channels, kernel_size=1),
+        )
+
+    def forward(self, x, skip):
+        x = F.interpolate(x, size=skip.shape[-2:], mode='bilinear', align_corners=False)
+        return self.conv(torch.cat((x, skip), dim=1))
+
+
+class TinyDepthNet(nn.Module):
+    # (out_channels, num_blocks, stride, expand_ratio) per encoder stage; strides 2, 4, 8, 16, 32
+    stage_configs = [(16, 1, 1, 1), (24, 2, 2, 4), (32, 3, 2, 4), (64, 3, 2, 4), (96, 2, 2, 4)]
+
+    def __init__(self, max_depth=20.0, width_mult=1.0):
+        super().__init__()
+
+        self.max_depth = max_depth
+
+        channels = [max(8, int(c * width_mult)) for c, _, _, _ in self.stage_configs]
+
+        self.stem = conv_bn_act(3, channels[0], stride=2)
+
+        self.stages = nn.ModuleList()
+        in_channels = channels[0]
+        for out_channels, (_, num_blocks, stride, expand_ratio) in zip(channels, self.stage_configs):
+            blocks = []
+            for i in range(num_blocks):
+                blocks.append(InvertedResidual(in_channels, out_channels, stride if i == 0 else 1, expand_ratio))
+                in_channels = out_channels
+            self.stages.append(nn.Sequential(*blocks))
+
+        # deepest -> shallowest, each fused with the matching encoder skip
+        self.decoder = nn.ModuleList([
+            UpBlock(channels[i + 1], channels[i], channels[i]) for i in reversed(range(len(channels) - 1))
+        ])
+
+        self.head = nn.Sequential(
+            conv_bn_act(channels[0], channels[0]),
+            nn.Conv2d(channels[0], 1, kernel_size=1),
+            nn.Sigmoid()
+        )
+
+    def forward(self, x):
+        h, w = x.shape[-2:]
+
+        x = self.stem(x)
+        features = []
+        for stage in self.stages:
+            x = stage(x)
+            features.append(x)
+
+        x = features[-1]
+        for up, skip in zip(self.decoder, reversed(features[:-1])):
+            x = up(x, skip)
+
+        depth = self.head(x)
+        depth = F.interpolate(depth, (h, w), mode='bilinear', align_corners=False)
+
+        return depth.squeeze(1) * self.max_depth
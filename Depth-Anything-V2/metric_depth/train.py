@@ -16,8 +16,10 @@ from torch.utils.tensorboard import SummaryWriter
 
 from dataset.hypersim import Hypersim
 from dataset.kitti import KITTI
+from dataset.unlabeled import UnlabeledFrames
 from dataset.vkitti2 import VKITTI2
 from depth_anything_v2.dpt import DepthAnythingV2
+from student.tiny_depth import TinyDepthNet
 from util.dist_helper import setup_distributed
 from util.loss import SiLogLoss
 from util.metric import eval_depth
@@ -38,6 +40,14 @@ parser.add_argument('--pretrained-from', type=str)
 parser.add_argument('--save-path', type=str, required=True)
 parser.add_argument('--local-rank', default=0, type=int)
 parser.add_argument('--port', default=None, type=int)
+parser.add_argument('--shallow', action='store_true',
+                    help='shallow-encoder fast mode: tap earlier layers and adapt the DPT head to them')
+parser.add_argument('--freeze-encoder', action='store_true',
+                    help='only train the DPT head (light fine-tuning, e.g. together with --shallow)')
+parser.add_argument('--distill', action='store_true',
+                    help='distill the metric Depth Anything V2 teacher into the TinyDepthNet CNN student')
+parser.add_argument('--teacher-from', type=str, help='metric Depth Anything V2 checkpoint used as teacher (--distill)')
+parser.add_argument('--unlabeled-list', type=str, help='txt file with one unlabeled frame path per line (--distill)')
 
 
 def main():
@@ -59,7 +69,9 @@ def main():
     cudnn.benchmark = True
     
     size = (args.img_size, args.img_size)
-    if args.dataset == 'hypersim':
+    if args.distill:
+        trainset = UnlabeledFrames(args.unlabeled_list, 'train', size=size)
+    elif args.dataset == 'hypersim':
         trainset = Hypersim('dataset/splits/hypersim/train.txt', 'train', size=size)
     elif args.dataset == 'vkitti':
         trainset = VKITTI2('dataset/splits/vkitti2/train.txt', 'train', size=size)
@@ -85,10 +97,30 @@ def main():
         'vitl': {'encoder': 'vitl', 'features': 256, 'out_channels': [256, 512, 1024, 1024]},
         'vitg': {'encoder': 'vitg', 'features': 384, 'out_channels': [1536, 1536, 1536, 1536]}
     }
-    model = DepthAnythingV2(**{**model_configs[args.encoder], 'max_depth': args.max_depth})
+    if args.distill:
+        # Teacher labels the unlabeled frames on the fly; only the student is trained
+        teacher = DepthAnythingV2(**{**model_configs[args.encoder], 'max_depth': args.max_depth})
+        teacher.load_state_dict(torch.load(args.teacher_from, map_location='cpu'))
+        teacher.cuda(local_rank).eval()
+        for param in teacher.parameters():
+            param.requires_grad = False
+        
+        model = TinyDepthNet(max_depth=args.max_depth)
+    else:
+        model = DepthAnythingV2(**{**model_configs[args.encoder], 'max_depth': args.max_depth, 'shallow': args.shallow})
     
     if args.pretrained_from:
-        model.load_state_dict({k: v for k, v in torch.load(args.pretrained_from, map_location='cpu').items() if 'pretrained' in k}, strict=False)
+        state_dict = torch.load(args.pretrained_from, map_location='cpu')
+        if args.shallow:
+            # Start from a full-depth metric checkpoint (encoder + head): only the head has to
+            # adapt to the shallower features, so a few epochs with a frozen encoder are enough.
+            model.load_state_dict(state_dict, strict=False)
+        else:
+            model.load_state_dict({k: v for k, v in state_dict.items() if 'pretrained' in k}, strict=False)
+    
+    if args.freeze_encoder and not args.distill:
+        for param in model.pretrained.parameters():
+            param.requires_grad = False
     
     model = torch.nn.SyncBatchNorm.convert_sync_batchnorm(model)
     model.cuda(local_rank)
@@ -97,7 +129,7 @@ def main():
     
     criterion = SiLogLoss().cuda(local_rank)
     
-    optimizer = AdamW([{'params': [param for name, param in model.named_parameters() if 'pretrained' in name], 'lr': args.lr},
+    optimizer = AdamW([{'params': [param for name, param in model.named_parameters() if 'pretrained' in name and param.requires_grad], 'lr': args.lr},
                        {'params': [param for name, param in model.named_parameters() if 'pretrained' not in name], 'lr': args.lr * 10.0}],
                       lr=args.lr, betas=(0.9, 0.999), weight_decay=0.01)
     
@@ -121,7 +153,13 @@ def main():
         for i, sample in enumerate(trainloader):
             optimizer.zero_grad()
             
-            img, depth, valid_mask = sample['image'].cuda(), sample['depth'].cuda(), sample['valid_mask'].cuda()
+            if args.distill:
+                img = sample['image'].cuda()
+                with torch.no_grad():
+                    depth = teacher(img)
+                valid_mask = torch.ones_like(depth)
+            else:
+                img, depth, valid_mask = sample['image'].cuda(), sample['depth'].cuda(), sample['valid_mask'].cuda()
             
             if random.random() < 0.5:
                 img = img.flip(-1)
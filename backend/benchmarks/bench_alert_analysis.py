@@ -0,0 +1,92 @@
+"""
+Alert analysis microbenchmark
+=============================
+
+Times AlertService.analyze_depth (single sweep, per-zone statistics) against
+the former mask-per-band implementation, kept below as a reference, on
+640x480 and 256x256 depth maps, then at 640x480 for growing zone configs.
+
+Usage (from backend/):
+    python benchmarks/bench_alert_analysis.py
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.alert_service import AlertService
+
+SIZES = [(480, 640), (256, 256)]
+
+THIRDS = [
+    {"name": "left", "rect": [0.0, 0.0, 1 / 3, 1.0]},
+    {"name": "center", "rect": [1 / 3, 0.0, 2 / 3, 1.0]},
+    {"name": "right", "rect": [2 / 3, 0.0, 1.0, 1.0]},
+]
+CORRIDOR = {"name": "corridor", "polygon": [[0.4, 0.55], [0.6, 0.55], [0.85, 1.0], [0.15, 1.0]]}
+HEAD = {"name": "head", "rect": [0.25, 0.0, 0.75, 0.25]}
+ZONE_CONFIGS = {
+    "thirds": THIRDS,
+    "thirds+corridor+head": THIRDS + [CORRIDOR, HEAD],
+    "+3x3 grid": THIRDS + [CORRIDOR, HEAD, {"name": "grid", "grid": [3, 3]}],
+    "+6x8 grid": THIRDS + [CORRIDOR, HEAD, {"name": "grid", "grid": [6, 8]}],
+}
+
+
+def masks_reference(depth_map, min_distance, warning_distance):
+    """Former implementation: boolean masks per band, repeated on each third."""
+    valid = depth_map[np.isfinite(depth_map)]
+    stats = (valid.min(), valid.max(), valid.mean())
+    ratios = (
+        np.sum(depth_map < min_distance) / depth_map.size,
+        np.sum((depth_map >= min_distance) & (depth_map < warning_distance)) / depth_map.size,
+        np.sum((depth_map >= warning_distance) & (depth_map < 2.0)) / depth_map.size,
+    )
+    third = depth_map.shape[1] // 3
+    for region in (depth_map[:, :third], depth_map[:, third:2 * third], depth_map[:, 2 * third:]):
+        valid = region[np.isfinite(region)]
+        valid.min(), valid.mean()
+        np.sum(region < min_distance) / region.size
+        np.sum((region >= min_distance) & (region < warning_distance)) / region.size
+    return stats, ratios
+
+
+def timeit(fn, iters=200):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return (time.perf_counter() - start) * 1e3 / iters
+
+
+def main():
+    logging.disable(logging.WARNING)
+    rng = np.random.default_rng(0)
+    service = AlertService()
+
+    print(f"{'size':>8} | {'masks ms':>9} | {'single pass ms':>14} | {'speedup':>7}")
+    for height, width in SIZES:
+        depth_map = rng.uniform(0.2, 8.0, (height, width)).astype(np.float32)
+
+        reference = timeit(lambda: masks_reference(depth_map, service.min_distance, service.warning_distance))
+        fused = timeit(lambda: service.analyze_depth(depth_map))
+
+        print(f"{width}x{height:<4} | {reference:9.3f} | {fused:14.3f} | {reference / fused:6.1f}x")
+
+    print()
+    print(f"{'zones (640x480)':>22} | {'count':>5} | {'ms':>6}")
+    depth_map = rng.uniform(0.2, 8.0, (480, 640)).astype(np.float32)
+    for name, zones in ZONE_CONFIGS.items():
+        service.zone_specs = zones
+        service._layout_cache.clear()
+        elapsed = timeit(lambda: service.analyze_depth(depth_map))
+        print(f"{name:>22} | {len(service.analyze_depth(depth_map)['zones']):5d} | {elapsed:6.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Per-box distance microbenchmark
+===============================
+
+Times every object distance method in services/box_depth_stats.py for 1, 10
+and 100 boxes on a 640x480 depth map, against the single centre sample.
+
+Usage (from backend/):
+    python benchmarks/bench_box_distance.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.box_depth_stats import DISTANCE_METHODS, box_distances
+
+HEIGHT, WIDTH = 480, 640
+
+
+def make_boxes(n, rng):
+    xy = rng.uniform(0, WIDTH - 50, (n, 2))
+    wh = rng.uniform(10, 300, (n, 2))
+    return np.concatenate([xy, xy + wh], axis=1).astype(np.float32)
+
+
+def timeit(fn, iters=200):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / iters
+
+
+def main():
+    rng = np.random.default_rng(0)
+    depth_map = rng.uniform(0.5, 10.0, (HEIGHT, WIDTH)).astype(np.float32)
+    
+    print(f"{'boxes':>6} | " + " | ".join(f"{m + ' us':>14}" for m in DISTANCE_METHODS))
+    for n in (1, 10, 100):
+        boxes = make_boxes(n, rng)
+        times = [timeit(lambda: box_distances(depth_map, boxes, method=m)) for m in DISTANCE_METHODS]
+        print(f"{n:>6} | " + " | ".join(f"{t:14.1f}" for t in times))
+
+
+if __name__ == "__main__":
+    main()
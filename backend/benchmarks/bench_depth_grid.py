@@ -0,0 +1,92 @@
+"""
+Depth grid benchmark
+====================
+
+Cost and payload of depth_grid=true against include_depth_image=true. The
+grid (one INTER_AREA resize, min over sub-blocks, base64) is compared with a
+per-cell 5th-percentile reference, the obvious way to get a robust minimum,
+and with the inline JPEG visualization a client would otherwise download to
+find near obstacles.
+
+Usage (from backend/):
+    python benchmarks/bench_depth_grid.py
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.depth_grid import depth_grid, encode_depth_grid
+from services.image_service import ImageService
+
+SIZES = [(480, 640), (256, 256)]
+GRID = (12, 16)
+MAX_DEPTH = 5.0
+STATS = {'min': 0.8, 'avg': 2.4}
+
+
+def percentile_reference(depth_map, rows, cols):
+    """Per-cell 5th percentile with numpy, cell by cell."""
+    height, width = depth_map.shape
+    grid = np.empty((rows, cols), dtype=np.float32)
+    for r in range(rows):
+        for c in range(cols):
+            cell = depth_map[r * height // rows:(r + 1) * height // rows, c * width // cols:(c + 1) * width // cols]
+            grid[r, c] = np.percentile(cell, 5)
+    return grid
+
+
+def make_depth(height, width, rng):
+    """Floor ramp (5 m at the top, 0.5 m at the bottom) with a few close obstacles and noise."""
+    depth = np.repeat(np.linspace(5.0, 0.5, height)[:, None], width, axis=1)
+    for _ in range(3):
+        x, y = rng.integers(0, width - width // 5), rng.integers(0, height - height // 4)
+        depth[y:y + height // 4, x:x + width // 5] = rng.uniform(0.6, 2.0)
+    depth += rng.normal(0, 0.03, depth.shape)
+    return np.clip(depth, 0.5, 5.0).astype(np.float32)
+
+
+def timeit(fn, iters=100):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return (time.perf_counter() - start) * 1e3 / iters
+
+
+def main():
+    logging.disable(logging.WARNING)
+    rng = np.random.default_rng(0)
+    service = ImageService()
+    rows, cols = GRID
+
+    def visualization(depth_map):
+        colored = service.create_visualization(depth_map, "safe", STATS, "JET")
+        return service.encode_image_to_base64(colored)
+
+    print(f"{'size':>8} | {'percentile ms':>13} | {'grid ms':>7} | {'image ms':>8} | {'median diff m':>13}")
+    for height, width in SIZES:
+        depth_map = make_depth(height, width, rng)
+
+        reference = timeit(lambda: percentile_reference(depth_map, rows, cols), iters=10)
+        grid_ms = timeit(lambda: encode_depth_grid(depth_grid(depth_map, rows, cols), 'float16', MAX_DEPTH))
+        image_ms = timeit(lambda: visualization(depth_map))
+        diff = np.median(np.abs(depth_grid(depth_map, rows, cols) - percentile_reference(depth_map, rows, cols)))
+
+        print(f"{width}x{height:<4} | {reference:13.3f} | {grid_ms:7.3f} | {image_ms:8.3f} | {diff:13.3f}")
+
+    depth_map = make_depth(*SIZES[0], rng)
+    grid = depth_grid(depth_map, rows, cols)
+    print()
+    print(f"payload {cols}x{rows}: float16 {len(encode_depth_grid(grid, 'float16', MAX_DEPTH)['data'])} chars, "
+          f"uint8 {len(encode_depth_grid(grid, 'uint8', MAX_DEPTH)['data'])} chars, "
+          f"inline image {len(visualization(depth_map))} chars")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+YOLO result parsing microbenchmark
+==================================
+
+Compares the previous per-box loop (three .cpu().numpy() calls per box) with the
+vectorized ObjectDetectionService.parse_boxes on synthetic results of 1, 10 and
+100 boxes, and checks that both produce identical detections.
+
+Usage (from backend/):
+    python benchmarks/bench_detection_parsing.py
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import torch
+from ultralytics.engine.results import Boxes
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.object_detection_service import ObjectDetectionService
+
+HEIGHT, WIDTH = 480, 640
+MAX_OBJECTS = 10
+
+
+def legacy_parse(service, boxes, depth_map):
+    """The per-box loop detect() used before vectorization."""
+    detections = []
+    for box in boxes:
+        x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
+        conf = float(box.conf[0].cpu().numpy())
+        cls_id = int(box.cls[0].cpu().numpy())
+        class_name = service.model.names[cls_id]
+        
+        center_x = (x1 + x2) / 2
+        center_y = (y1 + y2) / 2
+        if center_x < WIDTH / 3:
+            region = 'left'
+        elif center_x < 2 * WIDTH / 3:
+            region = 'center'
+        else:
+            region = 'right'
+        
+        name_tr = service.TURKISH_LABELS.get(class_name, class_name)
+        priority = service.PRIORITY_OBJECTS.get(class_name, 5)
+        
+        cy = max(0, min(int(center_y), depth_map.shape[0] - 1))
+        cx = max(0, min(int(center_x), depth_map.shape[1] - 1))
+        distance = float(depth_map[cy, cx])
+        
+        detections.append({
+            'name': class_name,
+            'name_tr': name_tr,
+            'confidence': round(conf, 3),
+            'bbox': [float(x1), float(y1), float(x2), float(y2)],
+            'center': [float(center_x), float(center_y)],
+            'distance': distance,
+            'priority': priority,
+            'region': region,
+            'direction_message': service._generate_direction_message(class_name, name_tr, region, priority)
+        })
+    
+    detections.sort(key=lambda x: (x['priority'], x['confidence']), reverse=True)
+    return detections[:MAX_OBJECTS]
+
+
+def vectorized_parse(service, boxes, depth_map):
+    return service.parse_boxes(boxes.data.cpu().numpy(), (HEIGHT, WIDTH), MAX_OBJECTS, depth_map)
+
+
+def make_boxes(n, num_classes, rng):
+    xy = rng.uniform(0, WIDTH - 50, (n, 2))
+    wh = rng.uniform(10, 200, (n, 2))
+    conf = rng.uniform(0.5, 1.0, (n, 1))
+    cls = rng.integers(0, num_classes, (n, 1))
+    data = np.concatenate([xy, xy + wh, conf, cls], axis=1).astype(np.float32)
+    return Boxes(torch.from_numpy(data), (HEIGHT, WIDTH))
+
+
+def timeit(fn, iters):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return (time.perf_counter() - start) * 1e6 / iters
+
+
+def main():
+    service = ObjectDetectionService()
+    if service.model is None:
+        print("YOLO model not available")
+        return
+    
+    rng = np.random.default_rng(0)
+    depth_map = rng.uniform(0.5, 10.0, (HEIGHT, WIDTH)).astype(np.float32)
+    
+    print(f"{'boxes':>6} | {'loop us':>10} | {'vectorized us':>14} | {'speedup':>8}")
+    for n in (1, 10, 100):
+        boxes = make_boxes(n, len(service.model.names), rng)
+        
+        assert legacy_parse(service, boxes, depth_map) == vectorized_parse(service, boxes, depth_map)
+        
+        iters = max(20, 2000 // n)
+        loop_us = timeit(lambda: legacy_parse(service, boxes, depth_map), iters)
+        vec_us = timeit(lambda: vectorized_parse(service, boxes, depth_map), iters)
+        print(f"{n:>6} | {loop_us:10.1f} | {vec_us:14.1f} | {loop_us / vec_us:7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Detection tier benchmark
+========================
+
+Per detection tier (config.yaml -> object_detection.tiers): mean detect() latency
+and recall of the navigation objects found by the 'full' tier (same class,
+IoU >= 0.5). The full tier is the reference, so no labels are needed.
+
+Usage (from backend/):
+    python benchmarks/bench_detection_tiers.py --images path/to/street/frames
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.object_detection_service import ObjectDetectionService
+
+
+def iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+def matched(reference, detections):
+    return sum(
+        any(d['name'] == r['name'] and iou(d['bbox'], r['bbox']) >= 0.5 for d in detections)
+        for r in reference
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--images', type=str, required=True, help='Directory of JPEG/PNG frames')
+    parser.add_argument('--limit', type=int, default=100)
+    args = parser.parse_args()
+    
+    paths = sorted(p for p in Path(args.images).iterdir() if p.suffix.lower() in ('.jpg', '.jpeg', '.png'))
+    images = [cv2.imread(str(p)) for p in paths[:args.limit]]
+    
+    service = ObjectDetectionService()
+    if service.model is None:
+        print("YOLO model not available")
+        return
+    
+    tiers = list(service.settings.detection_tiers)
+    
+    # Navigation objects found by the full tier are the recall reference
+    references = [
+        [d for d in service.detect(image, max_objects=100, tier='full') if d['name'] in service.PRIORITY_OBJECTS]
+        for image in images
+    ]
+    total_reference = sum(len(r) for r in references)
+    
+    print(f"model: {service.model_name}, images: {len(images)}, reference objects: {total_reference}")
+    print(f"{'tier':>12} | {'imgsz':>5} | {'ms':>8} | {'recall':>7}")
+    for tier in tiers:
+        config = service.get_tier_config(tier)
+        service.detect(images[0], tier=tier)  # warmup
+        
+        found, elapsed = 0, 0.0
+        for image, reference in zip(images, references):
+            start = time.perf_counter()
+            detections = service.detect(image, max_objects=100, tier=tier)
+            elapsed += time.perf_counter() - start
+            found += matched(reference, detections)
+        
+        recall = found / total_reference if total_reference else float('nan')
+        print(f"{tier:>12} | {config.get('imgsz', 640):>5} | {elapsed * 1000 / len(images):8.1f} | {recall:7.3f}")
+
+
+if __name__ == "__main__":
+    main()
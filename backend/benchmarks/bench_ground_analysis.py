@@ -0,0 +1,83 @@
+"""
+Ground analysis benchmark
+=========================
+
+Times the vectorized depth discontinuity scan against the former row-by-row
+loop (kept below as a reference), the ground plane fit, and the full
+GroundAnalysisService.analyze, on 640x480 and 256x256 metric depth maps with a
+few steps in them.
+
+Usage (from backend/):
+    python benchmarks/bench_ground_analysis.py
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.ground_analysis_service import GroundAnalysisService
+
+SIZES = [(480, 640), (256, 256)]
+
+
+def loop_reference(service, ground_region, start_row):
+    """Former implementation: Python loop over rows, std recomputed per row."""
+    features = []
+    height, width = ground_region.shape
+    for row in range(1, height):
+        row_diff = np.abs(ground_region[row] - ground_region[row - 1])
+        threshold = service.depth_change_threshold * np.std(ground_region)
+        discontinuities = np.where(row_diff > threshold)[0]
+        if len(discontinuities) > service.min_feature_size / width:
+            depth_change = np.mean(ground_region[row, discontinuities]) - np.mean(ground_region[row - 1, discontinuities])
+            features.append({
+                'row': start_row + row,
+                'columns': discontinuities.tolist(),
+                'depth_change': float(depth_change),
+                'width_percentage': len(discontinuities) / width
+            })
+    return features
+
+
+def make_depth(height, width, rng):
+    """Metric ground (5 m at the horizon to 0.5 m at the bottom) with four risers and noise."""
+    rows = np.linspace(5.0, 0.5, height)
+    rows = rows - 0.3 * (np.arange(height) * 4 // height)
+    depth = np.repeat(rows[:, None], width, axis=1) + rng.normal(0, 0.02, (height, width))
+    return depth.astype(np.float32)
+
+
+def timeit(fn, iters=50):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return (time.perf_counter() - start) * 1e3 / iters
+
+
+def main():
+    logging.disable(logging.WARNING)
+    rng = np.random.default_rng(0)
+    service = GroundAnalysisService(plane_config={'plane_fit': True})
+
+    print(f"{'size':>8} | {'loop ms':>8} | {'vectorized ms':>13} | {'speedup':>7} | {'plane ms':>8} | {'analyze ms':>10}")
+    for height, width in SIZES:
+        depth_map = make_depth(height, width, rng)
+        normalized = np.clip((depth_map - 0.5) / 4.5, 0, 1)
+        ground_region, start_row = service._extract_ground_region(normalized)
+
+        loop = timeit(lambda: loop_reference(service, ground_region, start_row), iters=5)
+        vectorized = timeit(lambda: service._find_depth_discontinuities(ground_region, start_row))
+        plane = timeit(lambda: service._fit_ground_plane(depth_map, start_row))
+        full = timeit(lambda: service.analyze(depth_map, depth_range=(0.5, 5.0)))
+
+        print(f"{width}x{height:<4} | {loop:8.2f} | {vectorized:13.3f} | {loop / vectorized:6.0f}x | {plane:8.3f} | {full:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Image decode benchmark
+======================
+
+Times ImageService.decode_image (reduced-size JPEG decode, thumbnail
+brightness, cached CLAHE) against the former full decode + resize + LAB split
+path, kept below as a reference, on bright and dark JPEGs at typical phone
+camera resolutions, then raw NV21 frames (ImageService.decode_raw) against the
+same frames JPEG-encoded on the client and decoded on the server.
+
+Usage (from backend/):
+    python benchmarks/bench_image_decode.py
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.image_service import ImageService
+
+# Flutter ResolutionPreset medium / high / veryHigh / max (12 MP)
+SIZES = [(720, 480), (1280, 720), (1920, 1080), (4032, 3024)]
+
+
+def full_decode_reference(image_bytes, target_width, target_height):
+    """Former implementation: full-size decode, resize, LAB split for the brightness check."""
+    image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    image = cv2.resize(image, (target_width, target_height), interpolation=cv2.INTER_LINEAR)
+    lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
+    l, a, b = cv2.split(lab)
+    if np.mean(l) < 100:
+        l = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(l)
+        image = cv2.cvtColor(cv2.merge([l, a, b]), cv2.COLOR_LAB2BGR)
+    return image
+
+
+def to_nv21(image):
+    """BGR -> NV21 as an Android camera delivers it."""
+    i420 = cv2.cvtColor(image, cv2.COLOR_BGR2YUV_I420)
+    height, width = image.shape[:2]
+    u = i420[height:height + height // 4].reshape(-1)
+    v = i420[height + height // 4:].reshape(-1)
+    return np.concatenate([i420[:height], np.stack([v, u], axis=-1).reshape(height // 2, width)]).tobytes()
+
+
+def make_jpeg(width, height, brightness, rng):
+    """Smooth random scene encoded like a phone camera frame."""
+    noise = rng.integers(0, 255, (height // 8, width // 8, 3), dtype=np.uint8)
+    image = cv2.resize(noise, (width, height), interpolation=cv2.INTER_CUBIC)
+    image = cv2.convertScaleAbs(image, alpha=brightness)
+    return cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), 90])[1].tobytes()
+
+
+def timeit(fn, iters=50):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return (time.perf_counter() - start) * 1e3 / iters
+
+
+def main():
+    logging.disable(logging.WARNING)
+    rng = np.random.default_rng(0)
+    service = ImageService()
+    target = (service.target_width, service.target_height)
+
+    print(f"{'frame':>10} | {'light':>6} | {'full ms':>8} | {'reduced ms':>10} | {'speedup':>7}")
+    for width, height in SIZES:
+        for light, brightness in (("bright", 1.0), ("dark", 0.3)):
+            image_bytes = make_jpeg(width, height, brightness, rng)
+
+            reference = timeit(lambda: full_decode_reference(image_bytes, *target))
+            reduced = timeit(lambda: service.decode_image(image_bytes))
+
+            print(f"{f'{width}x{height}':>10} | {light:>6} | {reference:8.2f} | {reduced:10.2f} | {reference / reduced:6.1f}x")
+
+    print()
+    print(f"{'frame':>10} | {'client encode ms':>16} | {'server jpeg ms':>14} | {'server nv21 ms':>14}")
+    for width, height in SIZES:
+        image = cv2.imdecode(np.frombuffer(make_jpeg(width, height, 1.0, rng), np.uint8), cv2.IMREAD_COLOR)
+        image_bytes = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), 90])[1].tobytes()
+        nv21 = to_nv21(image)
+
+        encode = timeit(lambda: cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), 90]))
+        jpeg = timeit(lambda: service.decode_image(image_bytes))
+        raw = timeit(lambda: service.decode_raw(nv21, 'nv21', width, height))
+
+        print(f"{f'{width}x{height}':>10} | {encode:16.2f} | {jpeg:14.2f} | {raw:14.2f}")
+
+
+if __name__ == "__main__":
+    main()
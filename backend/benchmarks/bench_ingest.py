@@ -0,0 +1,84 @@
+"""
+Upload ingestion benchmark
+==========================
+
+Measures what it costs to get the uploaded bytes into the handler: multipart
+form parsing (UploadFile + await read(), as /api/analyze does) against the
+raw request body streamed into one buffer (_read_body, as /api/analyze-raw
+does). Both endpoints only return the byte count, so the difference is the
+parse cost per request. Also reports how long an oversized body is read
+before it is rejected.
+
+Usage (from backend/):
+    python benchmarks/bench_ingest.py
+"""
+
+import logging
+import sys
+import time
+from pathlib import Path
+
+from fastapi import FastAPI, File, Request, UploadFile
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from routers.analyze import MAX_IMAGE_SIZE, _read_body
+
+# Phone JPEG (~250 KB), NV21 640x480 (450 KB), 12 MP JPEG (~4 MB)
+PAYLOADS = [("jpeg 250KB", 250_000), ("nv21 640x480", 460_800), ("jpeg 4MB", 4_000_000)]
+
+app = FastAPI()
+
+
+@app.post("/multipart")
+async def multipart(image: UploadFile = File(...)):
+    return {"size": len(await image.read())}
+
+
+@app.post("/raw")
+async def raw(request: Request):
+    try:
+        return {"size": len(await _read_body(request, MAX_IMAGE_SIZE))}
+    except Exception:
+        return {"size": -1}
+
+
+def timeit(fn, iters=100):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return (time.perf_counter() - start) * 1e3 / iters
+
+
+def main():
+    logging.disable(logging.WARNING)
+    client = TestClient(app)
+
+    print(f"{'payload':>14} | {'multipart ms':>12} | {'raw body ms':>11} | {'saved ms':>8}")
+    for name, size in PAYLOADS:
+        body = bytes(size)
+
+        multipart_ms = timeit(lambda: client.post(
+            "/multipart", files={"image": ("frame.jpg", body, "image/jpeg")}
+        ))
+        raw_ms = timeit(lambda: client.post(
+            "/raw", content=body, headers={"Content-Type": "image/jpeg"}
+        ))
+
+        print(f"{name:>14} | {multipart_ms:12.3f} | {raw_ms:11.3f} | {multipart_ms - raw_ms:8.3f}")
+
+    print()
+    oversized = bytes(MAX_IMAGE_SIZE + 1)
+    multipart_ms = timeit(lambda: client.post(
+        "/multipart", files={"image": ("frame.jpg", oversized, "image/jpeg")}
+    ), iters=5)
+    raw_ms = timeit(lambda: client.post(
+        "/raw", content=oversized, headers={"Content-Type": "image/jpeg"}
+    ), iters=5)
+    print(f"oversized (10MB + 1): multipart read {multipart_ms:.1f} ms, raw body rejected in {raw_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Dashboard MJPEG stream benchmark
+================================
+
+CPU cost of the /api/stream feeds with several viewers. The former
+per-viewer loop (normalize, colormap and encode ~15 times a second for
+every viewer, on the event loop, whether or not app_state changed) is kept
+below as a reference; the current path is FramePublisher, which encodes
+each app_state version once in a worker thread and shares the bytes.
+
+Each run lasts DURATION_S with app_state updated at UPDATE_HZ, then again
+with no updates (idle viewers).
+
+Usage (from backend/):
+    python benchmarks/bench_stream.py
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.state import app_state
+from routers.stream import FramePublisher, render_depth
+
+VIEWERS = [1, 4]
+UPDATE_HZ = 5
+DURATION_S = 2.0
+
+
+class Viewer:
+    """Request stand-in that never disconnects."""
+
+    async def is_disconnected(self):
+        return False
+
+
+async def legacy_reference(counter):
+    """Former depth_generator: one render loop per viewer."""
+    while True:
+        depth = app_state.get_snapshot().get('depth')
+        depth_uint8 = cv2.normalize(depth, None, 0, 255, cv2.NORM_MINMAX).astype(np.uint8)
+        frame = cv2.applyColorMap(depth_uint8, cv2.COLORMAP_INFERNO)
+        ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+        counter[0] += 1
+        yield buffer.tobytes()
+        await asyncio.sleep(0.06)
+
+
+async def consume(stream, received):
+    async for _ in stream:
+        received[0] += 1
+
+
+async def run(make_streams, update_hz):
+    """CPU ms per second and frames delivered while viewers watch for DURATION_S."""
+    received = [0]
+    tasks = [asyncio.create_task(consume(stream, received)) for stream in make_streams()]
+    rng = np.random.default_rng(0)
+
+    cpu_start = time.process_time()
+    end = time.perf_counter() + DURATION_S
+    while time.perf_counter() < end:
+        if update_hz:
+            app_state.update_state(np.zeros((480, 640, 3), np.uint8), rng.uniform(0.5, 5.0, (480, 640)).astype(np.float32))
+            await asyncio.sleep(1.0 / update_hz)
+        else:
+            await asyncio.sleep(0.1)
+    cpu_ms = (time.process_time() - cpu_start) * 1e3 / DURATION_S
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return cpu_ms, received[0]
+
+
+async def main():
+    logging.disable(logging.WARNING)
+    app_state.update_state(np.zeros((480, 640, 3), np.uint8), np.ones((480, 640), np.float32))
+
+    print(f"{'viewers':>7} | {'updates/s':>9} | {'before cpu ms/s':>15} | {'before frames':>13} | "
+          f"{'after cpu ms/s':>14} | {'after frames':>12} | {'after renders':>13}")
+    for viewers in VIEWERS:
+        for update_hz in (UPDATE_HZ, 0):
+            legacy_renders = [0]
+            before_ms, before_frames = await run(
+                lambda: [legacy_reference(legacy_renders) for _ in range(viewers)], update_hz
+            )
+
+            publisher = FramePublisher(render_depth, "Bench feed")
+            renders = [0]
+            render = publisher.render
+            publisher.render = lambda snapshot: renders.__setitem__(0, renders[0] + 1) or render(snapshot)
+            after_ms, after_frames = await run(
+                lambda: [publisher.frames(Viewer()) for _ in range(viewers)], update_hz
+            )
+
+            print(f"{viewers:>7} | {update_hz:>9} | {before_ms:15.1f} | {before_frames:>13} | "
+                  f"{after_ms:14.1f} | {after_frames:>12} | {renders[0]:>13}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,120 @@
+"""
+Tracker crowded-scene benchmark
+===============================
+
+Simulates N objects of a few classes walking across a 640x480 frame with
+detection jitter, and reports update() latency and identity switches for the
+SORT-style ObjectTrackingService, plus memory per track of the struct-of-arrays
+TrackStore against the former dataclass + deques layout.
+
+Usage (from backend/):
+    python benchmarks/bench_tracking.py
+"""
+
+import sys
+import time
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.object_tracking_service import KALMAN_P0, ObjectTrackingService, TrackStore
+
+WIDTH, HEIGHT = 640, 480
+CLASSES = ['person', 'person', 'person', 'car', 'bicycle']
+FRAMES = 60
+
+
+def simulate(num_objects, rng):
+    """Per frame a list of (object id, detection) with constant-velocity motion + jitter."""
+    start = rng.uniform([0, 0], [WIDTH - 40, HEIGHT - 80], (num_objects, 2))
+    velocity = rng.uniform(-4, 4, (num_objects, 2))
+    size = rng.uniform([20, 40], [40, 80], (num_objects, 2))
+    classes = rng.choice(CLASSES, num_objects)
+    
+    frames = []
+    for t in range(FRAMES):
+        top_left = start + velocity * t + rng.normal(0, 1.0, (num_objects, 2))
+        boxes = np.concatenate([top_left, top_left + size], axis=1)
+        frames.append([
+            (i, {'name': str(classes[i]), 'bbox': boxes[i].tolist(), 'confidence': 0.8, 'distance': 3.0})
+            for i in rng.permutation(num_objects)
+        ])
+    return frames
+
+
+@dataclass
+class LegacyTrack:
+    """Former per-track layout: dataclass, three deques and a Kalman object."""
+    
+    class_name: str
+    positions: deque = field(default_factory=lambda: deque(maxlen=10))
+    confidences: deque = field(default_factory=lambda: deque(maxlen=10))
+    distances: deque = field(default_factory=lambda: deque(maxlen=10))
+    x: np.ndarray = field(default_factory=lambda: np.zeros(7))
+    P: np.ndarray = field(default_factory=lambda: KALMAN_P0.copy())
+
+
+def legacy_bytes(num_tracks):
+    tracemalloc.start()
+    tracks = {}
+    for i in range(num_tracks):
+        track = LegacyTrack('person')
+        for step in range(10):
+            track.positions.append((float(i), float(step)))
+            track.confidences.append(0.5 + step / 100)
+            track.distances.append(3.0 + step / 10)
+        tracks[f"track_{i}"] = track
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def store_bytes(num_tracks):
+    tracemalloc.start()
+    store = TrackStore(capacity=num_tracks)
+    slots = store.allocate_slots(num_tracks)
+    store.class_names[slots] = 'person'
+    for step in range(10):
+        store.push(slots, np.zeros((num_tracks, 2)), np.full(num_tracks, 0.5), np.full(num_tracks, 3.0), float(step))
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def main():
+    rng = np.random.default_rng(0)
+    
+    print(f"{'objects':>8} | {'update ms':>10} | {'id switches':>11}")
+    for num_objects in (10, 50, 100, 200):
+        frames = simulate(num_objects, rng)
+        tracker = ObjectTrackingService(max_age=10.0)
+        
+        elapsed = 0.0
+        switches = 0
+        last_track = {}
+        for frame in frames:
+            start = time.perf_counter()
+            infos = tracker.update([detection for _, detection in frame])
+            elapsed += time.perf_counter() - start
+            
+            for (object_id, _), info in zip(frame, infos):
+                if object_id in last_track and last_track[object_id] != info['track_id']:
+                    switches += 1
+                last_track[object_id] = info['track_id']
+        
+        print(f"{num_objects:>8} | {elapsed * 1000 / FRAMES:10.2f} | {switches:>11}")
+    
+    print()
+    print(f"{'tracks':>8} | {'legacy B/track':>14} | {'store B/track':>13}")
+    for num_tracks in (64, 256, 1024):
+        print(f"{num_tracks:>8} | {legacy_bytes(num_tracks) / num_tracks:14.0f} | "
+              f"{store_bytes(num_tracks) / num_tracks:13.0f}")
+
+
+if __name__ == "__main__":
+    main()
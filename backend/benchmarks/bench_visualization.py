@@ -0,0 +1,83 @@
+"""
+Depth visualization benchmark
+=============================
+
+Cost of include_depth_image=true: colormap, text overlay, JPEG encode and
+base64 data URI. The former per-frame min/max normalization with
+cv2.imencode is kept below as a reference; the current path is
+ImageService.create_visualization + encode_image_to_base64 (fixed-range
+quantization, cached LUTs, simplejpeg / PyTurboJPEG when installed).
+
+Usage (from backend/):
+    python benchmarks/bench_visualization.py
+"""
+
+import base64
+import logging
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.image_service import ImageService, jpeg_encoder_name
+
+SIZES = [(480, 640), (256, 256)]
+STATS = {'min': 0.8, 'avg': 2.4}
+
+
+def legacy_reference(depth_map, colormap=cv2.COLORMAP_JET, quality=85):
+    """Former implementation: float min/max normalization, applyColorMap, imencode."""
+    depth_min, depth_max = depth_map.min(), depth_map.max()
+    depth_normalized = 1.0 - ((depth_map - depth_min) / (depth_max - depth_min))
+    depth_colored = cv2.applyColorMap((depth_normalized * 255).astype(np.uint8), colormap)
+    for y, text in ((30, "Alert: safe"), (60, f"Min: {STATS['min']:.2f}m"), (90, f"Avg: {STATS['avg']:.2f}m")):
+        cv2.putText(depth_colored, text, (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 255), 2)
+    _, buffer = cv2.imencode('.jpg', depth_colored, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    return f"data:image/jpeg;base64,{base64.b64encode(buffer).decode('utf-8')}"
+
+
+def make_depth(height, width, rng):
+    """Floor ramp (5 m at the top, 0.5 m at the bottom) with a few close obstacles and noise."""
+    depth = np.repeat(np.linspace(5.0, 0.5, height)[:, None], width, axis=1)
+    for _ in range(3):
+        x, y = rng.integers(0, width - width // 5), rng.integers(0, height - height // 4)
+        depth[y:y + height // 4, x:x + width // 5] = rng.uniform(0.6, 2.0)
+    depth += rng.normal(0, 0.03, depth.shape)
+    return np.clip(depth, 0.5, 5.0).astype(np.float32)
+
+
+def timeit(fn, iters=100):
+    fn()
+    start = time.perf_counter()
+    for _ in range(iters):
+        fn()
+    return (time.perf_counter() - start) * 1e3 / iters
+
+
+def main():
+    logging.disable(logging.WARNING)
+    rng = np.random.default_rng(0)
+    service = ImageService()
+    print(f"JPEG encoder: {jpeg_encoder_name()}")
+
+    def current(depth_map):
+        colored = service.create_visualization(depth_map, "safe", STATS, "JET")
+        return service.encode_image_to_base64(colored)
+
+    print(f"{'size':>8} | {'before ms':>9} | {'colormap ms':>11} | {'after ms':>8} | {'speedup':>7}")
+    for height, width in SIZES:
+        depth_map = make_depth(height, width, rng)
+
+        before = timeit(lambda: legacy_reference(depth_map))
+        colormap = timeit(lambda: service.apply_colormap(depth_map, "JET"))
+        after = timeit(lambda: current(depth_map))
+
+        print(f"{width}x{height:<4} | {before:9.3f} | {colormap:11.3f} | {after:8.3f} | {before / after:6.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,7 +9,7 @@ Uses Pydantic BaseSettings for validation.
 import os
 import yaml
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from pydantic import Field
 
@@ -41,6 +41,16 @@ class Settings(BaseSettings):
     use_openvino: bool = False  # ✅ OpenVINO optimization
     openvino_device: str = "GPU"  # GPU, CPU, AUTO
     use_depth_anything_v2: bool = False  # ✅ Feature flag
+    depth_tier: str = "quality"  # Default Depth Anything V2 tier
+    depth_tiers: Dict[str, Dict] = {
+        "quality": {"merge_ratio": 0.0},
+        "balanced": {"merge_ratio": 0.2},
+        "fast": {
+            "shallow": True,
+            "head_checkpoint": "depth_anything_v2/checkpoints/depth_anything_v2_vits_shallow_head.pth",
+            "max_depth": 20.0,
+        },
+    }
     min_depth: float = 0.5
     max_depth: float = 5.0
     
@@ -48,6 +58,78 @@ class Settings(BaseSettings):
     alert_min_distance: float = 0.5       # 0.7 -> 0.5m (only very close = danger)
     alert_warning_distance: float = 1.2   # 1.5 -> 1.2m (warning zone)
     warning_area_threshold: float = 0.10  # 0.05 -> 0.10 (10% less sensitive, fewer false positives)
+    # Alert zones in normalized coordinates (see services/alert_zones.py)
+    alert_zones: List[Dict] = [
+        {"name": "left", "rect": [0.0, 0.0, 1 / 3, 1.0]},
+        {"name": "center", "rect": [1 / 3, 0.0, 2 / 3, 1.0]},
+        {"name": "right", "rect": [2 / 3, 0.0, 1.0, 1.0]},
+    ]
+    
+    # Detector artifact: auto (OpenVINO INT8 > FP16 > PyTorch), openvino_int8, openvino_fp16, pytorch
+    detection_model_variant: str = "auto"
+    detection_tier: str = "full"  # Default detection tier
+    detection_tiers: Dict[str, Dict] = {
+        "full": {"imgsz": 640, "max_det": 300, "navigation_only": False},
+        "navigation": {"imgsz": 480, "max_det": 30, "navigation_only": True},
+        "fast": {"imgsz": 320, "max_det": 10, "navigation_only": True},
+    }
+    # Per-session keyframe scheduling (services/detection_scheduler.py)
+    detection_schedule: Dict = {
+        "enabled": False,
+        "keyframe_interval": 3,
+        "min_interval": 1,
+        "max_interval": 6,
+        "scene_change_threshold": 12.0,
+        "motion_low": 2.0,
+        "motion_high": 10.0,
+        "flow_grid": 5,
+        "session_ttl": 30.0,
+    }
+    
+    # Object distance from the depth map: center, mean, min, percentile
+    object_distance_method: str = "center"
+    object_distance_crop: float = 0.5          # Central fraction of the box used by mean/min/percentile
+    object_distance_percentile: float = 20.0
+    object_distance_pyramid_size: int = 64     # Longer side of the depth level used by min/percentile
+    
+    # Ground analysis (stairs / curbs / holes) in /api/analyze. Inline it is skipped while
+    # its smoothed cost exceeds budget_ms (re-measured every probe_interval skipped frames);
+    # with async_lane, sessions run it in the background (services/ground_lane.py)
+    ground_analysis: Dict = {
+        "enabled": False,
+        "budget_ms": 10.0,
+        "probe_interval": 30,
+        "plane_fit": True,
+        "camera_hfov_deg": 65.0,
+        "camera_pitch_deg": 30.0,
+        "plane_points": 3000,
+        "ransac_iterations": 64,
+        "inlier_threshold": 0.05,
+        "dropoff_threshold": 0.10,
+        "curb_threshold": 0.05,
+        "dropoff_area": 0.03,
+        "slope_warning_deg": 8.0,
+        "async_lane": False,
+        "lane_every_n": 5,
+        "lane_interval_s": 0.5,
+        "lane_workers": 1,
+        "lane_max_age_s": 2.0,
+        "session_ttl": 30.0,
+    }
+    
+    # Opt-in coarse distance grid in /api/analyze responses (services/depth_grid.py)
+    depth_grid: Dict = {
+        "rows": 12,
+        "cols": 16,
+        "oversample": 4,
+        "encoding": "float16",
+    }
+    
+    # Analyzed depth maps kept for /api/frames/{id}/depth.jpg (services/frame_store.py)
+    frame_store: Dict = {
+        "ttl_s": 10.0,
+        "max_frames": 32,
+    }
     
     # Image processing
     target_width: int = 640
@@ -78,12 +160,15 @@ class Settings(BaseSettings):
                 # Model settings
                 model_config = yaml_data.get('depth_model', {})
                 if model_config:
+                    self.use_depth_anything_v2 = model_config.get('use_depth_anything_v2', self.use_depth_anything_v2)
                     self.model_type = model_config.get('model_type', self.model_type)
                     self.model_device = model_config.get('device', self.model_device)
                     self.use_openvino = model_config.get('use_openvino', self.use_openvino)
                     self.openvino_device = model_config.get('openvino_device', self.openvino_device)
                     self.min_depth = model_config.get('min_depth', self.min_depth)
                     self.max_depth = model_config.get('max_depth', self.max_depth)
+                    self.depth_tier = model_config.get('default_tier', self.depth_tier)
+                    self.depth_tiers = model_config.get('tiers', self.depth_tiers)
                 
                 # Alert settings
                 alert_config = yaml_data.get('alerts', {})
@@ -91,6 +176,32 @@ class Settings(BaseSettings):
                     self.alert_min_distance = alert_config.get('min_distance', self.alert_min_distance)
                     self.alert_warning_distance = alert_config.get('warning_distance', self.alert_warning_distance)
                     self.warning_area_threshold = alert_config.get('warning_area_threshold', self.warning_area_threshold)
+                    self.alert_zones = alert_config.get('zones', self.alert_zones)
+                
+                # Object detection settings
+                detection_config = yaml_data.get('object_detection', {})
+                if detection_config:
+                    self.detection_model_variant = detection_config.get('model_variant', self.detection_model_variant)
+                    self.detection_tier = detection_config.get('default_tier', self.detection_tier)
+                    self.detection_tiers = detection_config.get('tiers', self.detection_tiers)
+                    self.detection_schedule = {**self.detection_schedule, **detection_config.get('schedule', {})}
+                    self.object_distance_method = detection_config.get('distance_method', self.object_distance_method)
+                    self.object_distance_crop = detection_config.get('distance_crop', self.object_distance_crop)
+                    self.object_distance_percentile = detection_config.get('distance_percentile', self.object_distance_percentile)
+                    self.object_distance_pyramid_size = detection_config.get('distance_pyramid_size', self.object_distance_pyramid_size)
+                
+                # Ground analysis settings
+                ground_config = yaml_data.get('ground_analysis', {})
+                if ground_config:
+                    self.ground_analysis = {**self.ground_analysis, **ground_config}
+                
+                depth_grid_config = yaml_data.get('depth_grid', {})
+                if depth_grid_config:
+                    self.depth_grid = {**self.depth_grid, **depth_grid_config}
+                
+                frame_store_config = yaml_data.get('frame_store', {})
+                if frame_store_config:
+                    self.frame_store = {**self.frame_store, **frame_store_config}
                 
                 # Camera settings for image processing
                 camera_config = yaml_data.get('camera', {})
@@ -1,6 +1,6 @@
 import threading
 import numpy as np
-from typing import Optional, Dict, Any
+from typing import Callable, Optional, Dict, Any, List
 import logging
 
 logger = logging.getLogger(__name__)
@@ -29,7 +29,9 @@ class AppState:
         self.last_frame: Optional[np.ndarray] = None
         self.last_depth: Optional[np.ndarray] = None
         self.last_analysis: Dict[str, Any] = {}
+        self.version = 0  # Bumped on every update; 0 = no frame yet
         self.frame_lock = threading.Lock()
+        self._listeners: List[Callable[[], None]] = []
         
     def update_state(self, original_frame: np.ndarray, depth_map: Optional[np.ndarray] = None, analysis_result: Dict[str, Any] = None):
         """
@@ -44,16 +46,33 @@ class AppState:
                     self.last_depth = depth_map
                 if analysis_result is not None:
                     self.last_analysis = analysis_result
+                self.version += 1
+                listeners = list(self._listeners)
+            
+            for listener in listeners:
+                listener()
         except Exception as e:
             logger.error(f"Failed to update app state: {e}")
 
+    def add_listener(self, listener: Callable[[], None]):
+        """Call listener (from the updating thread) after every update."""
+        with self.frame_lock:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[], None]):
+        """Stop calling a listener added with add_listener."""
+        with self.frame_lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
     def get_snapshot(self):
         """Get a thread-safe snapshot of the current state"""
         with self.frame_lock:
             return {
                 'frame': self.last_frame,
                 'depth': self.last_depth,
-                'analysis': self.last_analysis
+                'analysis': self.last_analysis,
+                'version': self.version
             }
 
 # Global instance
@@ -7,6 +7,7 @@ Designed for mobile (Android/iOS) clients.
 
 Endpoints:
     POST /api/analyze  - Analyze image and return depth map + alerts
+    GET  /api/frames/{id}/depth.jpg - Deferred depth visualization of an analyzed frame
     GET  /health       - Health check endpoint
     GET  /             - API documentation redirect
 
@@ -28,9 +29,10 @@ from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
 from slowapi.errors import RateLimitExceeded
 
-from routers import analyze, stream, contextual_assistant
+from routers import analyze, frames, stream, contextual_assistant
 from core.config import get_settings
 from core.logger import setup_logging
+from services.image_service import ENCODED_FORMATS, RAW_FORMATS
 
 # Initialize settings and logging
 settings = get_settings()
@@ -91,6 +93,9 @@ async def lifespan(app: FastAPI):
     logger.info("=" * 70)
     logger.info("🛑 Gören Göz Mobil Backend Shutting Down...")
     logger.info("=" * 70)
+    
+    from services.ground_lane import get_ground_analysis_lane
+    get_ground_analysis_lane().shutdown()
 
 
 # Create FastAPI app
@@ -138,6 +143,7 @@ async def add_process_time_header(request: Request, call_next):
 
 # Include routers
 app.include_router(analyze.router, prefix="/api", tags=["Analysis"])
+app.include_router(frames.router, prefix="/api", tags=["Frames"])
 app.include_router(stream.router, prefix="/api/stream", tags=["Stream"])
 app.include_router(contextual_assistant.router, prefix="/api", tags=["Contextual Assistant"])
 
@@ -173,7 +179,7 @@ async def health_check(request: Request) -> Dict:
     """
     Health check endpoint.
     
-    Returns system status, uptime, and model availability.
+    Returns system status, uptime, model availability and accepted frame formats.
     """
     try:
         from services.depth_service import get_depth_service
@@ -203,6 +209,11 @@ async def health_check(request: Request) -> Dict:
             "server_ready": vlm_ready,
             "server_url": "http://localhost:8080"
         },
+        "input_formats": {
+            "encoded": list(ENCODED_FORMATS),
+            "raw": list(RAW_FORMATS),
+            "raw_headers": ["X-Frame-Format", "X-Frame-Width", "X-Frame-Height"]
+        },
         "version": "1.0.0"
     }
 
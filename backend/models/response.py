@@ -33,6 +33,11 @@ class RegionalAlert(BaseModel):
     message: str = Field(..., description="Distance message")
 
 
+class ZoneAlert(RegionalAlert):
+    """Alert for one configured zone."""
+    name: str = Field(..., description="Zone name from the alert zone config")
+
+
 class RegionalAlerts(BaseModel):
     """Regional analysis for left, center, right zones."""
     left: RegionalAlert = Field(..., description="Left region analysis")
@@ -49,10 +54,29 @@ class DetectedObject(BaseModel):
     center: List[float] = Field(..., description="Center point [x, y]")
     priority: int = Field(..., description="Collision priority (0-10)")
     region: str = Field(..., description="Screen region (left/center/right)")
+    distance: Optional[float] = Field(None, description="Estimated distance to the object (meters)")
     # New tracking fields
     is_approaching: Optional[bool] = Field(None, description="Object moving towards camera")
     track_id: Optional[str] = Field(None, description="Unique tracking ID")
     stability: Optional[float] = Field(None, description="Detection stability (0-1)")
+    radial_velocity: Optional[float] = Field(
+        None,
+        description="Filtered rate of change of distance (m/s, negative = approaching)"
+    )
+    time_to_collision: Optional[float] = Field(
+        None,
+        description="Seconds until contact at the current closing speed (None if not closing)"
+    )
+    source: str = Field("detected", description="'detected' (detector ran on this frame) or 'predicted' (propagated)")
+
+
+class DepthGrid(BaseModel):
+    """Coarse grid of robust minimum distances."""
+    rows: int = Field(..., description="Grid rows")
+    cols: int = Field(..., description="Grid columns")
+    encoding: str = Field(..., description="'float16' or 'uint8' (little-endian)")
+    scale: float = Field(..., description="Meters per encoded unit")
+    data: str = Field(..., description="Base64 of the row-major values, top-left first")
 
 
 class AnalysisData(BaseModel):
@@ -68,6 +92,10 @@ class AnalysisData(BaseModel):
         None,
         description="Regional zone analysis (left/center/right)"
     )
+    zones: Optional[List[ZoneAlert]] = Field(
+        None,
+        description="Per-zone analysis for every configured alert zone"
+    )
     detected_objects: Optional[List[DetectedObject]] = Field(
         None,
         description="Detected objects in the scene"
@@ -76,6 +104,18 @@ class AnalysisData(BaseModel):
         None,
         description="Base64 encoded depth visualization (optional)"
     )
+    depth_grid: Optional[DepthGrid] = Field(
+        None,
+        description="Coarse distance grid (with depth_grid=true)"
+    )
+    frame_id: Optional[str] = Field(
+        None,
+        description="Short-lived id of this frame's depth map (with depth_image_url=true)"
+    )
+    depth_image_url: Optional[str] = Field(
+        None,
+        description="URL of the depth visualization, rendered when fetched (with depth_image_url=true)"
+    )
     # New metadata fields
     metadata: Optional[Dict] = Field(
         None,
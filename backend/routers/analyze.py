@@ -9,19 +9,25 @@ Supports both single and batch image processing.
 import time
 import logging
 from datetime import datetime, timezone
-from typing import Optional, List
+from typing import Dict, List, Optional, Tuple
 
-from fastapi import APIRouter, File, UploadFile, HTTPException, Query, Request
+import numpy as np
+from fastapi import APIRouter, File, UploadFile, HTTPException, Header, Query, Request
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
-from models.response import AnalyzeResponse, AnalysisData, DistanceStats, Warning, ErrorResponse, RegionalAlert, RegionalAlerts, DetectedObject
+from models.response import AnalyzeResponse, AnalysisData, DepthGrid, DistanceStats, Warning, ErrorResponse, RegionalAlert, RegionalAlerts, ZoneAlert, DetectedObject
 from services.depth_service import get_depth_service
+from services.depth_service_v2 import get_depth_service as get_depth_service_v2
 from services.alert_service import get_alert_service
-from services.image_service import get_image_service
+from services.image_service import ENCODED_FORMATS, get_image_service, raw_frame_error
 from services.object_detection_service import get_object_detection_service
 from services.object_tracking_service import get_tracking_service
-# ✅ REMOVED: ground_analysis_service (not needed, performance optimization)
+from services.detection_scheduler import get_detection_scheduler
+from services.ground_lane import get_ground_analysis_lane
+from services.frame_store import get_frame_store
+from services.depth_grid import GRID_ENCODINGS, depth_grid, encode_depth_grid
+from core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +41,314 @@ router = APIRouter()
 # Rate limiter
 limiter = Limiter(key_func=get_remote_address)
 
+# Upload size limit per image (10MB)
+MAX_IMAGE_SIZE = 10 * 1024 * 1024
+
+# Content types accepted by /analyze-raw
+RAW_BODY_CONTENT_TYPES = ("image/jpeg", "image/png", "application/octet-stream")
+
+
+def _raw_frame_format(frame_format: Optional[str]) -> Optional[str]:
+    """Normalized X-Frame-Format header; None for encoded images."""
+    if frame_format is None or frame_format.lower() in ENCODED_FORMATS:
+        return None
+    return frame_format.lower()
+
+
+def _estimate_depth(image_array: np.ndarray, depth_tier: Optional[str]) -> Tuple[Optional[np.ndarray], Dict]:
+    """
+    Metric depth map of a frame (None on failure) and its metadata.
+    
+    Depth Anything V2 with its speed/quality tier when use_depth_anything_v2 is set,
+    MiDaS otherwise (which has no tiers; depth_tier is then ignored).
+    """
+    if get_settings().use_depth_anything_v2:
+        depth_service = get_depth_service_v2()
+        tier = depth_service.resolve_tier(depth_tier)
+        return depth_service.estimate_metric(image_array, tier=tier), {'model': 'depth_anything_v2', 'tier': tier}
+    
+    depth_service = get_depth_service()
+    return depth_service.estimate(image_array), {'model': depth_service.model_type, 'tier': None}
+
+
+def _analyze_frame(
+    image_bytes,
+    start_time: float,
+    include_depth_image: bool,
+    depth_image_url: bool,
+    include_depth_grid: bool,
+    depth_grid_encoding: Optional[str],
+    colormap: str,
+    detection_tier: Optional[str],
+    depth_tier: Optional[str],
+    session_id: Optional[str],
+    frame_format: Optional[str],
+    frame_width: Optional[int],
+    frame_height: Optional[int]
+) -> AnalyzeResponse:
+    """
+    Full single-frame pipeline on an already read and size-checked upload.
+    
+    Args:
+        image_bytes: Encoded image or raw frame (bytes or memoryview)
+        start_time: Request start (time.time()) for processing_time_ms
+    
+    Other arguments as in analyze_image. Raises HTTPException for invalid raw
+    frames, undecodable images and failed depth estimation.
+    """
+    if frame_format is not None:
+        frame_error = raw_frame_error(frame_format, frame_width, frame_height, len(image_bytes))
+        if frame_error:
+            logger.warning(f"Invalid raw frame: {frame_error}")
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "success": False,
+                    "error": {
+                        "code": "INVALID_FRAME",
+                        "message": frame_error
+                    }
+                }
+            )
+    
+    if include_depth_grid:
+        depth_grid_encoding = depth_grid_encoding or get_settings().depth_grid.get('encoding', 'float16')
+        if depth_grid_encoding not in GRID_ENCODINGS:
+            raise HTTPException(
+                status_code=400,
+                detail={
+                    "success": False,
+                    "error": {
+                        "code": "INVALID_PARAMETER",
+                        "message": f"depth_grid_encoding must be one of {', '.join(GRID_ENCODINGS)}"
+                    }
+                }
+            )
+    
+    logger.info(f"Processing image: {len(image_bytes)} bytes")
+    
+    # Get services
+    image_service = get_image_service()
+    alert_service = get_alert_service()
+    object_detection_service = get_object_detection_service()
+    detection_scheduler = get_detection_scheduler()
+    tracking_service = get_tracking_service()
+    ground_lane = get_ground_analysis_lane()
+    settings = get_settings()
+    
+    # Decode image
+    image_array = image_service.decode_frame(image_bytes, frame_format, frame_width, frame_height)
+    if image_array is None:
+        logger.error("Failed to decode image")
+        raise HTTPException(
+            status_code=400,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "INVALID_IMAGE",
+                    "message": "Image could not be decoded. Please check format and try again."
+                }
+            }
+        )
+    
+    # Estimate depth
+    depth_map, depth_info = _estimate_depth(image_array, depth_tier)
+    if depth_map is None:
+        logger.error("Depth estimation failed")
+        raise HTTPException(
+            status_code=500,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "DEPTH_ESTIMATION_FAILED",
+                    "message": "Depth estimation failed. Please try again."
+                }
+            }
+        )
+    
+    # Detect objects with depth information (keyframes only within a session)
+    detected_objects_list, schedule_info = detection_scheduler.process(
+        session_id,
+        image_array,
+        depth_map=depth_map,
+        confidence_threshold=0.5,
+        max_objects=10,
+        tier=detection_tier
+    )
+    
+    # Track objects across frames (temporal smoothing), one track info per detection
+    track_infos = tracking_service.update(detected_objects_list)
+    
+    # Ground analysis (stairs, curbs, holes): background lane within a session,
+    # inline within its latency budget otherwise
+    ground_analysis, ground_info = ground_lane.process(
+        session_id, depth_map, depth_range=(settings.min_depth, settings.max_depth)
+    )
+    
+    # Analyze alerts
+    alert_result = alert_service.analyze_depth(depth_map)
+    
+    # Combine warnings from depth analysis and ground analysis
+    all_warnings = alert_result["warnings"].copy()
+    
+    # Add ground-related warnings
+    for ground_warning in ground_analysis.get('warnings', []):
+        all_warnings.append({
+            'message': ground_warning.get('message_tr', ground_warning.get('message_en', 'Ground hazard detected')),
+            'level': ground_warning.get('severity', 'medium'),
+            'distance': 0.0,  # Ground warnings don't have specific distance
+            'area_percentage': 0.0
+        })
+    
+    # Prepare response data
+    warnings_list = [
+        Warning(
+            message=w["message"],
+            level=w["level"],
+            distance=w["distance"],
+            area_percentage=w["area_percentage"]
+        )
+        for w in all_warnings
+    ]
+    
+    # Optional: coarse distance grid for client-side haptics / audio
+    grid = None
+    if include_depth_grid:
+        grid_config = settings.depth_grid
+        grid = DepthGrid(**encode_depth_grid(
+            depth_grid(depth_map, grid_config['rows'], grid_config['cols'], grid_config.get('oversample', 4)),
+            depth_grid_encoding,
+            settings.max_depth
+        ))
+    
+    # Optional: depth visualization, deferred (frame id + URL) or inline base64
+    depth_image_base64 = None
+    frame_id = None
+    depth_image_path = None
+    if depth_image_url:
+        frame_id = get_frame_store().put(
+            image_service.quantize_depth(depth_map),
+            alert_result["alert_level"].value,
+            alert_result["distance_stats"]
+        )
+        depth_image_path = f"/api/frames/{frame_id}/depth.jpg?colormap={colormap.upper()}"
+    elif include_depth_image:
+        depth_colored = image_service.create_visualization(
+            depth_map,
+            alert_result["alert_level"].value,
+            alert_result["distance_stats"],
+            colormap.upper()
+        )
+        
+        if depth_colored is not None:
+            depth_image_base64 = image_service.encode_image_to_base64(depth_colored)
+    
+    # Calculate processing time
+    processing_time = (time.time() - start_time) * 1000  # Convert to ms
+    
+    # Build regional alerts
+    regional_data = alert_result.get("regional_alerts")
+    regional_alerts = None
+    if regional_data:
+        regional_alerts = RegionalAlerts(
+            left=RegionalAlert(**regional_data["left"]),
+            center=RegionalAlert(**regional_data["center"]),
+            right=RegionalAlert(**regional_data["right"])
+        )
+    zones = [ZoneAlert(**zone) for zone in alert_result.get("zones", [])]
+    
+    # Build detected objects (use raw detections + tracking metadata)
+    detected_objects = None
+    if detected_objects_list:
+        detected_objects = []
+        
+        for obj, track_info in zip(detected_objects_list, track_infos):
+            eng_name = obj.get('name', 'unknown')  # ✅ Fixed: 'name' not 'class_name'
+            # Tracking info only for confirmed tracks
+            if not track_info['confirmed']:
+                track_info = {}
+            
+            detected_objects.append(DetectedObject(
+                name=eng_name,
+                name_tr=obj.get('name_tr', eng_name),
+                confidence=obj.get('confidence', 0.0),
+                distance=obj.get('distance', 0.0),
+                region=obj.get('region', 'center'),
+                priority=obj.get('priority', 0),
+                bbox=obj.get('bbox', [0, 0, 0, 0]),
+                center=obj.get('center', [0, 0]),
+                is_approaching=track_info.get('is_approaching', False),
+                track_id=track_info.get('track_id'),
+                stability=track_info.get('stability', 0.0),
+                radial_velocity=track_info.get('radial_velocity'),
+                time_to_collision=track_info.get('time_to_collision'),
+                source=obj.get('source', 'detected')
+            ))
+    
+    # Add metadata for tracking and ground analysis
+    metadata = {
+        'depth': depth_info,
+        'detection': {
+            'tier': object_detection_service.resolve_tier(detection_tier),
+            'model': object_detection_service.model_name,
+            'schedule': schedule_info
+        },
+        'tracking': {
+            'total_tracks': tracking_service.num_tracks,
+            'confirmed_objects': len(tracking_service.get_confirmed_objects())
+        },
+        'ground_analysis': {
+            **ground_info,
+            'time_ms': round(ground_analysis.get('processing_time_ms', 0.0), 2),
+            'hazard_count': ground_analysis.get('ground_hazard_count', 0),
+            'stairs_detected': ground_analysis.get('stairs_detected', False),
+            'slope': ground_analysis.get('slope', 0.0),
+            'slope_deg': (ground_analysis.get('ground_plane') or {}).get('slope_deg'),
+            'smoothness': ground_analysis.get('smoothness', {}).get('smoothness', 'unknown')
+        }
+    }
+    
+    # Build response
+    response = AnalyzeResponse(
+        success=True,
+        timestamp=datetime.now(timezone.utc).isoformat(),
+        processing_time_ms=round(processing_time, 2),
+        data=AnalysisData(
+            alert_level=alert_result["alert_level"].value,
+            distance_stats=DistanceStats(**alert_result["distance_stats"]),
+            warnings=warnings_list,
+            area_percentages=alert_result.get("area_percentages"),
+            regional_alerts=regional_alerts,
+            zones=zones,
+            detected_objects=detected_objects,
+            depth_image_base64=depth_image_base64,
+            depth_grid=grid,
+            frame_id=frame_id,
+            depth_image_url=depth_image_path,
+            metadata=metadata
+        )
+    )
+    
+    logger.info(
+        f"Analysis completed: {alert_result['alert_level'].value}, "
+        f"time: {processing_time:.2f}ms, "
+        f"warnings: {len(warnings_list)}"
+    )
+    
+    # Update Global State for Debug Dashboard
+    # This is a lightweight operation (reference copy)
+    app_state.update_state(
+        original_frame=image_array,
+        depth_map=depth_map,
+        analysis_result={
+            'objects': detected_objects_list,
+            'alert_level': alert_result["alert_level"].value,
+            'alerts': all_warnings
+        }
+    )
+    
+    return response
+
 
 @router.post(
     "/analyze",
@@ -44,7 +358,8 @@ limiter = Limiter(key_func=get_remote_address)
     Upload an image to analyze depth map and detect potential collisions.
     
     **Process:**
-    1. Receives image (JPEG/PNG)
+    1. Receives image (JPEG/PNG, or a raw NV21/NV12/YUV420/gray camera frame
+       described by the X-Frame-Format, X-Frame-Width and X-Frame-Height headers)
     2. Runs MiDaS depth estimation
     3. Analyzes for collision risks
     4. Returns alert level, statistics, and optional depth visualization
@@ -62,15 +377,50 @@ limiter = Limiter(key_func=get_remote_address)
 @limiter.limit("5/second")
 async def analyze_image(
     request: Request,
-    image: UploadFile = File(..., description="Image file (JPEG/PNG, max 10MB)"),
+    image: UploadFile = File(..., description="Image file (JPEG/PNG or raw frame, max 10MB)"),
     include_depth_image: bool = Query(
         default=False,
         description="Include base64 encoded depth visualization in response"
     ),
+    depth_image_url: bool = Query(
+        default=False,
+        description="Return a frame id and /api/frames/{id}/depth.jpg URL instead of an inline "
+                    "visualization; rendered only when fetched"
+    ),
+    include_depth_grid: bool = Query(
+        default=False,
+        alias="depth_grid",
+        description="Include a coarse grid of minimum distances (rows x cols from config)"
+    ),
+    depth_grid_encoding: Optional[str] = Query(
+        default=None,
+        description="Depth grid encoding: float16 (meters) or uint8; defaults to config"
+    ),
     colormap: str = Query(
         default="JET",
         description="Colormap for depth visualization (JET, VIRIDIS, MAGMA, etc.)"
-    )
+    ),
+    detection_tier: Optional[str] = Query(
+        default=None,
+        description="Object detection tier (full, navigation, fast); defaults to config"
+    ),
+    depth_tier: Optional[str] = Query(
+        default=None,
+        description="Depth Anything V2 tier (quality, balanced, fast); defaults to config, "
+                    "ignored when MiDaS is used"
+    ),
+    session_id: Optional[str] = Query(
+        default=None,
+        description="Client session id; enables keyframe scheduling (detector every N frames) "
+                    "and background ground analysis"
+    ),
+    frame_format: Optional[str] = Header(
+        default=None,
+        alias="X-Frame-Format",
+        description="Raw frame format (nv21, nv12, yuv420, gray); omit for JPEG/PNG"
+    ),
+    frame_width: Optional[int] = Header(default=None, alias="X-Frame-Width", description="Raw frame width"),
+    frame_height: Optional[int] = Header(default=None, alias="X-Frame-Height", description="Raw frame height")
 ):
     """
     Analyze uploaded image for depth estimation and collision detection.
@@ -79,7 +429,16 @@ async def analyze_image(
         request: FastAPI request object (for rate limiting)
         image: Uploaded image file
         include_depth_image: Whether to include depth visualization in response
+        depth_image_url: Return a frame id and URL for the depth visualization instead
+        include_depth_grid: Include the coarse distance grid
+        depth_grid_encoding: Depth grid encoding (float16 / uint8)
         colormap: Colormap to use for visualization
+        detection_tier: Object detection tier (input size, class whitelist, max_det)
+        depth_tier: Depth Anything V2 tier (token merging, shallow encoder)
+        session_id: Client session id for keyframe scheduling and the ground analysis lane
+        frame_format: Raw frame format, None for encoded images
+        frame_width: Raw frame width
+        frame_height: Raw frame height
     
     Returns:
         AnalyzeResponse: Analysis results with alert level, stats, and warnings
@@ -87,8 +446,10 @@ async def analyze_image(
     start_time = time.time()
     
     try:
-        # Validate file
-        if not image.content_type or not image.content_type.startswith('image/'):
+        frame_format = _raw_frame_format(frame_format)
+        
+        # Validate file (raw frames are described by their headers instead)
+        if frame_format is None and (not image.content_type or not image.content_type.startswith('image/')):
             logger.warning(f"Invalid content type: {image.content_type}")
             raise HTTPException(
                 status_code=400,
@@ -105,7 +466,7 @@ async def analyze_image(
         image_bytes = await image.read()
         
         # Check size (10MB limit)
-        max_size = 10 * 1024 * 1024  # 10MB
+        max_size = MAX_IMAGE_SIZE
         if len(image_bytes) > max_size:
             logger.warning(f"Image too large: {len(image_bytes)} bytes")
             raise HTTPException(
@@ -119,198 +480,171 @@ async def analyze_image(
                 }
             )
         
-        logger.info(f"Processing image: {image.filename}, size: {len(image_bytes)} bytes")
+        logger.info(f"Upload: {image.filename}")
+        return _analyze_frame(
+            image_bytes, start_time, include_depth_image, depth_image_url,
+            include_depth_grid, depth_grid_encoding, colormap, detection_tier, depth_tier,
+            session_id, frame_format, frame_width, frame_height
+        )
+    
+    except HTTPException:
+        # Re-raise HTTP exceptions
+        raise
+    
+    except Exception as e:
+        # Catch unexpected errors
+        logger.error(f"Unexpected error in analyze_image: {e}", exc_info=True)
+        processing_time = (time.time() - start_time) * 1000
         
-        # Get services
-        image_service = get_image_service()
-        depth_service = get_depth_service()
-        alert_service = get_alert_service()
-        object_detection_service = get_object_detection_service()
-        tracking_service = get_tracking_service()
-        # ✅ REMOVED: ground_service (performance optimization)
+        return AnalyzeResponse(
+            success=False,
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            processing_time_ms=round(processing_time, 2),
+            error={
+                "code": "INTERNAL_ERROR",
+                "message": "An unexpected error occurred during analysis"
+            }
+        )
+
+
+async def _read_body(request: Request, max_size: int) -> memoryview:
+    """
+    Stream the request body into one buffer, enforcing max_size while reading.
+    
+    With a Content-Length the buffer is allocated once up front (and oversized
+    bodies are rejected before reading); chunked bodies grow it as they arrive.
+    """
+    too_large = HTTPException(
+        status_code=413,
+        detail={
+            "success": False,
+            "error": {
+                "code": "IMAGE_TOO_LARGE",
+                "message": f"Image exceeds limit of {max_size} bytes"
+            }
+        }
+    )
+    
+    declared = request.headers.get("content-length")
+    declared = int(declared) if declared and declared.isdigit() else None
+    if declared is not None and declared > max_size:
+        raise too_large
+    
+    buffer = bytearray(declared or 0)
+    size = 0
+    async for chunk in request.stream():
+        if size + len(chunk) > max_size:
+            raise too_large
+        buffer[size:size + len(chunk)] = chunk
+        size += len(chunk)
+    
+    return memoryview(buffer)[:size]
+
+
+@router.post(
+    "/analyze-raw",
+    response_model=AnalyzeResponse,
+    summary="Analyze an image sent as the raw request body",
+    description="""
+    Same analysis as /analyze, without multipart form parsing: the body is the
+    image itself (Content-Type image/jpeg, image/png or application/octet-stream),
+    streamed into a single buffer with the 10MB limit enforced while reading.
+    Options are query parameters; raw camera frames are described by the
+    X-Frame-Format, X-Frame-Width and X-Frame-Height headers.
+    
+    **Rate Limit:** 5 requests per second
+    """,
+    responses={
+        200: {"model": AnalyzeResponse, "description": "Successful analysis"},
+        400: {"model": ErrorResponse, "description": "Invalid image"},
+        413: {"description": "Image too large (max 10MB)"},
+        429: {"description": "Rate limit exceeded"},
+        500: {"model": ErrorResponse, "description": "Server error"}
+    }
+)
+@limiter.limit("5/second")
+async def analyze_raw(
+    request: Request,
+    include_depth_image: bool = Query(
+        default=False,
+        description="Include base64 encoded depth visualization in response"
+    ),
+    depth_image_url: bool = Query(
+        default=False,
+        description="Return a frame id and /api/frames/{id}/depth.jpg URL instead of an inline "
+                    "visualization; rendered only when fetched"
+    ),
+    include_depth_grid: bool = Query(
+        default=False,
+        alias="depth_grid",
+        description="Include a coarse grid of minimum distances (rows x cols from config)"
+    ),
+    depth_grid_encoding: Optional[str] = Query(
+        default=None,
+        description="Depth grid encoding: float16 (meters) or uint8; defaults to config"
+    ),
+    colormap: str = Query(
+        default="JET",
+        description="Colormap for depth visualization (JET, VIRIDIS, MAGMA, etc.)"
+    ),
+    detection_tier: Optional[str] = Query(
+        default=None,
+        description="Object detection tier (full, navigation, fast); defaults to config"
+    ),
+    depth_tier: Optional[str] = Query(
+        default=None,
+        description="Depth Anything V2 tier (quality, balanced, fast); defaults to config, "
+                    "ignored when MiDaS is used"
+    ),
+    session_id: Optional[str] = Query(
+        default=None,
+        description="Client session id; enables keyframe scheduling (detector every N frames) "
+                    "and background ground analysis"
+    ),
+    frame_format: Optional[str] = Header(
+        default=None,
+        alias="X-Frame-Format",
+        description="Raw frame format (nv21, nv12, yuv420, gray); omit for JPEG/PNG"
+    ),
+    frame_width: Optional[int] = Header(default=None, alias="X-Frame-Width", description="Raw frame width"),
+    frame_height: Optional[int] = Header(default=None, alias="X-Frame-Height", description="Raw frame height")
+):
+    """
+    Analyze an image posted as the raw request body.
+    
+    Args: as in analyze_image, with the image read from the body.
+    
+    Returns:
+        AnalyzeResponse: Analysis results with alert level, stats, and warnings
+    """
+    start_time = time.time()
+    
+    try:
+        frame_format = _raw_frame_format(frame_format)
         
-        # Decode image
-        image_array = image_service.decode_image(image_bytes)
-        if image_array is None:
-            logger.error("Failed to decode image")
+        content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+        if content_type not in RAW_BODY_CONTENT_TYPES:
+            logger.warning(f"Invalid content type: {content_type}")
             raise HTTPException(
                 status_code=400,
                 detail={
                     "success": False,
                     "error": {
-                        "code": "INVALID_IMAGE",
-                        "message": "Image could not be decoded. Please check format and try again."
+                        "code": "INVALID_CONTENT_TYPE",
+                        "message": f"Invalid content type: {content_type}. "
+                                   f"Expected one of {', '.join(RAW_BODY_CONTENT_TYPES)}"
                     }
                 }
             )
         
-        # Estimate depth
-        depth_map = depth_service.estimate(image_array)
-        if depth_map is None:
-            logger.error("Depth estimation failed")
-            raise HTTPException(
-                status_code=500,
-                detail={
-                    "success": False,
-                    "error": {
-                        "code": "DEPTH_ESTIMATION_FAILED",
-                        "message": "Depth estimation failed. Please try again."
-                    }
-                }
-            )
+        # Read image data straight into one buffer, decoded without further copies
+        image_bytes = await _read_body(request, MAX_IMAGE_SIZE)
         
-        # Detect objects with depth information
-        detected_objects_list = object_detection_service.detect(
-            image_array,
-            confidence_threshold=0.5,
-            max_objects=10,
-            depth_map=depth_map
+        return _analyze_frame(
+            image_bytes, start_time, include_depth_image, depth_image_url,
+            include_depth_grid, depth_grid_encoding, colormap, detection_tier, depth_tier,
+            session_id, frame_format, frame_width, frame_height
         )
-        
-        # Track objects across frames (temporal smoothing)
-        tracked_objects = tracking_service.update(detected_objects_list)
-        
-        # ✅ REMOVED: Ground analysis (too slow, not priority)
-        # Simple ground check instead
-        ground_analysis = {
-            'features': [],
-            'stairs_detected': False,
-            'stairs_info': None,
-            'slope': 0.0,
-            'smoothness': {'smoothness': 'unknown', 'warning_level': 'none'},
-            'warnings': [],
-            'ground_hazard_count': 0
-        }
-        
-        # Analyze alerts
-        alert_result = alert_service.analyze_depth(depth_map)
-        
-        # Combine warnings from depth analysis and ground analysis
-        all_warnings = alert_result["warnings"].copy()
-        
-        # Add ground-related warnings
-        for ground_warning in ground_analysis.get('warnings', []):
-            all_warnings.append({
-                'message': ground_warning.get('message_tr', ground_warning.get('message_en', 'Ground hazard detected')),
-                'level': ground_warning.get('severity', 'medium'),
-                'distance': 0.0,  # Ground warnings don't have specific distance
-                'area_percentage': 0.0
-            })
-        
-        # Prepare response data
-        warnings_list = [
-            Warning(
-                message=w["message"],
-                level=w["level"],
-                distance=w["distance"],
-                area_percentage=w["area_percentage"]
-            )
-            for w in all_warnings
-        ]
-        
-        # Optional: Generate depth visualization
-        depth_image_base64 = None
-        if include_depth_image:
-            depth_colored = image_service.create_visualization(
-                depth_map,
-                alert_result["alert_level"].value,
-                alert_result["distance_stats"],
-                colormap.upper()
-            )
-            
-            if depth_colored is not None:
-                depth_image_base64 = image_service.encode_image_to_base64(depth_colored)
-        
-        # Calculate processing time
-        processing_time = (time.time() - start_time) * 1000  # Convert to ms
-        
-        # Build regional alerts
-        regional_data = alert_result.get("regional_alerts")
-        regional_alerts = None
-        if regional_data:
-            regional_alerts = RegionalAlerts(
-                left=RegionalAlert(**regional_data["left"]),
-                center=RegionalAlert(**regional_data["center"]),
-                right=RegionalAlert(**regional_data["right"])
-            )
-        
-        # Build detected objects (use raw detections + tracking metadata)
-        detected_objects = None
-        if detected_objects_list:
-            detected_objects = []
-            # Create tracking lookup
-            track_lookup = {t['name']: t for t in tracked_objects} if tracked_objects else {}
-            
-            for obj in detected_objects_list:
-                eng_name = obj.get('name', 'unknown')  # ✅ Fixed: 'name' not 'class_name'
-                # Get tracking info if available
-                track_info = track_lookup.get(eng_name, {})
-                
-                detected_objects.append(DetectedObject(
-                    name=eng_name,
-                    name_tr=obj.get('name_tr', eng_name),
-                    confidence=obj.get('confidence', 0.0),
-                    distance=obj.get('distance', 0.0),
-                    region=obj.get('region', 'center'),
-                    priority=obj.get('priority', 0),
-                    bbox=obj.get('bbox', [0, 0, 0, 0]),
-                    center=obj.get('center', [0, 0]),
-                    is_approaching=track_info.get('is_approaching', False),
-                    track_id=track_info.get('track_id'),
-                    stability=track_info.get('stability', 0.0)
-                ))
-        
-        # Add metadata for tracking and ground analysis
-        metadata = {
-            'tracking': {
-                'total_tracks': len(tracking_service.tracked_objects),
-                'confirmed_objects': len(tracked_objects) if tracked_objects else 0
-            },
-            'ground_analysis': {
-                'hazard_count': ground_analysis.get('ground_hazard_count', 0),
-                'stairs_detected': ground_analysis.get('stairs_detected', False),
-                'slope': ground_analysis.get('slope', 0.0),
-                'smoothness': ground_analysis.get('smoothness', {}).get('smoothness', 'unknown')
-            }
-        }
-        
-        # Build response
-        response = AnalyzeResponse(
-            success=True,
-            timestamp=datetime.now(timezone.utc).isoformat(),
-            processing_time_ms=round(processing_time, 2),
-            data=AnalysisData(
-                alert_level=alert_result["alert_level"].value,
-                distance_stats=DistanceStats(**alert_result["distance_stats"]),
-                warnings=warnings_list,
-                area_percentages=alert_result.get("area_percentages"),
-                regional_alerts=regional_alerts,
-                detected_objects=detected_objects,
-                depth_image_base64=depth_image_base64,
-                metadata=metadata
-            )
-        )
-        
-        logger.info(
-            f"Analysis completed: {alert_result['alert_level'].value}, "
-            f"time: {processing_time:.2f}ms, "
-            f"warnings: {len(warnings_list)}"
-        )
-        
-        # Update Global State for Debug Dashboard
-        # This is a lightweight operation (reference copy)
-        app_state.update_state(
-            original_frame=image_array,
-            depth_map=depth_map,
-            analysis_result={
-                'objects': detected_objects_list,
-                'alert_level': alert_result["alert_level"].value,
-                'alerts': all_warnings
-            }
-        )
-
-        
-        return response
     
     except HTTPException:
         # Re-raise HTTP exceptions
@@ -318,7 +652,7 @@ async def analyze_image(
     
     except Exception as e:
         # Catch unexpected errors
-        logger.error(f"Unexpected error in analyze_image: {e}", exc_info=True)
+        logger.error(f"Unexpected error in analyze_raw: {e}", exc_info=True)
         processing_time = (time.time() - start_time) * 1000
         
         return AnalyzeResponse(
@@ -365,7 +699,23 @@ async def analyze_batch(
     colormap: str = Query(
         default="JET",
         description="Colormap for depth visualization"
-    )
+    ),
+    detection_tier: Optional[str] = Query(
+        default=None,
+        description="Object detection tier (full, navigation, fast); defaults to config"
+    ),
+    depth_tier: Optional[str] = Query(
+        default=None,
+        description="Depth Anything V2 tier (quality, balanced, fast); defaults to config, "
+                    "ignored when MiDaS is used"
+    ),
+    frame_format: Optional[str] = Header(
+        default=None,
+        alias="X-Frame-Format",
+        description="Raw frame format of every image (nv21, nv12, yuv420, gray); omit for JPEG/PNG"
+    ),
+    frame_width: Optional[int] = Header(default=None, alias="X-Frame-Width", description="Raw frame width"),
+    frame_height: Optional[int] = Header(default=None, alias="X-Frame-Height", description="Raw frame height")
 ):
     """
     Batch process multiple images for depth estimation and collision detection.
@@ -378,6 +728,11 @@ async def analyze_batch(
         images: List of image files (max 10)
         include_depth_image: Include depth visualization
         colormap: Colormap to use
+        detection_tier: Object detection tier
+        depth_tier: Depth Anything V2 tier
+        frame_format: Raw frame format shared by all images, None for encoded images
+        frame_width: Raw frame width
+        frame_height: Raw frame height
     
     Returns:
         List[AnalyzeResponse]: Analysis results for each image
@@ -385,6 +740,8 @@ async def analyze_batch(
     start_time = time.time()
     
     try:
+        frame_format = _raw_frame_format(frame_format)
+        
         # Validate batch size
         if len(images) > 10:
             raise HTTPException(
@@ -412,7 +769,6 @@ async def analyze_batch(
         
         # Get services once (reuse for all images)
         image_service = get_image_service()
-        depth_service = get_depth_service()
         alert_service = get_alert_service()
         object_detection_service = get_object_detection_service()
         tracking_service = get_tracking_service()
@@ -420,6 +776,7 @@ async def analyze_batch(
         logger.info(f"Starting batch analysis for {len(images)} images")
         
         # Pre-load models if not already loaded (shared across all images)
+        depth_service = get_depth_service_v2() if get_settings().use_depth_anything_v2 else get_depth_service()
         if not depth_service.is_loaded:
             depth_service.load_model()
         if not object_detection_service.is_loaded:
@@ -433,8 +790,8 @@ async def analyze_batch(
             image_start = time.time()
             
             try:
-                # Validate file
-                if not image_file.content_type or not image_file.content_type.startswith('image/'):
+                # Validate file (raw frames are described by their headers instead)
+                if frame_format is None and (not image_file.content_type or not image_file.content_type.startswith('image/')):
                     results.append(AnalyzeResponse(
                         success=False,
                         timestamp=datetime.now(timezone.utc).isoformat(),
@@ -448,7 +805,7 @@ async def analyze_batch(
                 
                 # Read image data
                 image_bytes = await image_file.read()
-                max_size = 10 * 1024 * 1024
+                max_size = MAX_IMAGE_SIZE
                 
                 if len(image_bytes) > max_size:
                     results.append(AnalyzeResponse(
@@ -462,8 +819,22 @@ async def analyze_batch(
                     ))
                     continue
                 
+                if frame_format is not None:
+                    frame_error = raw_frame_error(frame_format, frame_width, frame_height, len(image_bytes))
+                    if frame_error:
+                        results.append(AnalyzeResponse(
+                            success=False,
+                            timestamp=datetime.now(timezone.utc).isoformat(),
+                            processing_time_ms=0,
+                            error={
+                                "code": "INVALID_FRAME",
+                                "message": f"Image {idx+1}: {frame_error}"
+                            }
+                        ))
+                        continue
+                
                 # Decode image
-                image_array = image_service.decode_image(image_bytes)
+                image_array = image_service.decode_frame(image_bytes, frame_format, frame_width, frame_height)
                 if image_array is None:
                     results.append(AnalyzeResponse(
                         success=False,
@@ -477,7 +848,7 @@ async def analyze_batch(
                     continue
                 
                 # Estimate depth
-                depth_map = depth_service.estimate(image_array)
+                depth_map, depth_info = _estimate_depth(image_array, depth_tier)
                 if depth_map is None:
                     results.append(AnalyzeResponse(
                         success=False,
@@ -495,11 +866,12 @@ async def analyze_batch(
                     image_array,
                     confidence_threshold=0.5,
                     max_objects=10,
-                    depth_map=depth_map
+                    depth_map=depth_map,
+                    tier=detection_tier
                 )
                 
-                # Track objects
-                tracked_objects = tracking_service.update(detected_objects_list)
+                # Track objects, one track info per detection
+                track_infos = tracking_service.update(detected_objects_list)
                 
                 # Analyze alerts
                 alert_result = alert_service.analyze_depth(depth_map)
@@ -510,20 +882,22 @@ async def analyze_batch(
                 ]
                 
                 # Prepare regional alerts
-                regional_alerts = RegionalAlerts(
-                    left=RegionalAlert(**alert_result["regional_alerts"]["left"]),
-                    center=RegionalAlert(**alert_result["regional_alerts"]["center"]),
-                    right=RegionalAlert(**alert_result["regional_alerts"]["right"])
-                )
+                regional_data = alert_result.get("regional_alerts")
+                regional_alerts = None
+                if regional_data:
+                    regional_alerts = RegionalAlerts(
+                        left=RegionalAlert(**regional_data["left"]),
+                        center=RegionalAlert(**regional_data["center"]),
+                        right=RegionalAlert(**regional_data["right"])
+                    )
+                zones = [ZoneAlert(**zone) for zone in alert_result.get("zones", [])]
                 
                 # Prepare detected objects
                 detected_objects = []
-                for obj in detected_objects_list:
+                for obj, track_info in zip(detected_objects_list, track_infos):
                     eng_name = obj.get('name', 'unknown')
-                    track_info = next(
-                        (t for t in (tracked_objects or []) if t['name'] == eng_name),
-                        {}
-                    )
+                    if not track_info['confirmed']:
+                        track_info = {}
                     
                     detected_objects.append(DetectedObject(
                         name=eng_name,
@@ -536,7 +910,9 @@ async def analyze_batch(
                         center=obj.get('center', [0, 0]),
                         is_approaching=track_info.get('is_approaching', False),
                         track_id=track_info.get('track_id'),
-                        stability=track_info.get('stability', 0.0)
+                        stability=track_info.get('stability', 0.0),
+                        radial_velocity=track_info.get('radial_velocity'),
+                        time_to_collision=track_info.get('time_to_collision')
                     ))
                 
                 # Prepare depth image if requested
@@ -549,9 +925,14 @@ async def analyze_batch(
                 
                 # Add metadata
                 metadata = {
+                    'depth': depth_info,
+                    'detection': {
+                        'tier': object_detection_service.resolve_tier(detection_tier),
+                        'model': object_detection_service.model_name
+                    },
                     'tracking': {
-                        'total_tracks': len(tracking_service.tracked_objects),
-                        'confirmed_objects': len(tracked_objects) if tracked_objects else 0
+                        'total_tracks': tracking_service.num_tracks,
+                        'confirmed_objects': len(tracking_service.get_confirmed_objects())
                     },
                     'batch_index': idx + 1
                 }
@@ -570,6 +951,7 @@ async def analyze_batch(
                         warnings=warnings_list,
                         area_percentages=alert_result.get("area_percentages"),
                         regional_alerts=regional_alerts,
+                        zones=zones,
                         detected_objects=detected_objects,
                         depth_image_base64=depth_image_base64,
                         metadata=metadata
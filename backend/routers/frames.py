@@ -0,0 +1,82 @@
+"""
+Frames Router
+=============
+
+Serves deferred depth visualizations of analyzed frames
+(/api/analyze?depth_image_url=true returns the URL).
+"""
+
+import logging
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException, Query, Request
+from fastapi.responses import Response
+from slowapi import Limiter
+from slowapi.util import get_remote_address
+
+from services.frame_store import StoredFrame, get_frame_store
+from services.image_service import ImageService, encode_jpeg, get_image_service
+
+logger = logging.getLogger(__name__)
+
+# Router
+router = APIRouter()
+
+# Rate limiter
+limiter = Limiter(key_func=get_remote_address)
+
+
+def _render_depth(frame: StoredFrame, colormap: str) -> Optional[bytes]:
+    """Colormapped depth with the alert overlay, as JPEG."""
+    image_service = get_image_service()
+    depth_colored = image_service.create_visualization(
+        frame.depth, frame.alert_level, frame.distance_stats, colormap
+    )
+    return encode_jpeg(depth_colored) if depth_colored is not None else None
+
+
+@router.get(
+    "/frames/{frame_id}/depth.jpg",
+    summary="Depth visualization of an analyzed frame",
+    responses={
+        200: {"content": {"image/jpeg": {}}, "description": "Rendered depth visualization"},
+        304: {"description": "Not modified (If-None-Match)"},
+        404: {"description": "Unknown or expired frame"}
+    }
+)
+@limiter.limit("10/second")
+async def frame_depth_image(
+    request: Request,
+    frame_id: str,
+    colormap: str = Query(default="JET", description="Colormap (JET, VIRIDIS, MAGMA, etc.)"),
+    if_none_match: Optional[str] = Header(default=None, alias="If-None-Match")
+):
+    """
+    Render (once per colormap) and return the depth visualization of a frame.
+    
+    Frames stay available for frame_store.ttl_s seconds after analysis.
+    """
+    colormap = colormap.upper() if colormap.upper() in ImageService.COLORMAPS else "JET"
+    store = get_frame_store()
+    
+    etag = f'"{frame_id}.{colormap}"'
+    headers = {"ETag": etag, "Cache-Control": f"private, max-age={int(store.ttl_s)}, immutable"}
+    
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        if store.get(frame_id) is not None:
+            return Response(status_code=304, headers=headers)
+    
+    jpeg = store.render(frame_id, colormap, _render_depth)
+    if jpeg is None:
+        raise HTTPException(
+            status_code=404,
+            detail={
+                "success": False,
+                "error": {
+                    "code": "FRAME_NOT_FOUND",
+                    "message": f"Frame {frame_id} is unknown or expired"
+                }
+            }
+        )
+    
+    return Response(content=jpeg, media_type="image/jpeg", headers=headers)
@@ -1,6 +1,8 @@
 import cv2
 import asyncio
+import logging
 import numpy as np
+from typing import Callable, Dict, Optional
 from fastapi import APIRouter, Request
 from fastapi.responses import StreamingResponse, HTMLResponse, Response
 from fastapi.templating import Jinja2Templates
@@ -8,6 +10,8 @@ from pathlib import Path
 
 from core.state import app_state
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 # Setup templates structure
@@ -46,113 +50,188 @@ DEFAULT_HTML = """
 </html>
 """
 
-async def video_generator():
-    """Generator for video feed (MJPEG)"""
-    while True:
-        try:
-            snapshot = app_state.get_snapshot()
-            frame = snapshot.get('frame')
-            
-            if frame is None:
-                # Return black frame if no data
-                frame = np.zeros((480, 640, 3), dtype=np.uint8)
-                cv2.putText(frame, "Waiting for stream...", (200, 240), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-            
-            # Draw YOLO detections if available
-            analysis = snapshot.get('analysis', {})
-            objects = analysis.get('objects', [])
-            
-            if objects:
-                for obj in objects:
-                    # Get bbox (x1, y1, x2, y2)
-                    bbox = obj.get('bbox')
-                    if not bbox:
-                        continue
-                        
-                    x1, y1, x2, y2 = map(int, bbox)
-                    label = f"{obj.get('name', 'obj')} {obj.get('confidence', 0.0):.2f}"
-                    
-                    # Draw rectangle
-                    cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                    
-                    # Draw label background
-                    (w, h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
-                    cv2.rectangle(frame, (x1, y1 - 20), (x1 + w, y1), (0, 255, 0), -1)
-                    
-                    # Draw text
-                    cv2.putText(frame, label, (x1, y1 - 5), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 1)
-
-            # Encode to JPEG
-            ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-            if not ret:
-                continue
-                
-            frame_bytes = buffer.tobytes()
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            
-            # Control framerate (~30/15 fps to save CPU)
-            await asyncio.sleep(0.06)  # ~15 FPS
+MJPEG_PART = b'--frame\r\nContent-Type: image/jpeg\r\n\r\n'
+MAX_FPS = 15.0
+DISCONNECT_POLL_S = 1.0  # How often an idle viewer checks its connection
+
+
+def waiting_frame(text: str) -> np.ndarray:
+    """Black placeholder frame with a message."""
+    frame = np.zeros((480, 640, 3), dtype=np.uint8)
+    cv2.putText(frame, text, (200, 240), 
+               cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
+    return frame
+
+
+def render_video(snapshot: Dict) -> Optional[bytes]:
+    """Camera frame with YOLO detections, as JPEG."""
+    frame = snapshot.get('frame')
+    
+    if frame is None:
+        frame = waiting_frame("Waiting for stream...")
+    else:
+        # Draw on a copy, the frame itself is shared with app_state
+        frame = frame.copy()
+    
+    # Draw YOLO detections if available
+    analysis = snapshot.get('analysis', {})
+    objects = analysis.get('objects', [])
+    
+    for obj in objects:
+        # Get bbox (x1, y1, x2, y2)
+        bbox = obj.get('bbox')
+        if not bbox:
+            continue
             
-        except Exception as e:
-            print(f"Stream error: {e}")
-            await asyncio.sleep(1)
+        x1, y1, x2, y2 = map(int, bbox)
+        label = f"{obj.get('name', 'obj')} {obj.get('confidence', 0.0):.2f}"
+        
+        # Draw rectangle
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        
+        # Draw label background
+        (w, h), _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 1)
+        cv2.rectangle(frame, (x1, y1 - 20), (x1 + w, y1), (0, 255, 0), -1)
+        
+        # Draw text
+        cv2.putText(frame, label, (x1, y1 - 5), 
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 0, 0), 1)
+
+    ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
+    return buffer.tobytes() if ret else None
+
 
-async def depth_generator():
-    """Generator for depth feed (MJPEG)"""
-    while True:
+def render_depth(snapshot: Dict) -> Optional[bytes]:
+    """Depth map with the Inferno colormap, as JPEG."""
+    depth = snapshot.get('depth')
+    
+    if depth is None:
+        frame = waiting_frame("Waiting for depth...")
+    else:
+        # Normalize to the frame's own range for visualization
+        if depth.dtype != np.uint8:
+            depth = cv2.normalize(depth, None, 0, 255, cv2.NORM_MINMAX, dtype=cv2.CV_8U)
+        
+        # Apply colormap (Inferno/Magma looks good for depth)
+        frame = cv2.applyColorMap(depth, cv2.COLORMAP_INFERNO)
+
+    ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
+    return buffer.tobytes() if ret else None
+
+
+class FramePublisher:
+    """
+    Encode-once MJPEG broadcast of app_state.
+    
+    While anyone is watching, one task renders each new app_state version
+    in a worker thread (at most max_fps per second) and every subscriber
+    sends the same bytes. Nothing is rendered while app_state is unchanged,
+    and the task stops with the last subscriber.
+    """
+    
+    def __init__(self, render: Callable[[Dict], Optional[bytes]], name: str, max_fps: float = MAX_FPS):
+        """
+        Args:
+            render: Snapshot -> JPEG bytes (None on failure); runs in a worker thread
+            name: Feed name for logging
+            max_fps: Upper bound on renders per second
+        """
+        self.render = render
+        self.name = name
+        self.min_interval = 1.0 / max_fps
+        self.jpeg: Optional[bytes] = None
+        self.version: Optional[int] = None  # app_state version of self.jpeg
+        self.subscribers = 0
+        self._rendered_version: Optional[int] = None
+        self._published: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def _run(self):
+        """Render every new app_state version until cancelled."""
+        loop = asyncio.get_running_loop()
+        changed = asyncio.Event()
+        
+        def notify():
+            # Called from whichever thread updated app_state
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(changed.set)
+        
+        app_state.add_listener(notify)
         try:
-            snapshot = app_state.get_snapshot()
-            depth = snapshot.get('depth')
-            
-            if depth is None:
-                # Return black frame if no data
-                frame = np.zeros((480, 640, 3), dtype=np.uint8)
-                cv2.putText(frame, "Waiting for depth...", (200, 240), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 1, (255, 255, 255), 2)
-            else:
-                # Normalize and colormap for visualization
-                # Assuming depth is 0-1 float or close
-                if depth.dtype != np.uint8:
-                     depth_norm = cv2.normalize(depth, None, 0, 255, cv2.NORM_MINMAX)
-                     depth_uint8 = depth_norm.astype(np.uint8)
-                else:
-                    depth_uint8 = depth
+            while True:
+                changed.clear()
+                snapshot = app_state.get_snapshot()
+                if snapshot['version'] == self._rendered_version:
+                    await changed.wait()
+                    continue
                 
-                # Apply colormap (Inferno/Magma looks good for depth)
-                frame = cv2.applyColorMap(depth_uint8, cv2.COLORMAP_INFERNO)
-
-            # Encode to JPEG
-            ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-            if not ret:
-                continue
+                self._rendered_version = snapshot['version']
+                try:
+                    jpeg = await asyncio.to_thread(self.render, snapshot)
+                except Exception as e:
+                    logger.error(f"{self.name} render failed: {e}")
+                    jpeg = None
                 
-            frame_bytes = buffer.tobytes()
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
-            
-            # Control framerate
-            await asyncio.sleep(0.06)
-            
-        except Exception as e:
-            print(f"Depth stream error: {e}")
-            await asyncio.sleep(1)
+                if jpeg is not None:
+                    self.jpeg = jpeg
+                    self.version = snapshot['version']
+                    published, self._published = self._published, asyncio.Event()
+                    published.set()
+                
+                await asyncio.sleep(self.min_interval)
+        finally:
+            app_state.remove_listener(notify)
+    
+    def _subscribe(self):
+        self.subscribers += 1
+        if self._task is None:
+            self._published = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+    
+    def _unsubscribe(self):
+        self.subscribers -= 1
+        if self.subscribers == 0 and self._task is not None:
+            self._task.cancel()
+            self._task = None
+    
+    async def frames(self, request: Request):
+        """MJPEG parts for one viewer: the latest frame, then each new one, until it disconnects."""
+        self._subscribe()
+        sent_version = None
+        try:
+            while True:
+                if self.version == sent_version:
+                    try:
+                        await asyncio.wait_for(self._published.wait(), DISCONNECT_POLL_S)
+                    except asyncio.TimeoutError:
+                        if await request.is_disconnected():
+                            break
+                    continue
+                
+                sent_version = self.version
+                yield MJPEG_PART + self.jpeg + b'\r\n'
+        finally:
+            self._unsubscribe()
+            logger.debug(f"{self.name} viewer left, {self.subscribers} remaining")
+
+
+video_publisher = FramePublisher(render_video, "Video feed")
+depth_publisher = FramePublisher(render_depth, "Depth feed")
+
 
 @router.get("/video_feed")
-async def video_feed():
+async def video_feed(request: Request):
     """Video streaming route."""
     return StreamingResponse(
-        video_generator(), 
+        video_publisher.frames(request), 
         media_type="multipart/x-mixed-replace; boundary=frame"
     )
 
 @router.get("/depth_feed")
-async def depth_feed():
+async def depth_feed(request: Request):
     """Depth streaming route."""
     return StreamingResponse(
-        depth_generator(), 
+        depth_publisher.frames(request), 
         media_type="multipart/x-mixed-replace; boundary=frame"
     )
 
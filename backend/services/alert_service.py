@@ -4,17 +4,27 @@ Alert Service
 
 Analyzes depth maps and generates collision warnings.
 Adapted from src/alert_system.py for API usage.
+
+Besides the whole frame, every configured alert zone (see services/alert_zones.py)
+gets its own alert level; statistics for all zones come from one pass.
 """
 
 import logging
 import numpy as np
 from enum import Enum
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from core.config import get_settings
+from services.alert_zones import ZoneLayout, expand_zones, rasterize_zones
 
 logger = logging.getLogger(__name__)
 
+# Upper edge of the MEDIUM band (meters)
+MEDIUM_DISTANCE = 2.0
+
+# Zones reported in the legacy regional_alerts field (when configured)
+REGION_NAMES = ("left", "center", "right")
+
 
 class AlertLevel(str, Enum):
     """Alert severity levels."""
@@ -38,6 +48,8 @@ class AlertService:
         self.min_distance = self.settings.alert_min_distance
         self.warning_distance = self.settings.alert_warning_distance
         self.warning_area_threshold = self.settings.warning_area_threshold
+        self.zone_specs = self.settings.alert_zones
+        self._layout_cache: Dict[Tuple[int, int], ZoneLayout] = {}
         
         logger.info(
             f"AlertService initialized: "
@@ -58,38 +70,37 @@ class AlertService:
                 - distance_stats: {min, max, avg}
                 - warnings: List of warning messages
                 - area_percentages: Dict of area ratios per level
-                - regional_alerts: {left, center, right} zone analysis
+                - zones: Per-zone analysis, one dict (with 'name') per configured zone
+                - regional_alerts: {left, center, right} zone analysis, if those zones exist
         """
         if depth_map is None or depth_map.size == 0:
             return self._safe_response()
         
         try:
-            # Filter invalid values
-            valid_depth = depth_map[np.isfinite(depth_map)]
-            if valid_depth.size == 0:
+            names, zones = self._zone_statistics(depth_map)
+            
+            # Last entry is the whole frame
+            valid_count = zones["count"][-1]
+            if valid_count == 0:
                 return self._safe_response()
             
             # Calculate distance statistics
-            min_dist = float(np.min(valid_depth))
-            max_dist = float(np.max(valid_depth))
-            avg_dist = float(np.mean(valid_depth))
+            min_dist = float(zones["min"][-1])
+            max_dist = float(zones["max"][-1])
+            avg_dist = float(zones["sum"][-1] / valid_count)
             
-            # Regional analysis (divide into left, center, right)
-            regional_alerts = self._analyze_regions(depth_map)
+            # Per-zone analysis
+            zone_alerts = [
+                {"name": name, **self._analyze_single_region(zones, index)}
+                for index, name in enumerate(names)
+            ]
             
             # Analyze danger zones
             total_pixels = depth_map.size
-            danger_mask = depth_map < self.min_distance
-            near_mask = (depth_map >= self.min_distance) & (depth_map < self.warning_distance)
-            medium_mask = (depth_map >= self.warning_distance) & (depth_map < 2.0)
-            
-            danger_ratio = float(np.sum(danger_mask) / total_pixels)
-            near_ratio = float(np.sum(near_mask) / total_pixels)
-            medium_ratio = float(np.sum(medium_mask) / total_pixels)
+            danger_ratio, near_ratio, medium_ratio = (zones["bands"][-1] / total_pixels).tolist()
             
             # Determine alert level and generate warnings
             warnings = []
-            
             if danger_ratio > self.warning_area_threshold:
                 alert_level = AlertLevel.DANGER
                 warnings.append({
@@ -138,53 +149,106 @@ class AlertService:
                     "near": near_ratio * 100,
                     "medium": medium_ratio * 100
                 },
-                "regional_alerts": regional_alerts
+                "zones": zone_alerts,
+                "regional_alerts": self._regional_alerts(zone_alerts)
             }
         
         except Exception as e:
             logger.error(f"Alert analysis error: {e}", exc_info=True)
             return self._safe_response()
     
-    def _analyze_regions(self, depth_map: np.ndarray) -> Dict:
+    def _zone_layout(self, shape: Tuple[int, int]) -> ZoneLayout:
+        """Rasterized zones for a depth map resolution, cached."""
+        layout = self._layout_cache.get(shape)
+        if layout is None:
+            layout = rasterize_zones(self.zone_specs, shape)
+            self._layout_cache[shape] = layout
+        return layout
+    
+    def _zone_statistics(self, depth_map: np.ndarray) -> Tuple[List[str], Dict[str, np.ndarray]]:
         """
-        Analyze depth map by regions (left, center, right).
+        Per-zone statistics of the depth map in a single sweep.
+        
+        Every quantity (finite count, min, max, sum and the number of pixels below each
+        band edge) is one reduceat over the runs of the layout (see ZoneLayout); runs are
+        folded into atoms with bincount / reduceat, atoms into zones through the
+        membership matrix.
         
-        Args:
-            depth_map: Depth map in meters
-            
         Returns:
-            Dict with regional analysis
+            (zone names, stats) - stats holds per-zone arrays with one extra trailing entry
+            for the whole frame: count (finite pixels), pixels (all pixels), min, max, sum
+            and bands (Z + 1, 3) pixel counts for danger/near/medium
         """
-        height, width = depth_map.shape
-        third = width // 3
+        layout = self._zone_layout(depth_map.shape)
+        starts = layout.run_starts
+        values = depth_map.ravel()
         
-        # Split into regions
-        left_region = depth_map[:, :third]
-        center_region = depth_map[:, third:2*third]
-        right_region = depth_map[:, 2*third:]
+        # Runs are at most one row long: small integer counts and float32 partial sums
+        count_dtype = np.uint16 if depth_map.shape[1] <= np.iinfo(np.uint16).max else np.int64
         
-        # Analyze each region
-        regions = {
-            "left": self._analyze_single_region(left_region, "left"),
-            "center": self._analyze_single_region(center_region, "center"),
-            "right": self._analyze_single_region(right_region, "right")
-        }
+        finite = np.isfinite(values)
+        if finite.all():
+            atom_count = layout.atom_pixels
+            run_min = np.minimum.reduceat(values, starts)
+            run_max = np.maximum.reduceat(values, starts)
+            run_sum = np.add.reduceat(values, starts)
+        else:
+            atom_count = None
+            run_count = np.add.reduceat(finite.view(np.uint8), starts, dtype=count_dtype)
+            run_min = np.fmin.reduceat(np.where(finite, values, np.nan), starts)
+            run_max = np.fmax.reduceat(np.where(finite, values, np.nan), starts)
+            run_sum = np.add.reduceat(np.where(finite, values, 0), starts)
         
-        return regions
+        # Pixels below each band edge; the raw values are compared with the same scalars
+        # as per-band masks would be, so NaN falls in no band and -inf in danger
+        edges = (self.min_distance, self.warning_distance, MEDIUM_DISTANCE)
+        run_below = [
+            np.add.reduceat((values < edge).view(np.uint8), starts, dtype=count_dtype)
+            for edge in edges
+        ]
+        
+        num_atoms = len(layout.atom_pixels)
+        
+        def fold(run_values):
+            return np.bincount(layout.run_atoms, weights=run_values, minlength=num_atoms)
+        
+        if atom_count is None:
+            atom_count = fold(run_count).astype(np.int64)
+        atom_sum = fold(run_sum)
+        atom_below = np.stack([fold(below) for below in run_below], axis=1).astype(np.int64)
+        atom_min = np.fmin.reduceat(run_min[layout.run_order], layout.atom_runs)
+        atom_max = np.fmax.reduceat(run_max[layout.run_order], layout.atom_runs)
+        
+        membership = layout.membership
+        below = membership.T @ atom_below
+        bands = np.stack([
+            below[:, 0],
+            np.maximum(below[:, 1] - below[:, 0], 0),
+            np.maximum(below[:, 2] - below[:, 1], 0)
+        ], axis=1)
+        
+        member = membership.astype(bool)
+        return layout.names, {
+            "count": membership.T @ atom_count,
+            "pixels": membership.T @ layout.atom_pixels,
+            "min": np.fmin.reduce(np.where(member, atom_min[:, None], np.inf), axis=0),
+            "max": np.fmax.reduce(np.where(member, atom_max[:, None], -np.inf), axis=0),
+            "sum": membership.T @ atom_sum,
+            "bands": bands
+        }
     
-    def _analyze_single_region(self, region: np.ndarray, region_name: str) -> Dict:
+    def _analyze_single_region(self, zones: Dict[str, np.ndarray], index: int) -> Dict:
         """
-        Analyze a single region for obstacles.
+        Alert for one zone from the per-zone statistics.
         
         Args:
-            region: Depth map region
-            region_name: Name of the region
+            zones: Output of _zone_statistics
+            index: Zone index
             
         Returns:
             Dict with region analysis
         """
-        valid_depth = region[np.isfinite(region)]
-        if valid_depth.size == 0:
+        if zones["count"][index] == 0:
             return {
                 "alert_level": "SAFE",
                 "min_distance": 5.0,
@@ -192,16 +256,13 @@ class AlertService:
                 "message": ""
             }
         
-        min_dist = float(np.min(valid_depth))
-        avg_dist = float(np.mean(valid_depth))
+        min_dist = float(zones["min"][index])
+        avg_dist = float(zones["sum"][index] / zones["count"][index])
         
         # Calculate danger ratio in this region
-        total_pixels = region.size
-        danger_mask = region < self.min_distance
-        near_mask = (region >= self.min_distance) & (region < self.warning_distance)
-        
-        danger_ratio = float(np.sum(danger_mask) / total_pixels)
-        near_ratio = float(np.sum(near_mask) / total_pixels)
+        total_pixels = zones["pixels"][index]
+        danger_ratio = float(zones["bands"][index, 0] / total_pixels)
+        near_ratio = float(zones["bands"][index, 1] / total_pixels)
         
         # Determine alert level for this region
         if danger_ratio > self.warning_area_threshold * 0.5:  # Lower threshold for regions
@@ -231,8 +292,22 @@ class AlertService:
             "near_percentage": near_ratio * 100
         }
     
+    def _regional_alerts(self, zone_alerts: List[Dict]) -> Optional[Dict]:
+        """Legacy {left, center, right} view of the zone alerts."""
+        by_name = {zone["name"]: zone for zone in zone_alerts}
+        if not all(name in by_name for name in REGION_NAMES):
+            return None
+        return {
+            name: {key: value for key, value in by_name[name].items() if key != "name"}
+            for name in REGION_NAMES
+        }
+    
     def _safe_response(self) -> Dict:
         """Return a safe/default response."""
+        zone_alerts = [
+            {"name": zone["name"], "alert_level": "SAFE", "min_distance": 5.0, "has_obstacle": False, "message": ""}
+            for zone in expand_zones(self.zone_specs)
+        ]
         return {
             "alert_level": AlertLevel.SAFE,
             "distance_stats": {
@@ -246,11 +321,8 @@ class AlertService:
                 "near": 0.0,
                 "medium": 0.0
             },
-            "regional_alerts": {
-                "left": {"alert_level": "SAFE", "min_distance": 5.0, "has_obstacle": False, "message": ""},
-                "center": {"alert_level": "SAFE", "min_distance": 5.0, "has_obstacle": False, "message": ""},
-                "right": {"alert_level": "SAFE", "min_distance": 5.0, "has_obstacle": False, "message": ""}
-            }
+            "zones": zone_alerts,
+            "regional_alerts": self._regional_alerts(zone_alerts)
         }
 
 
@@ -0,0 +1,127 @@
+"""
+Alert Zones
+===========
+
+Configurable alert zones, rasterized once per depth map resolution.
+
+Zones are given in normalized image coordinates (0-1, origin top-left):
+
+    {"name": "head", "rect": [0.2, 0.0, 0.8, 0.25]}
+    {"name": "corridor", "polygon": [[0.35, 0.55], [0.65, 0.55], [0.9, 1.0], [0.1, 1.0]]}
+    {"name": "grid", "grid": [3, 3]}                  # cells grid_0_0 ... grid_2_2
+    {"name": "floor", "grid": [1, 3], "rect": [0.0, 0.5, 1.0, 1.0]}
+
+Zones may overlap. Every pixel gets the id of its "atom", the set of zones it
+belongs to. In row-major order an atom is a set of contiguous runs, so per-frame
+statistics are one reduceat per quantity over the run starts of the raw map,
+folded into atoms and then zones; the per-pixel cost does not grow with the
+number of zones.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import cv2
+import numpy as np
+
+# Zone membership is packed into an int64 bitmask per pixel
+MAX_ZONES = 62
+
+
+def expand_zones(specs: List[Dict]) -> List[Dict]:
+    """Expand grid shorthands into one rect zone per cell."""
+    zones = []
+    for spec in specs:
+        if "grid" not in spec:
+            zones.append(spec)
+            continue
+
+        rows, cols = spec["grid"]
+        x0, y0, x1, y1 = spec.get("rect", [0.0, 0.0, 1.0, 1.0])
+        for row in range(rows):
+            for col in range(cols):
+                zones.append({
+                    "name": f"{spec['name']}_{row}_{col}",
+                    "rect": [
+                        x0 + (x1 - x0) * col / cols,
+                        y0 + (y1 - y0) * row / rows,
+                        x0 + (x1 - x0) * (col + 1) / cols,
+                        y0 + (y1 - y0) * (row + 1) / rows
+                    ]
+                })
+    return zones
+
+
+def pixel_edge(value: float, size: int) -> int:
+    """
+    Pixel index of a normalized rect edge. Edges within 1/1000 px of a pixel
+    boundary snap to it, so rounded config values (0.3333333) still give
+    size // 3 when size is a multiple of 3.
+    """
+    return int(np.floor(round(value * size, 3)))
+
+
+def zone_mask(spec: Dict, shape: Tuple[int, int]) -> np.ndarray:
+    """Boolean (H, W) mask of one rect or polygon zone."""
+    height, width = shape
+    mask = np.zeros(shape, dtype=np.uint8)
+
+    if "rect" in spec:
+        x0, y0, x1, y1 = spec["rect"]
+        mask[pixel_edge(y0, height):pixel_edge(y1, height),
+             pixel_edge(x0, width):pixel_edge(x1, width)] = 1
+    elif "polygon" in spec:
+        points = np.round(np.asarray(spec["polygon"], dtype=np.float64) * [width, height])
+        cv2.fillPoly(mask, [points.astype(np.int32)], 1)
+    else:
+        raise ValueError(f"Zone '{spec.get('name')}' needs a 'rect', 'polygon' or 'grid'")
+
+    return mask.astype(bool)
+
+
+@dataclass
+class ZoneLayout:
+    """Runs, atoms and zone membership for one resolution."""
+
+    names: List[str]
+    run_starts: np.ndarray   # (R,) flat index where each run of equal atom id starts
+    run_atoms: np.ndarray    # (R,) atom id of each run
+    run_order: np.ndarray    # (R,) runs sorted by atom
+    atom_runs: np.ndarray    # (A,) first position of every atom in `run_order`
+    atom_pixels: np.ndarray  # (A,) pixels per atom
+    membership: np.ndarray   # (A, Z + 1) int64; last column is the whole frame
+
+
+def rasterize_zones(specs: List[Dict], shape: Tuple[int, int]) -> ZoneLayout:
+    """Rasterize zone specs into a ZoneLayout for a (H, W) depth map."""
+    zones = expand_zones(specs)
+    if len(zones) > MAX_ZONES:
+        raise ValueError(f"At most {MAX_ZONES} alert zones are supported, got {len(zones)}")
+
+    codes = np.zeros(shape, dtype=np.int64)
+    for bit, spec in enumerate(zones):
+        codes |= zone_mask(spec, shape).astype(np.int64) << bit
+
+    atom_codes, labels = np.unique(codes.ravel(), return_inverse=True)
+    atom_pixels = np.bincount(labels, minlength=len(atom_codes))
+
+    # Runs never cross a row boundary, so a run is at most one row long
+    width = shape[1]
+    breaks = labels[1:] != labels[:-1]
+    breaks[width - 1::width] = True
+    run_starts = np.concatenate([[0], np.flatnonzero(breaks) + 1])
+    run_atoms = labels[run_starts]
+    run_order = np.argsort(run_atoms, kind="stable")
+
+    membership = (atom_codes[:, None] >> np.arange(len(zones))) & 1
+    membership = np.concatenate([membership, np.ones((len(atom_codes), 1), dtype=np.int64)], axis=1)
+
+    return ZoneLayout(
+        names=[zone["name"] for zone in zones],
+        run_starts=run_starts,
+        run_atoms=run_atoms,
+        run_order=run_order,
+        atom_runs=np.searchsorted(run_atoms[run_order], np.arange(len(atom_codes))),
+        atom_pixels=atom_pixels,
+        membership=membership
+    )
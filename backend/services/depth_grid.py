@@ -0,0 +1,62 @@
+"""
+Depth Grid
+==========
+
+Coarse distance field for client-side haptics and audio.
+
+The depth map is reduced to a rows x cols grid of robust minimum distances:
+one cv2.resize(INTER_AREA) to an `oversample`-times finer grid averages away
+single-pixel noise, then each cell takes the minimum of its oversample x
+oversample sub-blocks. A 16x12 grid is 384 bytes as float16 meters, or 192
+bytes as uint8 in `step` units (saturating at 255 steps), base64-packed.
+"""
+
+import base64
+import math
+from typing import Dict
+
+import cv2
+import numpy as np
+
+GRID_ENCODINGS = ('float16', 'uint8')
+
+
+def depth_grid(depth_map: np.ndarray, rows: int, cols: int, oversample: int = 4) -> np.ndarray:
+    """(rows, cols) float32 grid of robust per-cell minimum depths."""
+    fine = cv2.resize(
+        np.asarray(depth_map, dtype=np.float32),
+        (cols * oversample, rows * oversample),
+        interpolation=cv2.INTER_AREA
+    )
+    return fine.reshape(rows, oversample, cols, oversample).min(axis=(1, 3))
+
+
+def uint8_step(max_depth: float) -> float:
+    """Smallest whole-centimetre step (in meters) that fits max_depth into 255 units."""
+    return math.ceil(max_depth * 100 / 255) / 100
+
+
+def encode_depth_grid(grid: np.ndarray, encoding: str, max_depth: float) -> Dict:
+    """
+    Pack a depth grid for the response.
+
+    Returns:
+        {'rows', 'cols', 'encoding', 'scale', 'data'} - data is base64 of the row-major
+        (top-left first) little-endian values; meters = value * scale
+    """
+    if encoding == 'uint8':
+        scale = uint8_step(max_depth)
+        values = np.clip(np.rint(grid / scale), 0, 255).astype(np.uint8)
+    elif encoding == 'float16':
+        scale = 1.0
+        values = grid.astype('<f2')
+    else:
+        raise ValueError(f"Unknown depth grid encoding '{encoding}', expected one of {GRID_ENCODINGS}")
+
+    return {
+        'rows': grid.shape[0],
+        'cols': grid.shape[1],
+        'encoding': encoding,
+        'scale': scale,
+        'data': base64.b64encode(values.tobytes()).decode('ascii')
+    }
@@ -4,6 +4,9 @@ Depth Estimation Service with OpenVINO Support
 
 Wrapper for MiDaS depth estimation model with OpenVINO optimization.
 Provides 3-5x speedup on Intel GPUs/CPUs.
+
+Also serves the TinyDepthNet student distilled from Depth Anything V2
+(model_type "DepthStudent", OpenVINO only - see metric_depth/export_student.py).
 """
 
 import torch
@@ -38,9 +41,14 @@ class DepthService:
     SUPPORTED_MODELS = {
         "DPT_Large": "DPT_Large",
         "DPT_Hybrid": "DPT_Hybrid",
-        "MiDaS_small": "MiDaS_small"
+        "MiDaS_small": "MiDaS_small",
+        "DepthStudent": "DepthStudent"
     }
     
+    # ImageNet statistics used to train the distilled student
+    STUDENT_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+    STUDENT_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+    
     def __init__(self):
         """Initialize depth service."""
         self.settings = get_settings()
@@ -49,6 +57,11 @@ class DepthService:
         self.max_depth = self.settings.max_depth
         self.use_openvino = self.settings.use_openvino and OPENVINO_AVAILABLE
         
+        # Distilled student: exported IR only, outputs metric depth directly
+        self.is_student = self.model_type == "DepthStudent"
+        if self.is_student and not self.use_openvino:
+            logger.warning("DepthStudent requires OpenVINO (use_openvino: true + pip install openvino)")
+        
         # Device selection
         if self.use_openvino:
             self.backend = "openvino"
@@ -90,6 +103,10 @@ class DepthService:
         if self.is_loaded:
             return True
         
+        if self.is_student and not self.use_openvino:
+            logger.error("DepthStudent cannot be loaded without OpenVINO")
+            return False
+        
         try:
             logger.info(f"Loading MiDaS model: {self.model_type} ({self.backend})...")
             start_time = time.time()
@@ -156,6 +173,13 @@ class DepthService:
             model_xml = model_dir / f"{self.model_type}.xml"
             model_bin = model_dir / f"{self.model_type}.bin"
             
+            if not model_xml.exists() and self.is_student:
+                logger.error(
+                    f"{model_xml} not found. Export the distilled student with "
+                    f"Depth-Anything-V2/metric_depth/export_student.py"
+                )
+                return False
+            
             if not model_xml.exists():
                 logger.info("OpenVINO model not found, converting from PyTorch...")
                 success = self._convert_to_openvino()
@@ -182,6 +206,8 @@ class DepthService:
             
         except Exception as e:
             logger.error(f"OpenVINO model loading failed: {e}", exc_info=True)
+            if self.is_student:
+                return False
             logger.warning("Falling back to PyTorch")
             self.use_openvino = False
             self.backend = "pytorch"
@@ -299,6 +325,9 @@ class DepthService:
         # Convert BGR to RGB
         rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
         
+        if self.is_student:
+            return self._estimate_student(rgb_image, image.shape[:2])
+        
         # Prepare input (resize and normalize)
         if self.model_type == "MiDaS_small":
             input_size = (256, 256)
@@ -321,6 +350,31 @@ class DepthService:
         # Post-process
         return self._postprocess_depth(prediction, image.shape[:2])
     
+    def _estimate_student(self, rgb_image: np.ndarray, target_shape: Tuple[int, int]) -> np.ndarray:
+        """Distilled student inference (fixed IR input size, metric output)."""
+        _, _, input_height, input_width = self.input_layer.shape
+        
+        resized = cv2.resize(rgb_image, (int(input_width), int(input_height)), interpolation=cv2.INTER_AREA)
+        normalized = (resized.astype(np.float32) / 255.0 - self.STUDENT_MEAN) / self.STUDENT_STD
+        
+        input_data = np.expand_dims(np.transpose(normalized, (2, 0, 1)), 0)
+        
+        result = self.ov_compiled_model([input_data])[self.output_layer]
+        prediction = result.squeeze().astype(np.float32)
+        
+        # Already in meters: clip to the configured range instead of min-max rescaling
+        metric_depth = np.clip(prediction, self.min_depth, self.max_depth)
+        
+        if metric_depth.shape != target_shape:
+            target_height, target_width = target_shape
+            metric_depth = cv2.resize(
+                metric_depth,
+                (target_width, target_height),
+                interpolation=cv2.INTER_LINEAR
+            )
+        
+        return metric_depth
+    
     def _postprocess_depth(self, prediction: np.ndarray, target_shape: Tuple[int, int]) -> np.ndarray:
         """Post-process depth map."""
         # Normalize to 0-1
@@ -32,6 +32,19 @@ except ImportError as e:
     DEPTH_ANYTHING_AVAILABLE = False
     logger.warning(f"Depth Anything V2 not available: {e}")
 
+# Metric variant (Sigmoid x max_depth head) - shallow tier heads are trained with metric_depth/train.py
+try:
+    from metric_depth.depth_anything_v2.dpt import DepthAnythingV2 as MetricDepthAnythingV2
+    METRIC_DEPTH_AVAILABLE = True
+except ImportError:
+    METRIC_DEPTH_AVAILABLE = False
+
+MODEL_CONFIGS = {
+    'vits': {'encoder': 'vits', 'features': 64, 'out_channels': [48, 96, 192, 384]},
+    'vitb': {'encoder': 'vitb', 'features': 128, 'out_channels': [96, 192, 384, 768]},
+    'vitl': {'encoder': 'vitl', 'features': 256, 'out_channels': [256, 512, 1024, 1024]},
+}
+
 
 class DepthServiceV2:
     """
@@ -49,7 +62,13 @@ class DepthServiceV2:
         self.model = None
         self.device = 'cpu'  # CPU for now (GPU later with OpenVINO)
         self.is_loaded = False
-        self.model_type = 'vitb'  # Base model (94MB)
+        self.model_type = 'vits'  # Small model (25MB)
+        
+        # Per-tier models that need their own head (e.g. shallow encoder tier).
+        # They share the encoder weights with self.model. Tiers in metric_tiers
+        # output metric depth (far = large) and are converted to disparity.
+        self.tier_models = {}
+        self.metric_tiers = set()
         
         # Stats
         self.total_inferences = 0
@@ -69,7 +88,7 @@ class DepthServiceV2:
             start = time.time()
             
             # Model weights path
-            model_path = Path(__file__).parent.parent.parent / "depth_anything_v2" / "checkpoints" / "depth_anything_v2_vits.pth"
+            model_path = Path(__file__).parent.parent.parent / "depth_anything_v2" / "checkpoints" / f"depth_anything_v2_{self.model_type}.pth"
             
             if not model_path.exists():
                 logger.error(f"Model weights not found: {model_path}")
@@ -77,7 +96,7 @@ class DepthServiceV2:
                 return False
             
             # Initialize model
-            self.model = DepthAnythingV2(encoder='vits', features=64, out_channels=[48, 96, 192, 384])
+            self.model = DepthAnythingV2(**MODEL_CONFIGS[self.model_type])
             
             # Load weights (strict=False for partial loading if needed)
             state_dict = torch.load(str(model_path), map_location=self.device)
@@ -88,7 +107,7 @@ class DepthServiceV2:
             self.is_loaded = True
             
             logger.info(f"✓ Depth Anything V2 loaded successfully!")
-            logger.info(f"  Model: vitb (Base), Size: 97M params")
+            logger.info(f"  Model: {self.model_type}")
             logger.info(f"  Loading time: {load_time:.2f}ms")
             logger.info(f"  Device: {self.device}")
             
@@ -99,10 +118,81 @@ class DepthServiceV2:
             self.is_loaded = False
             return False
     
+    def resolve_tier(self, tier: Optional[str] = None) -> str:
+        """Map a requested depth tier to a configured one (None or unknown -> default)."""
+        tier = tier or self.settings.depth_tier
+        if tier not in self.settings.depth_tiers:
+            logger.warning(f"Unknown depth tier '{tier}', using '{self.settings.depth_tier}'")
+            tier = self.settings.depth_tier
+        return tier
+    
+    def get_tier_config(self, tier: Optional[str] = None) -> dict:
+        """
+        Resolve a speed/quality tier to its inference options.
+        
+        Args:
+            tier: Tier name from config (e.g. 'quality', 'fast'); None uses the default tier
+            
+        Returns:
+            Dict of inference options (merge_ratio, ...)
+        """
+        return self.settings.depth_tiers.get(self.resolve_tier(tier), {})
+    
+    def _get_tier_model(self, tier: str, tier_config: dict):
+        """
+        Get the model that serves a tier.
+        
+        Shallow tiers tap earlier encoder layers and need a DPT head fine-tuned for them
+        (Depth-Anything-V2/metric_depth/train.py --shallow --freeze-encoder). That head is
+        metric (Sigmoid x max_depth), so it is loaded into the metric model class and the
+        tier is added to metric_tiers. The encoder is shared with the full model, only the
+        head weights are loaded from `head_checkpoint`. Falls back to the full model if no
+        adapted head is available.
+        """
+        if not tier_config.get('shallow', False):
+            return self.model
+        
+        if tier in self.tier_models:
+            return self.tier_models[tier]
+        
+        model = self.model
+        head_path = Path(__file__).parent.parent.parent / tier_config.get('head_checkpoint', '')
+        if not tier_config.get('head_checkpoint') or not head_path.is_file():
+            logger.warning(f"Depth tier '{tier}': head checkpoint not found ({head_path}), using full model")
+        elif not METRIC_DEPTH_AVAILABLE:
+            logger.warning(f"Depth tier '{tier}': metric_depth package not available, using full model")
+        else:
+            try:
+                model = MetricDepthAnythingV2(
+                    **MODEL_CONFIGS[self.model_type],
+                    max_depth=tier_config.get('max_depth', 20.0),
+                    shallow=True
+                )
+                model.pretrained = self.model.pretrained
+                
+                state_dict = torch.load(str(head_path), map_location=self.device)
+                state_dict = state_dict.get('model', state_dict)  # train.py checkpoint format
+                head_state = {
+                    k.replace('module.', '', 1)[len('depth_head.'):]: v
+                    for k, v in state_dict.items()
+                    if k.replace('module.', '', 1).startswith('depth_head.')
+                }
+                model.depth_head.load_state_dict(head_state)
+                model.eval()
+                self.metric_tiers.add(tier)
+                logger.info(f"✓ Depth tier '{tier}': shallow encoder (layers {model.layer_idx})")
+            except Exception as e:
+                logger.error(f"Depth tier '{tier}': failed to load shallow head: {e}, using full model")
+                model = self.model
+        
+        self.tier_models[tier] = model
+        return model
+    
     def estimate(
         self,
         image: np.ndarray,
-        target_size: Optional[tuple] = None
+        target_size: Optional[tuple] = None,
+        tier: Optional[str] = None
     ) -> np.ndarray:
         """
         Estimate depth from RGB image
@@ -110,6 +200,7 @@ class DepthServiceV2:
         Args:
             image: Input image (BGR format, OpenCV style)
             target_size: Optional (width, height) to resize depth map
+            tier: Optional speed/quality tier (see config depth_model.tiers)
             
         Returns:
             Normalized depth map (0-1, float32)
@@ -128,8 +219,20 @@ class DepthServiceV2:
             # Convert BGR to RGB
             rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
             
+            # Model and token merging ratio for the selected tier
+            tier = self.resolve_tier(tier)
+            tier_config = self.get_tier_config(tier)
+            model = self._get_tier_model(tier, tier_config)
+            
             # Inference (model expects RGB)
-            depth = self.model.infer_image(rgb_image)
+            depth = model.infer_image(
+                rgb_image,
+                merge_ratio=tier_config.get('merge_ratio', 0.0)
+            )
+            
+            # Metric heads output depth (far = large); the service works on disparity
+            if tier in self.metric_tiers:
+                depth = 1.0 / np.maximum(depth, 1e-3)
             
             # Normalize to 0-1 range
             depth_normalized = (depth - depth.min()) / (depth.max() - depth.min() + 1e-8)
@@ -154,7 +257,7 @@ class DepthServiceV2:
             self.total_inferences += 1
             self.total_time_ms += inference_time
             
-            logger.debug(f"Depth Anything V2 inference: {inference_time:.2f}ms")
+            logger.debug(f"Depth Anything V2 inference ({tier}): {inference_time:.2f}ms")
             
             return depth_normalized.astype(np.float32)
             
@@ -162,6 +265,21 @@ class DepthServiceV2:
             logger.error(f"Depth estimation failed: {e}", exc_info=True)
             raise
     
+    def estimate_metric(self, image: np.ndarray, tier: Optional[str] = None) -> Optional[np.ndarray]:
+        """
+        Depth map in meters, like DepthService.estimate (near = min_depth, far = max_depth).
+        
+        Returns:
+            Metric depth map (float32, image size), or None if estimation failed
+        """
+        try:
+            disparity = self.estimate(image, tier=tier)
+        except Exception:
+            return None
+        
+        min_depth, max_depth = self.settings.min_depth, self.settings.max_depth
+        return (max_depth - disparity * (max_depth - min_depth)).astype(np.float32)
+    
     def get_stats(self) -> dict:
         """Get performance statistics"""
         if self.total_inferences == 0:
@@ -0,0 +1,280 @@
+"""
+Detection Scheduler
+===================
+
+Per-session keyframe scheduling for object detection.
+
+YOLO runs on keyframes only: every N frames, or earlier when the scene changes
+abruptly. In between, the previous boxes are propagated with sparse optical flow
+(median flow over a grid of points per box, forward-backward checked) and
+distances are re-sampled from the fresh depth map. N adapts to motion: fast
+motion shortens the interval, a static scene stretches it.
+"""
+
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from core.config import get_settings
+from services.object_detection_service import ObjectDetectionService, get_object_detection_service
+
+logger = logging.getLogger(__name__)
+
+# Optical flow runs on a downscaled frame of this width
+FLOW_WIDTH = 320
+
+# Scene-change thumbnail size
+THUMB_SIZE = (64, 48)
+
+LK_PARAMS = dict(
+    winSize=(15, 15),
+    maxLevel=2,
+    criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+)
+
+
+@dataclass
+class SessionState:
+    """Scheduling state of one client session."""
+
+    gray: np.ndarray           # Previous frame, FLOW_WIDTH wide
+    thumb: np.ndarray          # Previous scene-change thumbnail
+    boxes: np.ndarray          # Current raw boxes (N, 6) in image coordinates
+    sources: List[str]         # 'detected' / 'predicted' per box
+    interval: int
+    frames_since_keyframe: int = 0
+    force_keyframe: bool = False
+    last_seen: float = 0.0
+
+
+class DetectionScheduler:
+    """
+    Detect-every-N-frames scheduling with optical-flow box propagation.
+    """
+
+    def __init__(self, detection_service: ObjectDetectionService):
+        """Initialize scheduler around a detection service."""
+        self.detection_service = detection_service
+        self.settings = get_settings()
+        self.config = self.settings.detection_schedule
+        self.sessions: Dict[str, SessionState] = {}
+
+    def process(
+        self,
+        session_id: Optional[str],
+        image: np.ndarray,
+        depth_map: Optional[np.ndarray] = None,
+        confidence_threshold: float = 0.5,
+        max_objects: int = 10,
+        tier: Optional[str] = None
+    ) -> Tuple[List[Dict], Dict]:
+        """
+        Detections for one frame of a session.
+
+        Without a session (or with scheduling disabled) every frame is a keyframe.
+
+        Returns:
+            (detections, info) - detections as ObjectDetectionService.detect returns them,
+            plus 'source' ('detected' / 'predicted'); info describes the scheduling decision
+        """
+        now = time.time()
+        self._expire_sessions(now)
+
+        if session_id is None or not self.config.get('enabled', False):
+            detections = self.detection_service.detect(
+                image, confidence_threshold, max_objects, depth_map, tier=tier
+            )
+            for detection in detections:
+                detection['source'] = 'detected'
+            return detections, {'keyframe': True, 'interval': 1}
+
+        gray = self._flow_frame(image)
+        thumb = cv2.resize(gray, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+
+        state = self.sessions.get(session_id)
+        scene_change = 0.0
+        motion = 0.0
+
+        if state is not None:
+            scene_change = float(cv2.absdiff(thumb, state.thumb).mean())
+
+        keyframe = (
+            state is None
+            or state.force_keyframe
+            or state.frames_since_keyframe + 1 >= state.interval
+            or scene_change > self.config.get('scene_change_threshold', 12.0)
+        )
+
+        if keyframe:
+            try:
+                boxes = self.detection_service.detect_boxes(image, confidence_threshold, tier)
+            except Exception as e:
+                logger.error(f"Object detection failed: {e}")
+                boxes = np.zeros((0, 6), dtype=np.float32)
+
+            if state is None:
+                state = SessionState(
+                    gray=gray,
+                    thumb=thumb,
+                    boxes=boxes,
+                    sources=[],
+                    interval=self.config.get('keyframe_interval', 3)
+                )
+                self.sessions[session_id] = state
+            elif scene_change > self.config.get('scene_change_threshold', 12.0):
+                state.interval = self.config.get('min_interval', 1)
+            else:
+                # Adapt on keyframes too (measured by propagating the previous boxes),
+                # otherwise an interval of 1 makes every frame a keyframe and never grows back
+                _, motion, _ = self._propagate(state.gray, gray, state.boxes, image.shape[:2])
+                self._adapt_interval(state, motion)
+
+            state.boxes = boxes
+            state.sources = ['detected'] * len(boxes)
+            state.frames_since_keyframe = 0
+            state.force_keyframe = False
+        else:
+            tracked = len(state.boxes)
+            state.boxes, motion, failed = self._propagate(state.gray, gray, state.boxes, image.shape[:2])
+            state.sources = ['predicted'] * len(state.boxes)
+            state.frames_since_keyframe += 1
+            # Lost most boxes: re-detect on the next frame
+            state.force_keyframe = 2 * failed > tracked
+            self._adapt_interval(state, motion)
+
+        state.gray = gray
+        state.thumb = thumb
+        state.last_seen = now
+
+        detections = []
+        if len(state.boxes) > 0:
+            detections = self.detection_service.parse_boxes(
+                state.boxes,
+                image.shape[:2],
+                max_objects,
+                depth_map,
+                extras=[{'source': source} for source in state.sources]
+            )
+
+        info = {
+            'keyframe': keyframe,
+            'interval': state.interval,
+            'scene_change': round(scene_change, 2),
+            'motion': round(motion, 2)
+        }
+        return detections, info
+
+    def _flow_frame(self, image: np.ndarray) -> np.ndarray:
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        height, width = gray.shape[:2]
+        if width <= FLOW_WIDTH:
+            return gray
+        return cv2.resize(gray, (FLOW_WIDTH, round(height * FLOW_WIDTH / width)), interpolation=cv2.INTER_AREA)
+
+    def _propagate(
+        self,
+        prev_gray: np.ndarray,
+        gray: np.ndarray,
+        boxes: np.ndarray,
+        image_shape: Tuple[int, int]
+    ) -> Tuple[np.ndarray, float, int]:
+        """
+        Move boxes with median flow. Returns (boxes, median motion in image px, failed count).
+        Boxes whose points cannot be tracked are dropped.
+        """
+        if len(boxes) == 0:
+            return boxes, 0.0, 0
+
+        scale = gray.shape[1] / image_shape[1]
+        grid = self.config.get('flow_grid', 5)
+
+        # grid x grid points on the inner 80% of every box, all boxes in one LK call
+        steps = np.linspace(0.1, 0.9, grid)
+        gx, gy = np.meshgrid(steps, steps)
+        xyxy = boxes[:, :4] * scale
+        size = xyxy[:, 2:] - xyxy[:, :2]
+        points = np.stack([
+            xyxy[:, None, 0] + gx.ravel()[None] * size[:, None, 0],
+            xyxy[:, None, 1] + gy.ravel()[None] * size[:, None, 1],
+        ], axis=-1).reshape(-1, 1, 2).astype(np.float32)
+
+        forward, status_fw, _ = cv2.calcOpticalFlowPyrLK(prev_gray, gray, points, None, **LK_PARAMS)
+        backward, status_bw, _ = cv2.calcOpticalFlowPyrLK(gray, prev_gray, forward, None, **LK_PARAMS)
+
+        fb_error = np.linalg.norm(points - backward, axis=2).ravel()
+        valid = (status_fw.ravel() == 1) & (status_bw.ravel() == 1) & (fb_error < 1.0)
+
+        points = points.reshape(len(boxes), -1, 2)
+        forward = forward.reshape(len(boxes), -1, 2)
+        valid = valid.reshape(len(boxes), -1)
+
+        min_points = max(3, grid * grid // 4)
+        kept, motions = [], []
+        for i in range(len(boxes)):
+            if valid[i].sum() < min_points:
+                continue
+
+            old, new = points[i][valid[i]], forward[i][valid[i]]
+            shift = np.median(new - old, axis=0)
+
+            # Scale change from the spread of the points around their median
+            old_spread = np.linalg.norm(old - np.median(old, axis=0), axis=1)
+            new_spread = np.linalg.norm(new - np.median(new, axis=0), axis=1)
+            ratios = new_spread[old_spread > 1e-3] / old_spread[old_spread > 1e-3]
+            box_scale = float(np.clip(np.median(ratios), 0.8, 1.25)) if len(ratios) else 1.0
+
+            center = (xyxy[i, :2] + xyxy[i, 2:]) / 2 + shift
+            half = size[i] / 2 * box_scale
+
+            box = boxes[i].copy()
+            box[:4] = np.concatenate([center - half, center + half]) / scale
+            kept.append(box)
+            motions.append(np.linalg.norm(shift) / scale)
+
+        height, width = image_shape
+        propagated = np.array(kept, dtype=boxes.dtype).reshape(-1, boxes.shape[1])
+        propagated[:, [0, 2]] = np.clip(propagated[:, [0, 2]], 0, width)
+        propagated[:, [1, 3]] = np.clip(propagated[:, [1, 3]], 0, height)
+
+        # Boxes that left the frame
+        on_screen = (propagated[:, 2] - propagated[:, 0] > 1) & (propagated[:, 3] - propagated[:, 1] > 1)
+        propagated = propagated[on_screen]
+
+        motion = float(np.median(motions)) if motions else 0.0
+        return propagated, motion, len(boxes) - len(kept)
+
+    def _adapt_interval(self, state: SessionState, motion: float):
+        """Shorter interval under fast motion, longer for a static scene."""
+        if motion > self.config.get('motion_high', 10.0):
+            state.interval = max(self.config.get('min_interval', 1), state.interval - 1)
+        elif motion < self.config.get('motion_low', 2.0):
+            state.interval = min(self.config.get('max_interval', 6), state.interval + 1)
+
+    def _expire_sessions(self, now: float):
+        ttl = self.config.get('session_ttl', 30.0)
+        expired = [sid for sid, state in self.sessions.items() if now - state.last_seen > ttl]
+        for sid in expired:
+            del self.sessions[sid]
+
+    def reset(self, session_id: Optional[str] = None):
+        """Drop one session's state, or all of them."""
+        if session_id is None:
+            self.sessions.clear()
+        else:
+            self.sessions.pop(session_id, None)
+
+
+# Singleton instance
+_detection_scheduler: Optional[DetectionScheduler] = None
+
+
+def get_detection_scheduler() -> DetectionScheduler:
+    """Get or create the detection scheduler singleton."""
+    global _detection_scheduler
+    if _detection_scheduler is None:
+        _detection_scheduler = DetectionScheduler(get_object_detection_service())
+    return _detection_scheduler
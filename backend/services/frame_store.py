@@ -0,0 +1,123 @@
+"""
+Frame Store
+===========
+
+Short-lived store of analyzed depth maps for deferred visualization.
+
+Instead of rendering and base64-encoding the depth visualization into every
+response, /api/analyze can return a frame id; the depth map is kept here
+(quantized to uint8 against the fixed depth range, a quarter of the float32
+size) and rendered only when /api/frames/{id}/depth.jpg is fetched. Rendered
+JPEGs are cached per colormap. Frames expire after ttl_s and the store never
+holds more than max_frames.
+"""
+
+import logging
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional
+
+import numpy as np
+
+from core.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredFrame:
+    """Quantized depth map and overlay data of one analyzed frame."""
+
+    depth: np.ndarray            # uint8, see ImageService.quantize_depth
+    alert_level: str
+    distance_stats: Dict
+    created: float
+    rendered: Dict[str, bytes] = field(default_factory=dict)  # colormap -> JPEG
+
+
+class FrameStore:
+    """
+    Bounded TTL store of analyzed frames with lazily rendered, cached JPEGs.
+    """
+
+    def __init__(self, ttl_s: float = 10.0, max_frames: int = 32):
+        """
+        Args:
+            ttl_s: Seconds a frame stays retrievable
+            max_frames: Oldest frames are evicted beyond this count
+        """
+        self.ttl_s = ttl_s
+        self.max_frames = max_frames
+        self._frames: "OrderedDict[str, StoredFrame]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, depth: np.ndarray, alert_level: str, distance_stats: Dict) -> str:
+        """Store a frame and return its id."""
+        frame_id = secrets.token_urlsafe(9)
+        now = time.time()
+        with self._lock:
+            self._evict(now)
+            self._frames[frame_id] = StoredFrame(depth, alert_level, dict(distance_stats), now)
+            while len(self._frames) > self.max_frames:
+                self._frames.popitem(last=False)
+        return frame_id
+
+    def get(self, frame_id: str) -> Optional[StoredFrame]:
+        """Frame by id, or None if unknown or expired."""
+        with self._lock:
+            self._evict(time.time())
+            return self._frames.get(frame_id)
+
+    def render(
+        self,
+        frame_id: str,
+        colormap: str,
+        renderer: Callable[[StoredFrame, str], Optional[bytes]]
+    ) -> Optional[bytes]:
+        """
+        JPEG of a frame in a colormap, rendered by renderer on first request and cached.
+
+        Returns:
+            JPEG bytes, or None if the frame is unknown / expired or rendering failed
+        """
+        frame = self.get(frame_id)
+        if frame is None:
+            return None
+
+        jpeg = frame.rendered.get(colormap)
+        if jpeg is None:
+            # Rendering runs outside the lock; a concurrent duplicate render is harmless
+            jpeg = renderer(frame, colormap)
+            if jpeg is not None:
+                frame.rendered[colormap] = jpeg
+        return jpeg
+
+    def _evict(self, now: float):
+        """Drop expired frames (oldest first, so stop at the first live one)."""
+        while self._frames:
+            frame_id, frame = next(iter(self._frames.items()))
+            if now - frame.created <= self.ttl_s:
+                break
+            del self._frames[frame_id]
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+
+# Singleton instance
+_frame_store: Optional[FrameStore] = None
+
+
+def get_frame_store() -> FrameStore:
+    """Get or create the frame store singleton."""
+    global _frame_store
+    if _frame_store is None:
+        config = get_settings().frame_store
+        _frame_store = FrameStore(
+            ttl_s=config.get('ttl_s', 10.0),
+            max_frames=config.get('max_frames', 32)
+        )
+    return _frame_store
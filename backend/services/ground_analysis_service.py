@@ -7,11 +7,16 @@ Uses depth map segmentation to detect dangerous floor conditions.
 """
 
 import logging
+import threading
+import time
 import numpy as np
 from typing import Dict, List, Optional, Tuple
 from scipy import ndimage
 import cv2
 
+from core.config import get_settings
+from services.ground_plane import backproject, fit_ground_plane, focal_from_fov, sample_grid
+
 logger = logging.getLogger(__name__)
 
 
@@ -32,13 +37,27 @@ class GroundAnalysisService:
         ground_height_ratio: float = 0.7,  # Bottom 70% of image is ground
         depth_change_threshold: float = 0.35,  # 35% depth change indicates step (daha az hassas)
         hole_depth_threshold: float = 0.5,  # 50% deeper = potential hole (daha az hassas)
-        min_feature_size: int = 300  # Minimum pixels for a feature (daha büyük)
+        min_feature_size: int = 300,  # Minimum pixels for a feature (daha büyük)
+        budget_ms: Optional[float] = None,  # Latency budget for within_budget()
+        probe_interval: int = 30,  # Skipped frames between re-measurements when over budget
+        plane_config: Optional[Dict] = None  # Ground plane fit on metric depth (see Settings.ground_analysis)
     ):
         """Initialize ground analysis service."""
         self.ground_height_ratio = ground_height_ratio
         self.depth_change_threshold = depth_change_threshold
         self.hole_depth_threshold = hole_depth_threshold
         self.min_feature_size = min_feature_size
+        self.budget_ms = budget_ms
+        self.probe_interval = probe_interval
+        self.plane_config = plane_config or {}
+        self._plane_rng = np.random.default_rng(0)
+        self._sample_cache: Dict[Tuple[int, int, int], Tuple[np.ndarray, np.ndarray]] = {}
+        
+        # Smoothed cost of analyze() and frames skipped since the last run; shared by
+        # the inline path and the ground lane workers, so guarded by _budget_lock
+        self.avg_time_ms: Optional[float] = None
+        self.skipped = 0
+        self._budget_lock = threading.Lock()
         
         logger.info(
             f"GroundAnalysisService initialized: "
@@ -46,6 +65,35 @@ class GroundAnalysisService:
             f"depth_threshold={depth_change_threshold}"
         )
     
+    def within_budget(self) -> bool:
+        """
+        Whether the next frame should be analyzed.
+        
+        True while the smoothed cost of analyze() fits budget_ms; when over budget,
+        frames are skipped and one of every probe_interval is analyzed to re-measure.
+        """
+        with self._budget_lock:
+            if self.budget_ms is None or self.avg_time_ms is None or self.avg_time_ms <= self.budget_ms:
+                return True
+            
+            self.skipped += 1
+            if self.skipped >= self.probe_interval:
+                self.skipped = 0
+                return True
+            return False
+    
+    def _record_time(self, elapsed_ms: float):
+        """
+        Update the smoothed cost. While over budget every run is a probe, and its
+        measurement replaces the average, so one slow frame does not keep the
+        analysis off for many probe intervals.
+        """
+        with self._budget_lock:
+            if self.avg_time_ms is None or (self.budget_ms is not None and self.avg_time_ms > self.budget_ms):
+                self.avg_time_ms = elapsed_ms
+            else:
+                self.avg_time_ms = 0.8 * self.avg_time_ms + 0.2 * elapsed_ms
+    
     def _extract_ground_region(self, depth_map: np.ndarray) -> Tuple[np.ndarray, int]:
         """Extract ground/floor region from depth map."""
         height, width = depth_map.shape
@@ -68,70 +116,81 @@ class GroundAnalysisService:
     def _find_depth_discontinuities(
         self,
         ground_region: np.ndarray,
-        start_row: int
+        start_row: int,
+        ground_std: Optional[float] = None
     ) -> List[Dict]:
-        """Find significant depth changes (steps, holes, curbs)."""
-        features = []
+        """
+        Find significant depth changes (steps, holes, curbs).
+        
+        One vertical difference over the whole region against one global threshold;
+        a row is a feature when enough of its columns change.
+        """
         height, width = ground_region.shape
+        if height < 2:
+            return []
         
-        # Scan horizontally for depth changes
-        for row in range(1, height):
-            row_diff = np.abs(ground_region[row] - ground_region[row - 1])
-            
-            # Find positions with significant depth change
-            threshold = self.depth_change_threshold * np.std(ground_region)
-            discontinuities = np.where(row_diff > threshold)[0]
+        if ground_std is None:
+            ground_std = np.std(ground_region)
+        threshold = self.depth_change_threshold * ground_std
+        
+        # Change between every row and the one above it
+        jumps = np.abs(np.diff(ground_region, axis=0)) > threshold
+        counts = np.count_nonzero(jumps, axis=1)
+        rows = np.flatnonzero(counts > self.min_feature_size / width)
+        if len(rows) == 0:
+            return []
+        
+        # Mean depth before/after the jump, over the jumping columns only
+        mask = jumps[rows]
+        row_counts = counts[rows]
+        before = np.where(mask, ground_region[rows], 0).sum(axis=1, dtype=np.float64) / row_counts
+        after = np.where(mask, ground_region[rows + 1], 0).sum(axis=1, dtype=np.float64) / row_counts
+        depth_change = after - before
+        
+        # Depth increases = moving away = step down or hole; decreases = step up or curb
+        first_column = mask.argmax(axis=1)
+        last_column = width - 1 - mask[:, ::-1].argmax(axis=1)
+        
+        features = []
+        for i, row in enumerate(rows.tolist()):
+            change = float(depth_change[i])
+            if change > 0 and abs(change) > self.hole_depth_threshold:
+                feature_type, severity = 'hole', 'critical'
+            elif change > 0:
+                feature_type, severity = 'step_down', 'high'
+            else:
+                feature_type, severity = 'step_up', 'high'
             
-            if len(discontinuities) > self.min_feature_size / width:
-                # Calculate feature properties
-                avg_depth_before = np.mean(ground_region[row - 1, discontinuities])
-                avg_depth_after = np.mean(ground_region[row, discontinuities])
-                depth_change = avg_depth_after - avg_depth_before
-                
-                # Classify feature
-                feature_type = 'unknown'
-                severity = 'medium'
-                
-                if depth_change > 0:
-                    # Depth increases = moving away = step down or hole
-                    if abs(depth_change) > self.hole_depth_threshold:
-                        feature_type = 'hole'
-                        severity = 'critical'
-                    else:
-                        feature_type = 'step_down'
-                        severity = 'high'
-                else:
-                    # Depth decreases = closer = step up or curb
-                    feature_type = 'step_up'
-                    severity = 'high'
-                
-                features.append({
-                    'type': feature_type,
-                    'severity': severity,
-                    'row': start_row + row,
-                    'columns': discontinuities.tolist(),
-                    'depth_change': float(depth_change),
-                    'width_percentage': len(discontinuities) / width
-                })
+            features.append({
+                'type': feature_type,
+                'severity': severity,
+                'row': start_row + row + 1,
+                'column_range': [int(first_column[i]), int(last_column[i])],
+                'depth_change': change,
+                'width_percentage': float(row_counts[i] / width)
+            })
         
         return features
     
     def _detect_stairs(self, ground_region: np.ndarray, features: List[Dict]) -> Optional[Dict]:
-        """Detect stairs pattern from multiple step features."""
-        # Look for multiple parallel step features
-        step_features = [f for f in features if f['type'] in ['step_up', 'step_down']]
+        """
+        Detect stairs pattern from multiple step features.
         
-        if len(step_features) < 2:
+        Adjacent step rows belong to the same edge; edges are the runs of consecutive
+        step rows and the stair spacing is the distance between run centres.
+        """
+        rows = np.array(sorted(f['row'] for f in features if f['type'] in ['step_up', 'step_down']))
+        if len(rows) < 2:
             return None
         
-        # Check if steps are evenly spaced (typical stair pattern)
-        rows = [f['row'] for f in step_features]
-        rows.sort()
-        
-        # Calculate spacing between steps
-        spacings = [rows[i+1] - rows[i] for i in range(len(rows)-1)]
+        # Run-length encode consecutive rows into edges
+        breaks = np.flatnonzero(np.diff(rows) > 1) + 1
+        run_starts = rows[np.concatenate([[0], breaks])]
+        run_ends = rows[np.concatenate([breaks - 1, [len(rows) - 1]])]
+        centers = (run_starts + run_ends) / 2
         
         # Stairs have relatively consistent spacing
+        spacings = np.diff(centers)
         if len(spacings) > 1:
             avg_spacing = np.mean(spacings)
             spacing_variance = np.var(spacings)
@@ -140,16 +199,68 @@ class GroundAnalysisService:
             if spacing_variance < avg_spacing * 0.2:  # 20% variance threshold (daha strict)
                 confidence = 1.0 - (spacing_variance / (avg_spacing + 0.001))
                 # En az 3 basamak ve yüksek güven gerekli
-                if len(step_features) >= 3 and confidence > 0.8:
+                if len(centers) >= 3 and confidence > 0.8:
                     return {
                         'detected': True,
-                        'num_steps': len(step_features),
+                        'num_steps': len(centers),
                         'avg_spacing': float(avg_spacing),
-                        'confidence': confidence
+                        'confidence': float(confidence)
                     }
         
         return None
     
+    def _fit_ground_plane(self, depth_map: np.ndarray, start_row: int) -> Optional[Dict]:
+        """
+        Ground plane of a metric depth map (services/ground_plane.py) and what sticks out of it.
+        
+        Returns:
+            Plane summary (camera height, pitch, slope relative to the configured camera pitch,
+            residual roughness, drop-off / curb ratios and nearest distances), or None if no
+            ground-like plane was found
+        """
+        config = self.plane_config
+        height, width = depth_map.shape
+        
+        key = (height, width, start_row)
+        if key not in self._sample_cache:
+            self._sample_cache[key] = sample_grid((height, width), start_row, config.get('plane_points', 3000))
+        rows, cols = self._sample_cache[key]
+        
+        focal = focal_from_fov(width, config.get('camera_hfov_deg', 65.0))
+        points = backproject(depth_map, rows, cols, focal, focal, width / 2, height / 2)
+        
+        expected_pitch = config.get('camera_pitch_deg', 30.0)
+        fit = fit_ground_plane(
+            points,
+            iterations=config.get('ransac_iterations', 64),
+            inlier_threshold=config.get('inlier_threshold', 0.05),
+            expected_pitch_deg=expected_pitch,
+            rng=self._plane_rng
+        )
+        if fit is None:
+            return None
+        
+        distance = fit.points[:, 2]
+        scale = np.maximum(distance, 1.0)
+        residuals = fit.residuals
+        
+        # Below the plane: drop-off / hole; a little above it: curb (taller is an obstacle)
+        dropoff = residuals < -config.get('dropoff_threshold', 0.10) * scale
+        curb = (residuals > config.get('curb_threshold', 0.05) * scale) & (residuals < 0.3 * scale)
+        
+        return {
+            'normal': fit.normal.tolist(),
+            'camera_height': fit.offset,
+            'pitch_deg': fit.pitch_deg,
+            'slope_deg': fit.pitch_deg - expected_pitch,
+            'inlier_ratio': float(fit.inliers.mean()),
+            'roughness': float(residuals[fit.inliers].std()),
+            'dropoff_ratio': float(dropoff.mean()),
+            'nearest_dropoff': float(distance[dropoff].min()) if dropoff.any() else None,
+            'curb_ratio': float(curb.mean()),
+            'nearest_curb': float(distance[curb].min()) if curb.any() else None
+        }
+    
     def _calculate_slope(self, ground_region: np.ndarray) -> float:
         """Calculate average ground slope."""
         height, width = ground_region.shape
@@ -163,11 +274,11 @@ class GroundAnalysisService:
         
         return float(slope)
     
-    def _assess_surface_smoothness(self, ground_region: np.ndarray) -> Dict:
+    def _assess_surface_smoothness(self, ground_region: np.ndarray, std_dev: Optional[float] = None) -> Dict:
         """Assess how smooth/rough the ground surface is."""
-        # Calculate local variance
-        variance = np.var(ground_region)
-        std_dev = np.std(ground_region)
+        if std_dev is None:
+            std_dev = np.std(ground_region)
+        variance = std_dev ** 2
         
         # Classify smoothness
         if std_dev < 0.05:
@@ -190,12 +301,31 @@ class GroundAnalysisService:
             'warning_level': warning_level
         }
     
-    def analyze(self, depth_map: np.ndarray) -> Dict:
+    def _assess_plane_roughness(self, roughness: float) -> Dict:
+        """Smoothness from the spread (meters) of the ground points around the fitted plane."""
+        if roughness < 0.02:
+            smoothness, warning_level = 'very_smooth', 'none'
+        elif roughness < 0.04:
+            smoothness, warning_level = 'smooth', 'low'
+        elif roughness < 0.08:
+            smoothness, warning_level = 'moderate', 'medium'
+        else:
+            smoothness, warning_level = 'rough', 'high'
+        
+        return {
+            'smoothness': smoothness,
+            'variance': roughness ** 2,
+            'std_dev': roughness,
+            'warning_level': warning_level
+        }
+    
+    def analyze(self, depth_map: np.ndarray, depth_range: Optional[Tuple[float, float]] = None) -> Dict:
         """
         Analyze ground surface for obstacles and hazards.
         
         Args:
             depth_map: Normalized depth map (0-1, closer = lower values)
+            depth_range: (min, max) of a metric depth map, which is then normalized to 0-1
         
         Returns:
             Dictionary with ground analysis results:
@@ -206,11 +336,23 @@ class GroundAnalysisService:
             - warnings: List of ground-related warnings
         """
         try:
+            start_time = time.perf_counter()
+            
             # Extract ground region
             ground_region, start_row = self._extract_ground_region(depth_map)
             
+            # Ground plane on the metric depth
+            plane = None
+            if depth_range is not None and self.plane_config.get('plane_fit', False):
+                plane = self._fit_ground_plane(depth_map, start_row)
+            
+            if depth_range is not None:
+                low, high = depth_range
+                ground_region = np.clip((ground_region - low) / (high - low), 0.0, 1.0, dtype=np.float32)
+            ground_std = float(np.std(ground_region))
+            
             # Find depth discontinuities
-            features = self._find_depth_discontinuities(ground_region, start_row)
+            features = self._find_depth_discontinuities(ground_region, start_row, ground_std)
             
             # Detect stairs
             stairs_info = self._detect_stairs(ground_region, features)
@@ -218,8 +360,11 @@ class GroundAnalysisService:
             # Calculate slope
             slope = self._calculate_slope(ground_region)
             
-            # Assess surface smoothness
-            smoothness_info = self._assess_surface_smoothness(ground_region)
+            # Assess surface smoothness (plane residuals when a plane was fitted)
+            if plane is not None:
+                smoothness_info = self._assess_plane_roughness(plane['roughness'])
+            else:
+                smoothness_info = self._assess_surface_smoothness(ground_region, ground_std)
             
             # Generate warnings
             warnings = []
@@ -261,8 +406,38 @@ class GroundAnalysisService:
                         'message_en': "Caution! Step down ahead. Proceed slowly."
                     })
             
-            # Slope warning
-            if abs(slope) > 0.1:
+            # Drop-off / curb from the plane residuals
+            if plane is not None:
+                dropoff_area = self.plane_config.get('dropoff_area', 0.03)
+                if plane['dropoff_ratio'] > dropoff_area and not critical_features:
+                    warnings.append({
+                        'type': 'drop_off',
+                        'severity': 'critical',
+                        'distance': plane['nearest_dropoff'],
+                        'message_tr': f"DİKKAT! {plane['nearest_dropoff']:.1f} metre ileride zemin alçalıyor! Durun!",
+                        'message_en': f"WARNING! Drop-off {plane['nearest_dropoff']:.1f} meters ahead! Stop!"
+                    })
+                if plane['curb_ratio'] > dropoff_area and not high_features:
+                    warnings.append({
+                        'type': 'curb',
+                        'severity': 'high',
+                        'distance': plane['nearest_curb'],
+                        'message_tr': f"{plane['nearest_curb']:.1f} metre ileride basamak veya kaldırım var.",
+                        'message_en': f"Step or curb {plane['nearest_curb']:.1f} meters ahead."
+                    })
+            
+            # Slope warning (plane slope in degrees when available)
+            if plane is not None:
+                if abs(plane['slope_deg']) > self.plane_config.get('slope_warning_deg', 8.0):
+                    direction = "yukarı" if plane['slope_deg'] > 0 else "aşağı"
+                    direction_en = "uphill" if plane['slope_deg'] > 0 else "downhill"
+                    warnings.append({
+                        'type': 'slope',
+                        'severity': 'medium',
+                        'message_tr': f"Yol {direction} doğru eğimli. Dikkatli ilerleyin.",
+                        'message_en': f"Ground is sloped {direction_en}. Walk carefully."
+                    })
+            elif abs(slope) > 0.1:
                 direction = "yukarı" if slope > 0 else "aşağı"
                 direction_en = "uphill" if slope > 0 else "downhill"
                 warnings.append({
@@ -281,6 +456,9 @@ class GroundAnalysisService:
                     'message_en': "Uneven surface. Walk slowly and carefully."
                 })
             
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            self._record_time(elapsed_ms)
+            
             result = {
                 'features': features,
                 'stairs_detected': stairs_info is not None,
@@ -288,7 +466,9 @@ class GroundAnalysisService:
                 'slope': slope,
                 'smoothness': smoothness_info,
                 'warnings': warnings,
-                'ground_hazard_count': len(features)
+                'ground_plane': plane,
+                'ground_hazard_count': len(features),
+                'processing_time_ms': elapsed_ms
             }
             
             logger.debug(
@@ -320,5 +500,10 @@ def get_ground_analysis_service() -> GroundAnalysisService:
     """Get or create the ground analysis service singleton."""
     global _ground_service
     if _ground_service is None:
-        _ground_service = GroundAnalysisService()
+        config = get_settings().ground_analysis
+        _ground_service = GroundAnalysisService(
+            budget_ms=config.get('budget_ms'),
+            probe_interval=config.get('probe_interval', 30),
+            plane_config=config
+        )
     return _ground_service
@@ -0,0 +1,208 @@
+"""
+Ground Analysis Lane
+====================
+
+Per-session background lane for GroundAnalysisService.
+
+Stairs, holes and slopes change slowly compared to the frame rate, so within a
+session ground analysis runs off the request path: every N-th depth map (or
+the first one after interval_s) is handed to a small worker pool, and every
+response merges the latest finished result together with its age. A result
+with a critical warning (hole, drop-off, stairs going down) is merged into the
+very next response whatever its age, and keeps the lane analyzing every frame
+until it clears.
+
+Without a session, or with the lane disabled, analysis runs inline within its
+latency budget.
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from core.config import get_settings
+from services.ground_analysis_service import GroundAnalysisService, get_ground_analysis_service
+
+logger = logging.getLogger(__name__)
+
+
+def empty_ground_result() -> Dict:
+    """Ground analysis result for frames without one."""
+    return {
+        'features': [],
+        'stairs_detected': False,
+        'stairs_info': None,
+        'slope': 0.0,
+        'smoothness': {'smoothness': 'unknown', 'warning_level': 'none'},
+        'warnings': [],
+        'ground_hazard_count': 0
+    }
+
+
+def _has_critical(result: Dict) -> bool:
+    return any(warning.get('severity') == 'critical' for warning in result.get('warnings', []))
+
+
+@dataclass
+class LaneState:
+    """Background analysis state of one client session."""
+
+    frames_since_submit: int = 0
+    last_submit: float = 0.0
+    pending: Optional[Future] = None
+    result: Optional[Dict] = None
+    result_time: float = 0.0       # Arrival time of the depth map the result belongs to
+    critical: bool = False         # Latest result has a critical warning
+    unseen_critical: bool = False  # ... that no response has carried yet
+    last_seen: float = 0.0
+
+
+class GroundAnalysisLane:
+    """
+    Runs ground analysis every N frames per session in a worker pool and caches the result.
+    """
+
+    def __init__(self, ground_service: GroundAnalysisService, config: Optional[Dict] = None):
+        """Initialize lane around a ground analysis service."""
+        self.ground_service = ground_service
+        self.config = config if config is not None else get_settings().ground_analysis
+        self.sessions: Dict[str, LaneState] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def process(
+        self,
+        session_id: Optional[str],
+        depth_map: np.ndarray,
+        depth_range: Optional[Tuple[float, float]] = None
+    ) -> Tuple[Dict, Dict]:
+        """
+        Ground analysis for one depth map of a session.
+
+        Returns:
+            (result, info) - result as GroundAnalysisService.analyze returns it (empty when
+            there is none yet); info has 'mode' ('off' / 'inline' / 'async'), 'ran' (analysis
+            ran or was queued for this frame), 'age_ms' of the result (None without one)
+            and 'promoted' (a critical result delivered as soon as it finished)
+        """
+        if not self.config.get('enabled', False):
+            return empty_ground_result(), {'mode': 'off', 'ran': False, 'age_ms': None, 'promoted': False}
+
+        if session_id is None or not self.config.get('async_lane', False):
+            ran = self.ground_service.within_budget()
+            result = self.ground_service.analyze(depth_map, depth_range) if ran else empty_ground_result()
+            return result, {'mode': 'inline', 'ran': ran, 'age_ms': 0.0 if ran else None, 'promoted': False}
+
+        now = time.time()
+        with self._lock:
+            self._expire_sessions(now)
+            state = self.sessions.get(session_id)
+            if state is None:
+                state = LaneState()
+                self.sessions[session_id] = state
+            state.last_seen = now
+            state.frames_since_submit += 1
+
+            due = (
+                state.result is None
+                or state.critical
+                or state.frames_since_submit >= self.config.get('lane_every_n', 5)
+                or now - state.last_submit >= self.config.get('lane_interval_s', 0.5)
+            )
+            submitted = state.pending is None and due
+            if submitted:
+                state.frames_since_submit = 0
+                state.last_submit = now
+                state.pending = self._pool().submit(
+                    self._run, state, depth_map.copy(), depth_range, now
+                )
+
+            result, result_time = state.result, state.result_time
+            promoted = state.unseen_critical
+            state.unseen_critical = False
+
+        info = {'mode': 'async', 'ran': submitted, 'age_ms': None, 'promoted': promoted}
+        if result is None:
+            return empty_ground_result(), info
+
+        age = now - result_time
+        if age > self.config.get('lane_max_age_s', 2.0) and not promoted:
+            return empty_ground_result(), info
+
+        info['age_ms'] = round(age * 1000, 1)
+        return result, info
+
+    def _run(
+        self,
+        state: LaneState,
+        depth_map: np.ndarray,
+        depth_range: Optional[Tuple[float, float]],
+        submitted_at: float
+    ):
+        """Worker: analyze one depth map and publish the result to its session."""
+        try:
+            result = self.ground_service.analyze(depth_map, depth_range)
+        except Exception as e:
+            logger.error(f"Background ground analysis failed: {e}")
+            result = None
+
+        with self._lock:
+            if result is not None:
+                critical = _has_critical(result)
+                state.result = result
+                state.result_time = submitted_at
+                state.unseen_critical = critical and not state.critical
+                state.critical = critical
+            state.pending = None
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.config.get('lane_workers', 1),
+                thread_name_prefix='ground-lane'
+            )
+        return self._executor
+
+    def _expire_sessions(self, now: float):
+        ttl = self.config.get('session_ttl', 30.0)
+        expired = [sid for sid, state in self.sessions.items() if now - state.last_seen > ttl]
+        for sid in expired:
+            del self.sessions[sid]
+
+    def flush(self):
+        """Wait for all queued analyses to finish."""
+        with self._lock:
+            pending = [state.pending for state in self.sessions.values() if state.pending is not None]
+        for future in pending:
+            future.result()
+
+    def reset(self, session_id: Optional[str] = None):
+        """Drop one session's state, or all of them."""
+        with self._lock:
+            if session_id is None:
+                self.sessions.clear()
+            else:
+                self.sessions.pop(session_id, None)
+
+    def shutdown(self):
+        """Stop the worker pool, dropping queued analyses."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+# Singleton instance
+_ground_lane: Optional[GroundAnalysisLane] = None
+
+
+def get_ground_analysis_lane() -> GroundAnalysisLane:
+    """Get or create the ground analysis lane singleton."""
+    global _ground_lane
+    if _ground_lane is None:
+        _ground_lane = GroundAnalysisLane(get_ground_analysis_service())
+    return _ground_lane
@@ -0,0 +1,138 @@
+"""
+Ground Plane Fitting
+====================
+
+Fits the ground plane to a strided subset of the ground region of a metric
+depth map, back-projected with a pinhole camera (as in
+Depth-Anything-V2/metric_depth/depth_to_pointcloud.py):
+
+    x = (u - cx) / fx * z,  y = (v - cy) / fy * z
+
+Camera frame: x right, y down, z forward. The plane is n . p + d = 0 with the
+unit normal n pointing up (n_y < 0), so d is the camera height above the
+ground and residuals n . p + d are positive above the plane (curbs, obstacles)
+and negative below it (drop-offs, holes).
+
+RANSAC hypotheses are evaluated all at once as a (points x hypotheses)
+residual matrix, then the best consensus set is refined with least squares.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class PlaneFit:
+    """Fitted ground plane and the residuals of every valid sampled point."""
+
+    points: np.ndarray     # (N, 3) valid sampled points (finite, in front of the camera)
+    normal: np.ndarray     # (3,) unit normal, pointing up (n_y < 0)
+    offset: float          # d in n . p + d = 0 (camera height, meters)
+    residuals: np.ndarray  # (N,) signed distance of every sample to the plane
+    inliers: np.ndarray    # (N,) bool consensus set
+
+    @property
+    def pitch_deg(self) -> float:
+        """Angle between the ground and the optical axis (camera pitch on level ground)."""
+        return math.degrees(math.atan2(-self.normal[2], -self.normal[1]))
+
+
+def focal_from_fov(width: int, hfov_deg: float) -> float:
+    """Focal length in pixels for a horizontal field of view."""
+    return (width / 2) / math.tan(math.radians(hfov_deg) / 2)
+
+
+def sample_grid(shape: Tuple[int, int], row_start: int, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Strided (rows, cols) over rows >= row_start with at most ~max_points samples."""
+    height, width = shape
+    stride = max(1, math.ceil(math.sqrt((height - row_start) * width / max_points)))
+    rows = np.arange(row_start + stride // 2, height, stride)
+    cols = np.arange(stride // 2, width, stride)
+    return rows, cols
+
+
+def backproject(
+    depth: np.ndarray,
+    rows: np.ndarray,
+    cols: np.ndarray,
+    fx: float,
+    fy: float,
+    cx: float,
+    cy: float
+) -> np.ndarray:
+    """(len(rows) * len(cols), 3) camera-frame points of the sampled pixels."""
+    z = depth[np.ix_(rows, cols)].astype(np.float64)
+    x = ((cols - cx) / fx)[None, :] * z
+    y = ((rows - cy) / fy)[:, None] * z
+    return np.stack([x, y, z], axis=-1).reshape(-1, 3)
+
+
+def fit_ground_plane(
+    points: np.ndarray,
+    iterations: int = 64,
+    inlier_threshold: float = 0.05,
+    max_tilt_deg: float = 60.0,
+    expected_pitch_deg: float = 30.0,
+    rng: Optional[np.random.Generator] = None
+) -> Optional[PlaneFit]:
+    """
+    RANSAC + least squares ground plane.
+
+    Args:
+        points: (N, 3) camera-frame points
+        iterations: Number of 3-point hypotheses (evaluated in one batch)
+        inlier_threshold: Inlier distance at 1 m; grows linearly with depth
+        max_tilt_deg: Hypotheses further than this from the expected ground normal are rejected
+        expected_pitch_deg: Camera pitch (downwards) that defines the expected ground normal
+        rng: Random generator for the hypotheses
+
+    Returns:
+        PlaneFit, or None when no ground-like plane is supported by the points
+    """
+    points = points[np.isfinite(points).all(axis=1) & (points[:, 2] > 0)]
+    if len(points) < 3:
+        return None
+
+    rng = rng or np.random.default_rng()
+    pitch = math.radians(expected_pitch_deg)
+    expected_up = np.array([0.0, -math.cos(pitch), -math.sin(pitch)])
+
+    # Hypotheses from random point triples
+    triples = points[rng.integers(0, len(points), (iterations, 3))]
+    normals = np.cross(triples[:, 1] - triples[:, 0], triples[:, 2] - triples[:, 0])
+    lengths = np.linalg.norm(normals, axis=1)
+    valid = lengths > 1e-9
+    normals = normals / np.where(valid, lengths, 1.0)[:, None]
+    normals *= np.where(normals[:, 1] > 0, -1.0, 1.0)[:, None]
+    valid &= normals @ expected_up >= math.cos(math.radians(max_tilt_deg))
+    if not valid.any():
+        return None
+
+    normals = normals[valid]
+    offsets = -np.einsum('kj,kj->k', normals, triples[valid, 0])
+
+    # Depth-dependent tolerance: monocular depth error grows with distance
+    tolerance = inlier_threshold * np.maximum(points[:, 2], 1.0)
+    support = (np.abs(points @ normals.T + offsets) < tolerance[:, None]).sum(axis=0)
+    best = int(support.argmax())
+    inliers = np.abs(points @ normals[best] + offsets[best]) < tolerance
+    if inliers.sum() < 3:
+        return None
+
+    # Least squares refinement on the consensus set
+    centroid = points[inliers].mean(axis=0)
+    _, _, vt = np.linalg.svd(points[inliers] - centroid, full_matrices=False)
+    normal = vt[-1] if vt[-1][1] < 0 else -vt[-1]
+    offset = float(-normal @ centroid)
+
+    residuals = points @ normal + offset
+    return PlaneFit(
+        points=points,
+        normal=normal,
+        offset=offset,
+        residuals=residuals,
+        inliers=np.abs(residuals) < tolerance
+    )
@@ -4,11 +4,24 @@ Image Processing Service
 
 Handles image encoding/decoding and colormap visualization.
 Adapted from src/visualizer.py for API usage.
+
+JPEG uploads are decoded close to the target size with libjpeg DCT scaling
+(IMREAD_REDUCED_COLOR_2/4/8, picked from the frame header), so a 12 MP phone
+frame is never decoded at full resolution just to be resized to 640x480.
+
+Clients can also skip JPEG altogether and send raw camera buffers (NV21, NV12,
+planar YUV420 or grayscale) with explicit width and height; those take a single
+cv2.cvtColor into a reused per-thread buffer.
+
+Depth visualization quantizes against the fixed configured depth range in one
+saturating cv2.convertScaleAbs and colors through precomputed 256-entry LUTs;
+JPEG encoding uses simplejpeg or PyTurboJPEG (libjpeg-turbo) when installed.
 """
 
 import io
 import base64
 import logging
+import threading
 import cv2
 import numpy as np
 from typing import Optional, Tuple
@@ -18,6 +31,137 @@ from core.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# Optional libjpeg-turbo encoders, preferred over cv2.imencode when installed
+try:
+    import simplejpeg
+    SIMPLEJPEG_AVAILABLE = True
+except ImportError:
+    SIMPLEJPEG_AVAILABLE = False
+
+try:
+    from turbojpeg import TJSAMP_420, TurboJPEG
+    _turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    _turbo_jpeg = None
+
+# DCT scaling factors libjpeg can decode at, largest first
+REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+# Low-light check runs on a grid of this many sampled pixels
+BRIGHTNESS_THUMB_SIZE = (32, 24)
+
+# Start-of-frame markers (baseline, progressive, ...); C4, C8 and CC are not frame headers
+_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# Raw frame formats: (cv2.cvtColor code, bits per pixel)
+RAW_FORMATS = {
+    "nv21": (cv2.COLOR_YUV2BGR_NV21, 12),
+    "nv12": (cv2.COLOR_YUV2BGR_NV12, 12),
+    "yuv420": (cv2.COLOR_YUV2BGR_I420, 12),
+    "gray": (cv2.COLOR_GRAY2BGR, 8),
+}
+
+# Formats that go through cv2.imdecode
+ENCODED_FORMATS = ("jpeg", "png")
+
+# Largest accepted raw frame side
+MAX_RAW_SIDE = 4096
+
+# CLAHE objects are not thread-safe and conversion buffers are reused, so every
+# worker thread gets its own
+_thread_local = threading.local()
+
+
+def jpeg_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """(width, height) from the start-of-frame header of a JPEG, or None if not a JPEG."""
+    if data[:2] != b"\xff\xd8":
+        return None
+    
+    position = 2
+    end = len(data) - 9
+    while position < end:
+        if data[position] != 0xFF:
+            return None
+        marker = data[position + 1]
+        if marker == 0xFF:  # Fill byte
+            position += 1
+            continue
+        if marker in _SOF_MARKERS:
+            height = int.from_bytes(data[position + 5:position + 7], "big")
+            width = int.from_bytes(data[position + 7:position + 9], "big")
+            return width, height
+        if marker == 0x01 or 0xD0 <= marker <= 0xD9:  # Markers without a length
+            position += 2
+            continue
+        position += 2 + int.from_bytes(data[position + 2:position + 4], "big")
+    return None
+
+
+def reduced_decode_flag(size: Tuple[int, int], target: Tuple[int, int]) -> int:
+    """Largest DCT reduction that still decodes at least the target size (either orientation)."""
+    short_side, long_side = sorted(size)
+    target_short, target_long = sorted(target)
+    for factor, flag in REDUCED_FLAGS:
+        if short_side // factor >= target_short and long_side // factor >= target_long:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def encode_jpeg(image: np.ndarray, quality: int = 85) -> Optional[bytes]:
+    """JPEG-encode a BGR (or grayscale) image with the fastest available encoder (4:2:0, like OpenCV)."""
+    if SIMPLEJPEG_AVAILABLE and image.ndim == 3:
+        return simplejpeg.encode_jpeg(
+            np.ascontiguousarray(image), quality=quality, colorspace='BGR', colorsubsampling='420'
+        )
+    if _turbo_jpeg is not None and image.ndim == 3:
+        return _turbo_jpeg.encode(image, quality=quality, jpeg_subsample=TJSAMP_420)
+    
+    success, buffer = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+    return buffer.tobytes() if success else None
+
+
+def jpeg_encoder_name() -> str:
+    """Encoder encode_jpeg uses for color images."""
+    if SIMPLEJPEG_AVAILABLE:
+        return "simplejpeg"
+    if _turbo_jpeg is not None:
+        return "turbojpeg"
+    return "opencv"
+
+
+def _get_clahe() -> "cv2.CLAHE":
+    clahe = getattr(_thread_local, "clahe", None)
+    if clahe is None:
+        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+        _thread_local.clahe = clahe
+    return clahe
+
+
+def _conversion_buffer(height: int, width: int) -> np.ndarray:
+    buffer = getattr(_thread_local, "bgr", None)
+    if buffer is None or buffer.shape[:2] != (height, width):
+        buffer = np.empty((height, width, 3), dtype=np.uint8)
+        _thread_local.bgr = buffer
+    return buffer
+
+
+def raw_frame_error(frame_format: str, width: Optional[int], height: Optional[int], size: int) -> Optional[str]:
+    """Why a raw frame payload cannot be decoded, or None if it can."""
+    if frame_format not in RAW_FORMATS:
+        return f"Unsupported frame format '{frame_format}'. Supported: {', '.join(RAW_FORMATS)}"
+    if not width or not height or not (0 < width <= MAX_RAW_SIDE and 0 < height <= MAX_RAW_SIDE):
+        return f"Raw frames need width and height between 1 and {MAX_RAW_SIDE}"
+    if frame_format != "gray" and (width % 2 or height % 2):
+        return f"{frame_format} frames need even width and height"
+    expected = width * height * RAW_FORMATS[frame_format][1] // 8
+    if size != expected:
+        return f"{frame_format} {width}x{height} frame must be {expected} bytes, got {size}"
+    return None
+
 
 class ImageService:
     """Service for image processing operations."""
@@ -38,7 +182,16 @@ class ImageService:
         self.settings = get_settings()
         self.target_width = self.settings.target_width
         self.target_height = self.settings.target_height
-        logger.info(f"ImageService initialized: target size {self.target_width}x{self.target_height}")
+        self.depth_range = (self.settings.min_depth, self.settings.max_depth)
+        
+        # 256-entry BGR lookup tables, inverted so that close = index 0 = red/hot
+        ramp = np.arange(255, -1, -1, dtype=np.uint8).reshape(256, 1)
+        self.colormap_luts = {name: cv2.applyColorMap(ramp, code) for name, code in self.COLORMAPS.items()}
+        
+        logger.info(
+            f"ImageService initialized: target size {self.target_width}x{self.target_height}, "
+            f"JPEG encoder {jpeg_encoder_name()}"
+        )
     
     def decode_image(self, image_bytes: bytes) -> Optional[np.ndarray]:
         """
@@ -54,8 +207,12 @@ class ImageService:
             # Convert bytes to numpy array
             nparr = np.frombuffer(image_bytes, np.uint8)
             
-            # Decode image
-            image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            # Decode image, JPEGs directly at a reduced size close to the target
+            flag = cv2.IMREAD_COLOR
+            size = jpeg_size(image_bytes)
+            if size is not None:
+                flag = reduced_decode_flag(size, (self.target_width, self.target_height))
+            image = cv2.imdecode(nparr, flag)
             
             if image is None:
                 logger.error("Failed to decode image")
@@ -79,6 +236,62 @@ class ImageService:
             logger.error(f"Image decode error: {e}", exc_info=True)
             return None
     
+    def decode_frame(
+        self,
+        data: bytes,
+        frame_format: Optional[str] = None,
+        width: Optional[int] = None,
+        height: Optional[int] = None
+    ) -> Optional[np.ndarray]:
+        """Decode an upload: encoded image (no format, 'jpeg' or 'png') or a raw frame."""
+        if frame_format is None or frame_format.lower() in ENCODED_FORMATS:
+            return self.decode_image(data)
+        return self.decode_raw(data, frame_format.lower(), width, height)
+    
+    def decode_raw(self, data: bytes, frame_format: str, width: int, height: int) -> Optional[np.ndarray]:
+        """
+        Convert a raw camera buffer to a target-size BGR image with optional enhancement.
+        
+        Args:
+            data: Frame bytes (NV21 / NV12: Y plane then interleaved chroma;
+                yuv420: Y, U, V planes; gray: Y plane only)
+            frame_format: One of RAW_FORMATS
+            width: Frame width in pixels
+            height: Frame height in pixels
+        
+        Returns:
+            Optional[np.ndarray]: BGR image or None on error
+        """
+        try:
+            error = raw_frame_error(frame_format, width, height, len(data))
+            if error:
+                logger.error(f"Invalid raw frame: {error}")
+                return None
+            
+            code, _ = RAW_FORMATS[frame_format]
+            target = (self.target_width, self.target_height)
+            
+            if frame_format == "gray":
+                gray = np.frombuffer(data, np.uint8).reshape(height, width)
+                if (width, height) != target:
+                    gray = cv2.resize(gray, target, interpolation=cv2.INTER_LINEAR)
+                image = cv2.cvtColor(gray, code)
+            else:
+                yuv = np.frombuffer(data, np.uint8).reshape(height * 3 // 2, width)
+                if (width, height) == target:
+                    image = cv2.cvtColor(yuv, code)
+                else:
+                    # Full-size conversion goes to the reused buffer, only the resize allocates
+                    bgr = cv2.cvtColor(yuv, code, dst=_conversion_buffer(height, width))
+                    image = cv2.resize(bgr, target, interpolation=cv2.INTER_LINEAR)
+            
+            # Apply CLAHE for low-light enhancement
+            return self._enhance_low_light(image)
+        
+        except Exception as e:
+            logger.error(f"Raw frame decode error: {e}", exc_info=True)
+            return None
+    
     def _enhance_low_light(self, image: np.ndarray) -> np.ndarray:
         """
         Enhance image for low-light conditions using CLAHE.
@@ -90,20 +303,16 @@ class ImageService:
             Enhanced BGR image
         """
         try:
-            # Convert to LAB color space
-            lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
-            l, a, b = cv2.split(lab)
-            
-            # Check if image is dark (needs enhancement)
-            mean_brightness = np.mean(l)
+            # Check if image is dark (needs enhancement) on a sampled thumbnail
+            thumb = cv2.resize(image, BRIGHTNESS_THUMB_SIZE, interpolation=cv2.INTER_NEAREST)
+            mean_brightness = cv2.cvtColor(thumb, cv2.COLOR_BGR2LAB)[:, :, 0].mean()
             
             if mean_brightness < 100:  # Dark image threshold
                 # Apply CLAHE to L channel
-                clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-                l = clahe.apply(l)
+                lab = cv2.cvtColor(image, cv2.COLOR_BGR2LAB)
+                lab[:, :, 0] = _get_clahe().apply(np.ascontiguousarray(lab[:, :, 0]))
                 
-                # Merge back
-                lab = cv2.merge([l, a, b])
+                # Back to BGR
                 enhanced = cv2.cvtColor(lab, cv2.COLOR_LAB2BGR)
                 
                 logger.debug(f"Applied CLAHE enhancement (brightness: {mean_brightness:.1f})")
@@ -134,15 +343,14 @@ class ImageService:
         """
         try:
             # Encode to JPEG
-            encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
-            success, buffer = cv2.imencode('.jpg', image, encode_param)
+            buffer = encode_jpeg(image, quality)
             
-            if not success:
+            if buffer is None:
                 logger.error("Failed to encode image")
                 return None
             
             # Convert to base64
-            image_base64 = base64.b64encode(buffer).decode('utf-8')
+            image_base64 = base64.b64encode(buffer).decode('ascii')
             
             # Add data URI prefix
             data_uri = f"data:image/jpeg;base64,{image_base64}"
@@ -153,17 +361,39 @@ class ImageService:
             logger.error(f"Image encode error: {e}", exc_info=True)
             return None
     
+    def quantize_depth(
+        self,
+        depth_map: np.ndarray,
+        depth_range: Optional[Tuple[float, float]] = None
+    ) -> np.ndarray:
+        """
+        Depth in meters to uint8 (0 = min, 255 = max of depth_range) in one saturating pass.
+        
+        Args:
+            depth_map: Depth map in meters (float32), within depth_range
+            depth_range: (min, max) meters; defaults to Settings.min_depth/max_depth
+        """
+        depth_min, depth_max = depth_range or self.depth_range
+        scale = 255.0 / max(depth_max - depth_min, 1e-6)
+        return cv2.convertScaleAbs(depth_map, alpha=scale, beta=-depth_min * scale)
+    
     def apply_colormap(
         self,
         depth_map: np.ndarray,
-        colormap: str = "JET"
+        colormap: str = "JET",
+        depth_range: Optional[Tuple[float, float]] = None
     ) -> Optional[np.ndarray]:
         """
         Apply colormap to depth map for visualization.
         
+        Colors are fixed to the depth range (close = red/hot, far = blue/cold),
+        so the same distance has the same color in every frame.
+        
         Args:
-            depth_map: Depth map in meters (float32)
+            depth_map: Depth map in meters (float32), within depth_range, or an
+                already quantized uint8 map from quantize_depth
             colormap: Colormap name (JET, VIRIDIS, etc.)
+            depth_range: (min, max) meters; defaults to Settings.min_depth/max_depth
         
         Returns:
             Optional[np.ndarray]: Colored BGR image or None on error
@@ -173,22 +403,14 @@ class ImageService:
             return None
         
         try:
-            # Normalize depth map
-            depth_min = depth_map.min()
-            depth_max = depth_map.max()
-            
-            if depth_max - depth_min > 0:
-                # Invert normalization (close = red/hot, far = blue/cold)
-                depth_normalized = 1.0 - ((depth_map - depth_min) / (depth_max - depth_min))
+            if depth_map.dtype == np.uint8:
+                depth_uint8 = depth_map
             else:
-                depth_normalized = np.zeros_like(depth_map)
-            
-            # Convert to uint8
-            depth_uint8 = (depth_normalized * 255).astype(np.uint8)
+                depth_uint8 = self.quantize_depth(depth_map, depth_range)
             
-            # Apply colormap
-            colormap_cv = self.COLORMAPS.get(colormap.upper(), cv2.COLORMAP_JET)
-            depth_colored = cv2.applyColorMap(depth_uint8, colormap_cv)
+            # Apply colormap (inverted LUT)
+            lut = self.colormap_luts.get(colormap.upper(), self.colormap_luts["JET"])
+            depth_colored = cv2.applyColorMap(depth_uint8, lut)
             
             return depth_colored
         
@@ -207,7 +429,7 @@ class ImageService:
         Create a visualization with depth map and overlay information.
         
         Args:
-            depth_map: Depth map in meters
+            depth_map: Depth map in meters (or quantized, see apply_colormap)
             alert_level: Alert level string
             distance_stats: Distance statistics dict
             colormap: Colormap name
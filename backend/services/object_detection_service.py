@@ -13,7 +13,8 @@ Upgraded from YOLOv8 to YOLOv11 for:
 
 import logging
 import numpy as np
-from typing import List, Dict, Optional
+import yaml
+from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 import torch
 
@@ -25,6 +26,7 @@ except ImportError:
     logging.warning("Ultralytics not available. Object detection disabled.")
 
 from core.config import get_settings
+from services.box_depth_stats import box_distances
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +76,15 @@ class ObjectDetectionService:
         'mailbox': 'posta kutusu',
         'fire hydrant': 'yangın musluğu',
         
+        # TÜRKİYE MODELİ SINIFLARI (yolo11n_turkish)
+        'vehicle': 'araç',
+        'pothole': 'çukur',
+        'obstacle': 'engel',
+        'traffic_sign_tr': 'trafik levhası',
+        'crosswalk': 'yaya geçidi',
+        'curb': 'bordür',
+        'construction': 'inşaat',
+        
         # YAPISAL NESNELER - Çarpma riski
         'door': 'kapı',
         'wall': 'duvar',
@@ -179,6 +190,15 @@ class ObjectDetectionService:
         'traffic light': 8,    # Trafik ışığı
         'stop sign': 8,        # Dur işareti
         
+        # TÜRKİYE MODELİ SINIFLARI (yolo11n_turkish)
+        'vehicle': 10,         # Araç
+        'pothole': 9,          # Çukur - Düşme riski
+        'curb': 8,             # Bordür - Takılma riski
+        'obstacle': 8,         # Genel engel
+        'construction': 8,     # İnşaat alanı
+        'traffic_sign_tr': 8,  # TR trafik levhası
+        'crosswalk': 6,        # Yaya geçidi - Bilgi amaçlı
+        
         # MOBİLYA ENGELLERİ (7-8)
         'chair': 8,            # Sandalye - Yaygın engel
         'dining table': 8,     # Masa - Yaygın engel
@@ -220,56 +240,142 @@ class ObjectDetectionService:
         }
     }
     
+    # Region index -> name, as produced by the vectorized parser
+    REGIONS = ('left', 'center', 'right')
+    
     def __init__(self):
         """Initialize object detection service with YOLOv11-Nano."""
         self.settings = get_settings()
         self.model = None
+        self._class_names = []
+        self._navigation_class_ids = []
         self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
+        self.model_name = None
+        self.model_variant = None
+        self.model_path = None
+        self.static_imgsz = None  # Input size of a static-shape IR; overrides tier imgsz
         
         if not YOLO_AVAILABLE:
             logger.warning("YOLO not available - object detection disabled")
             return
         
+        models_dir = Path(__file__).parent.parent / "models"
+        
+        # Preference order: fine-tuned OpenVINO IR (training/scripts/export.py), fine-tuned
+        # PyTorch weights, then the stock COCO models (80 classes - günlük nesneler)
+        candidates = [
+            ("openvino_int8", models_dir / "yolo11n_turkish_openvino_int8", "YOLOv11-Nano-TR (OpenVINO INT8)"),
+            ("openvino_fp16", models_dir / "yolo11n_turkish_openvino_fp16", "YOLOv11-Nano-TR (OpenVINO FP16)"),
+            ("pytorch", models_dir / "yolo11n_turkish.pt", "YOLOv11-Nano-TR"),
+            ("pytorch", models_dir / "yolo11n.pt", "YOLOv11-Nano"),
+            ("pytorch", models_dir / "yolov8n.pt", "YOLOv8-Nano"),
+        ]
+        
+        variant = self.settings.detection_model_variant
+        if variant != "auto":
+            candidates = [c for c in candidates if c[0] == variant]
+        
+        # Fallback to current directory if not found (development mode)
+        candidates = [c for c in candidates if c[1].exists()] or [
+            ("pytorch", Path("yolo11n.pt"), "YOLOv11-Nano"),
+            ("pytorch", Path("yolov8n.pt"), "YOLOv8-Nano"),
+        ]
+        
+        for model_variant, model_path, model_name in candidates:
+            try:
+                self.model = YOLO(str(model_path), task="detect")
+                self.model_name = model_name
+                self.model_variant = model_variant
+                self.model_path = str(model_path)
+                if model_variant.startswith("openvino"):
+                    self.static_imgsz = self._static_export_size(model_path)
+                logger.info(f"✓ Active detector: {model_name} [{model_variant}] from {model_path}")
+                if self.static_imgsz:
+                    logger.warning(
+                        f"Detector IR has a static {self.static_imgsz} input; tier imgsz is ignored "
+                        f"(re-export with training/scripts/export.py for dynamic shapes)"
+                    )
+                break
+            except Exception as e:
+                logger.warning(f"Failed to load detector {model_path}: {e}")
+        
+        if self.model is None:
+            logger.error("Failed to load any YOLO model")
+            return
+        
+        self._build_class_tables(self.model.names)
+    
+    @staticmethod
+    def _static_export_size(model_dir: Path) -> Optional[List[int]]:
+        """
+        Input size of an OpenVINO IR exported without dynamic shapes, from the
+        metadata.yaml ultralytics writes next to it; None if it takes any size.
+        Exports without the dynamic flag in their metadata are treated as static.
+        """
         try:
-            # Standard YOLO (80 COCO sınıfı - günlük nesneler)
-            # person, car, chair, bottle, laptop vb. tanır
-            # Get absolute path to models directory
-            models_dir = Path(__file__).parent.parent / "models"
+            with open(Path(model_dir) / "metadata.yaml", encoding="utf-8") as f:
+                metadata = yaml.safe_load(f) or {}
+        except (OSError, yaml.YAMLError) as e:
+            logger.warning(f"Could not read detector export metadata: {e}")
+            return None
+        
+        if (metadata.get('args') or {}).get('dynamic', False):
+            return None
+        imgsz = metadata.get('imgsz')
+        return list(imgsz) if isinstance(imgsz, (list, tuple)) else [imgsz, imgsz] if imgsz else None
+    
+    def _build_class_tables(self, names: Dict[int, str]):
+        """
+        Precompute per-class lookups so parsing a result needs no per-box dict lookups:
+        names, Turkish names, a class_id -> priority array and a (class_id, region)
+        -> direction message table.
+        """
+        num_classes = max(names) + 1 if names else 0
+        
+        self._class_names = [names.get(i, str(i)) for i in range(num_classes)]
+        self._class_names_tr = [self.TURKISH_LABELS.get(n, n) for n in self._class_names]
+        self._class_priority = np.array(
+            [self.PRIORITY_OBJECTS.get(n, 5) for n in self._class_names], dtype=np.int64
+        )
+        # Classes we act on; passed to the model so NMS skips everything else
+        self._navigation_class_ids = [
+            i for i, name in enumerate(self._class_names) if name in self.PRIORITY_OBJECTS
+        ]
+        self._direction_table = [
+            [
+                self._generate_direction_message(name, name_tr, region, int(priority))
+                for region in self.REGIONS
+            ]
+            for name, name_tr, priority in zip(self._class_names, self._class_names_tr, self._class_priority)
+        ]
+    
+    def resolve_tier(self, tier: Optional[str] = None) -> str:
+        """Map a requested detection tier to a configured one (None or unknown -> default)."""
+        tier = tier or self.settings.detection_tier
+        if tier not in self.settings.detection_tiers:
+            logger.warning(f"Unknown detection tier '{tier}', using '{self.settings.detection_tier}'")
+            tier = self.settings.detection_tier
+        return tier
+    
+    def get_tier_config(self, tier: Optional[str] = None) -> dict:
+        """
+        Resolve a detection tier to its inference options.
+        
+        Args:
+            tier: Tier name from config (e.g. 'full', 'fast'); None uses the default tier
             
-            logger.info("Loading YOLOv11-Nano (COCO 80 classes)...")
-            try:
-                # Try YOLOv11n first
-                model_path = models_dir / 'yolo11n.pt'
-                if not model_path.exists():
-                     # Fallback to current directory if not found (development mode)
-                     model_path = 'yolo11n.pt'
-                     
-                self.model = YOLO(str(model_path))
-                self.model_name = "YOLOv11-Nano"
-                logger.info(f"✓ YOLOv11-Nano loaded on {self.device}")
-            except Exception as e1:
-                logger.warning(f"YOLOv11n failed ({e1}), trying YOLOv8...")
-                # Try YOLOv8 fallback
-                try:
-                    model_path_v8 = models_dir / 'yolov8n.pt'
-                    if not model_path_v8.exists():
-                        model_path_v8 = 'yolov8n.pt'
-                    
-                    self.model = YOLO(str(model_path_v8))
-                    self.model_name = "YOLOv8-Nano"
-                except Exception as e2:
-                    logger.error(f"Failed to load any YOLO model: {e2}")
-                    raise
-        except Exception as e:
-            logger.error(f"Failed to load YOLO model: {e}")
-            self.model = None
+        Returns:
+            Dict of inference options (imgsz, max_det, navigation_only)
+        """
+        return self.settings.detection_tiers.get(self.resolve_tier(tier), {})
     
     def detect(
         self,
         image: np.ndarray,
         confidence_threshold: float = 0.5,  # ✅ Balanced (0.4 was too many detections)
         max_objects: int = 10,               # Standard
-        depth_map: Optional[np.ndarray] = None
+        depth_map: Optional[np.ndarray] = None,
+        tier: Optional[str] = None
     ) -> List[Dict]:
         """
         Detect objects in image.
@@ -279,6 +385,7 @@ class ObjectDetectionService:
             confidence_threshold: Minimum confidence score (0-1)
             max_objects: Maximum number of objects to return
             depth_map: Optional depth map for distance calculation (same size as image)
+            tier: Detection tier (input size, max_det, class whitelist); None uses the default
         
         Returns:
             List of detected objects with:
@@ -295,76 +402,11 @@ class ObjectDetectionService:
             return []
         
         try:
-            # Run inference
-            results = self.model(image, verbose=False, conf=confidence_threshold)
-            
-            if len(results) == 0 or len(results[0].boxes) == 0:
+            data = self.detect_boxes(image, confidence_threshold, tier)
+            if len(data) == 0:
                 return []
             
-            # Parse results
-            detections = []
-            height, width = image.shape[:2]
-            
-            for box in results[0].boxes:
-                # Get box data
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                conf = float(box.conf[0].cpu().numpy())
-                cls_id = int(box.cls[0].cpu().numpy())
-                
-                # Get class name
-                class_name = self.model.names[cls_id]
-                
-                # Calculate center and region
-                center_x = (x1 + x2) / 2
-                center_y = (y1 + y2) / 2
-                
-                # Determine region (left/center/right)
-                if center_x < width / 3:
-                    region = 'left'
-                elif center_x < 2 * width / 3:
-                    region = 'center'
-                else:
-                    region = 'right'
-                
-                # Get Turkish name and priority
-                name_tr = self.TURKISH_LABELS.get(class_name, class_name)
-                priority = self.PRIORITY_OBJECTS.get(class_name, 5)
-                
-                # Calculate distance from depth map if available
-                distance = 0.0
-                if depth_map is not None:
-                    try:
-                        # Sample depth at object center
-                        cy, cx = int(center_y), int(center_x)
-                        # Ensure coordinates are within bounds
-                        cy = max(0, min(cy, depth_map.shape[0] - 1))
-                        cx = max(0, min(cx, depth_map.shape[1] - 1))
-                        distance = float(depth_map[cy, cx])
-                    except Exception as e:
-                        logger.warning(f"Failed to get distance for {class_name}: {e}")
-                        distance = 0.0
-                
-                detection = {
-                    'name': class_name,
-                    'name_tr': name_tr,
-                    'confidence': round(conf, 3),
-                    'bbox': [float(x1), float(y1), float(x2), float(y2)],
-                    'center': [float(center_x), float(center_y)],
-                    'distance': distance,  # ✅ Now includes actual distance
-                    'priority': priority,
-                    'region': region,
-                    'direction_message': self._generate_direction_message(
-                        class_name, name_tr, region, priority
-                    )
-                }
-                
-                detections.append(detection)
-            
-            # Sort by priority (high to low) and confidence
-            detections.sort(key=lambda x: (x['priority'], x['confidence']), reverse=True)
-            
-            # Limit number of objects
-            detections = detections[:max_objects]
+            detections = self.parse_boxes(data, image.shape[:2], max_objects, depth_map)
             
             logger.debug(f"Detected {len(detections)} objects")
             return detections
@@ -373,6 +415,110 @@ class ObjectDetectionService:
             logger.error(f"Object detection failed: {e}")
             return []
     
+    def detect_boxes(
+        self,
+        image: np.ndarray,
+        confidence_threshold: float = 0.5,
+        tier: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Run the detector only.
+        
+        Returns:
+            Raw boxes (N, 6) [x1, y1, x2, y2, conf, cls], input for parse_boxes
+        """
+        if self.model is None:
+            return np.zeros((0, 6), dtype=np.float32)
+        
+        tier_config = self.get_tier_config(tier)
+        
+        # Run inference
+        results = self.model(
+            image,
+            verbose=False,
+            conf=confidence_threshold,
+            imgsz=self.static_imgsz or tier_config.get('imgsz', 640),
+            max_det=tier_config.get('max_det', 300),
+            classes=self._navigation_class_ids if tier_config.get('navigation_only') else None
+        )
+        
+        if len(results) == 0 or len(results[0].boxes) == 0:
+            return np.zeros((0, 6), dtype=np.float32)
+        
+        # One device->host transfer for all boxes: [x1, y1, x2, y2, conf, cls]
+        return results[0].boxes.data.cpu().numpy()
+    
+    def parse_boxes(
+        self,
+        data: np.ndarray,
+        image_shape: Tuple[int, int],
+        max_objects: int,
+        depth_map: Optional[np.ndarray] = None,
+        extras: Optional[List[Dict]] = None
+    ) -> List[Dict]:
+        """
+        Turn raw YOLO boxes (N, 6) into detection dicts, sorted by priority and confidence.
+        
+        Regions, priorities and depth samples are computed for all boxes at once; dicts are
+        only built for the `max_objects` that are returned. `extras` (one dict per box)
+        are merged into the corresponding detections.
+        """
+        height, width = image_shape
+        
+        xyxy = data[:, :4]
+        conf = data[:, -2]
+        cls_ids = data[:, -1].astype(np.int64)
+        
+        centers = (xyxy[:, :2] + xyxy[:, 2:]) / 2
+        
+        # Same comparisons as center_x < width / 3 etc. (in float64)
+        center_x = centers[:, 0].astype(np.float64)
+        region_idx = (center_x >= width / 3).astype(np.int64) + (center_x >= 2 * width / 3)
+        
+        priorities = self._class_priority[cls_ids]
+        confidences = [round(c, 3) for c in conf.tolist()]
+        
+        distances = np.zeros(len(data))
+        if depth_map is not None:
+            try:
+                distances = box_distances(
+                    depth_map,
+                    xyxy,
+                    method=self.settings.object_distance_method,
+                    crop=self.settings.object_distance_crop,
+                    percentile=self.settings.object_distance_percentile,
+                    pyramid_size=self.settings.object_distance_pyramid_size
+                )
+            except Exception as e:
+                logger.warning(f"Failed to get distances from depth map: {e}")
+                distances = np.zeros(len(data))
+        
+        # Priority then confidence, high to low; stable like list.sort(reverse=True)
+        order = np.lexsort((-np.array(confidences), -priorities))[:max_objects]
+        
+        bboxes = xyxy.tolist()
+        center_list = centers.tolist()
+        
+        detections = []
+        for i in order.tolist():
+            cls_id = int(cls_ids[i])
+            region = int(region_idx[i])
+            detections.append({
+                'name': self._class_names[cls_id],
+                'name_tr': self._class_names_tr[cls_id],
+                'confidence': confidences[i],
+                'bbox': bboxes[i],
+                'center': center_list[i],
+                'distance': float(distances[i]),
+                'priority': int(priorities[i]),
+                'region': self.REGIONS[region],
+                'direction_message': self._direction_table[cls_id][region]
+            })
+            if extras is not None:
+                detections[-1].update(extras[i])
+        
+        return detections
+    
     def _generate_direction_message(
         self, 
         class_name: str, 
@@ -4,322 +4,498 @@ Object Tracking Service
 
 Tracks detected objects across frames to reduce false positives and
 provide temporal smoothing for more reliable collision warnings.
+
+SORT-style: every track keeps a constant-velocity Kalman state over its box;
+detections are assigned to the predicted boxes with the Hungarian algorithm
+on an IoU / centre-distance cost matrix.
+
+Track state lives in a struct-of-arrays TrackStore: preallocated NumPy arrays
+with one slot per track and ring buffers for the recent history, so per-frame
+statistics are computed for all tracks at once.
+
+Each track also carries a filtered radial velocity and a time-to-collision,
+updated in O(1) per observation: an alpha-beta filter on the depth-sampled
+distance, blended with the rate implied by the box scale change
+(distance is inversely proportional to apparent size).
 """
 
 import logging
 import time
 from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass, field
-from collections import deque
 import numpy as np
+from scipy.optimize import linear_sum_assignment
 
 logger = logging.getLogger(__name__)
 
+# Cost of a forbidden pairing (different class, no overlap and too far)
+INVALID_COST = 1e6
+
+# Constant-velocity Kalman model over [cx, cy, area, aspect] (SORT),
+# state [cx, cy, area, aspect, vcx, vcy, varea], one step per frame
+KALMAN_F = np.eye(7)
+KALMAN_F[0, 4] = KALMAN_F[1, 5] = KALMAN_F[2, 6] = 1.0
+KALMAN_R = np.diag([1.0, 1.0, 10.0, 10.0])
+KALMAN_Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.01, 0.01, 0.0001])
+# Unknown initial velocity: large uncertainty
+KALMAN_P0 = np.diag([10.0, 10.0, 10.0, 10.0, 1e4, 1e4, 1e4])
+
+# Radial (distance) alpha-beta filter gains
+RANGE_ALPHA = 0.5
+RANGE_BETA = 0.2
+# Weight of the box-scale rate in the radial velocity estimate
+SCALE_RATE_WEIGHT = 0.5
+
+
+def boxes_to_measurements(boxes: np.ndarray) -> np.ndarray:
+    """(N, 4) [x1, y1, x2, y2] -> (N, 4) [cx, cy, area, aspect]."""
+    w = boxes[:, 2] - boxes[:, 0]
+    h = boxes[:, 3] - boxes[:, 1]
+    return np.stack([boxes[:, 0] + w / 2, boxes[:, 1] + h / 2, w * h, w / np.maximum(h, 1e-6)], axis=1)
+
+
+def states_to_boxes(states: np.ndarray) -> np.ndarray:
+    """(N, 7) Kalman states -> (N, 4) [x1, y1, x2, y2]."""
+    area = np.maximum(states[:, 2], 1e-6)
+    w = np.sqrt(area * np.maximum(states[:, 3], 1e-6))
+    h = area / w
+    cx, cy = states[:, 0], states[:, 1]
+    return np.stack([cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2], axis=1)
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU of (N, 4) and (M, 4) boxes, shape (N, M)."""
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    inter = np.prod(np.clip(bottom_right - top_left, 0, None), axis=2)
+
+    area_a = np.prod(boxes_a[:, 2:] - boxes_a[:, :2], axis=1)
+    area_b = np.prod(boxes_b[:, 2:] - boxes_b[:, :2], axis=1)
+    union = area_a[:, None] + area_b[None, :] - inter
+
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+class TrackStore:
+    """
+    Struct-of-arrays storage for all tracks of one tracker.
+
+    Every track owns a slot (row) in each array; histories are ring buffers of
+    `history` entries. Capacity doubles when all slots are in use, freed slots
+    are reused.
+    """
+
+    def __init__(self, capacity: int = 32, history: int = 10):
+        self.history = history
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        self.capacity = capacity
+        self.active = np.zeros(capacity, dtype=bool)
+        self.track_ids = np.zeros(capacity, dtype=np.int64)
+        self.class_names = np.empty(capacity, dtype=object)
+        self.first_seen = np.zeros(capacity)
+        self.last_seen = np.zeros(capacity)
+        self.detection_count = np.zeros(capacity, dtype=np.int64)
+        self.stability = np.zeros(capacity)
+
+        # Ring buffers: `head` is the next write position, `length` the number of valid entries
+        self.head = np.zeros(capacity, dtype=np.int64)
+        self.length = np.zeros(capacity, dtype=np.int64)
+        self.positions = np.zeros((capacity, self.history, 2))
+        self.confidences = np.zeros((capacity, self.history))
+        self.distances = np.zeros((capacity, self.history))
+        self.timestamps = np.zeros((capacity, self.history))
+
+        # Kalman state and covariance
+        self.kalman_x = np.zeros((capacity, 7))
+        self.kalman_P = np.zeros((capacity, 7, 7))
+
+        # Radial motion: filtered distance, its rate (NaN until known) and time-to-collision
+        self.has_range = np.zeros(capacity, dtype=bool)
+        self.range_time = np.zeros(capacity)
+        self.range_distance = np.zeros(capacity)
+        self.box_scale = np.zeros(capacity)
+        self.radial_velocity = np.full(capacity, np.nan)
+        self.time_to_collision = np.full(capacity, np.inf)
+
+    ARRAYS = (
+        'active', 'track_ids', 'class_names', 'first_seen', 'last_seen', 'detection_count',
+        'stability', 'head', 'length', 'positions', 'confidences', 'distances', 'timestamps',
+        'kalman_x', 'kalman_P', 'has_range', 'range_time', 'range_distance', 'box_scale',
+        'radial_velocity', 'time_to_collision'
+    )
+
+    def _grow(self):
+        old = {name: getattr(self, name) for name in self.ARRAYS}
+        old_capacity = self.capacity
+        self._allocate(old_capacity * 2)
+        for name, array in old.items():
+            getattr(self, name)[:old_capacity] = array
 
-@dataclass
-class TrackedObject:
-    """Represents a tracked object across multiple frames."""
-    
-    object_id: str
-    class_name: str
-    first_seen: float
-    last_seen: float
-    
-    # Position history (bbox center points)
-    positions: deque = field(default_factory=lambda: deque(maxlen=10))
-    
-    # Confidence history
-    confidences: deque = field(default_factory=lambda: deque(maxlen=10))
-    
-    # Distance history
-    distances: deque = field(default_factory=lambda: deque(maxlen=10))
-    
-    # Detection count
-    detection_count: int = 0
-    
-    # Stability score (0-1, higher = more stable)
-    stability: float = 0.0
-    
-    def update(self, bbox_center: Tuple[float, float], confidence: float, distance: float):
-        """Update tracked object with new detection."""
-        self.last_seen = time.time()
-        self.positions.append(bbox_center)
-        self.confidences.append(confidence)
-        self.distances.append(distance)
-        self.detection_count += 1
-        
-        # Calculate stability based on position variance
-        if len(self.positions) >= 3:
-            positions_array = np.array(self.positions)
-            variance = np.var(positions_array, axis=0).mean()
-            # Lower variance = higher stability
-            self.stability = max(0.0, min(1.0, 1.0 - variance / 100.0))
-        else:
-            self.stability = 0.5
-    
-    def get_velocity(self) -> Optional[Tuple[float, float]]:
-        """Calculate object velocity (pixels/second) if enough history."""
-        if len(self.positions) < 2:
-            return None
-        
-        # Use last two positions
-        p1 = np.array(self.positions[-2])
-        p2 = np.array(self.positions[-1])
-        
-        # Time difference
-        time_diff = self.last_seen - self.first_seen
-        if time_diff < 0.1:  # Avoid division by zero
-            return None
-        
-        # Velocity (pixels/second)
-        velocity = (p2 - p1) / time_diff
-        return tuple(velocity)
-    
-    def is_moving_towards_camera(self) -> bool:
-        """Check if object is moving closer (distance decreasing)."""
-        if len(self.distances) < 3:
-            return False
-        
-        # Check if distance is decreasing over last 3 frames
-        recent_distances = list(self.distances)[-3:]
-        return recent_distances[0] > recent_distances[-1]
-    
-    def get_average_confidence(self) -> float:
-        """Get average confidence over recent detections."""
-        if not self.confidences:
-            return 0.0
-        return sum(self.confidences) / len(self.confidences)
-    
-    def get_average_distance(self) -> float:
-        """Get average distance over recent detections."""
-        if not self.distances:
-            return 0.0
-        return sum(self.distances) / len(self.distances)
+    def allocate_slots(self, count: int) -> np.ndarray:
+        """Reserve `count` free slots (growing if needed) and mark them active."""
+        free = np.flatnonzero(~self.active)
+        while len(free) < count:
+            self._grow()
+            free = np.flatnonzero(~self.active)
+        slots = free[:count]
+        self.active[slots] = True
+        return slots
+
+    def reset_slots(self, slots: np.ndarray, track_ids: np.ndarray, now: float):
+        """Start fresh tracks in newly allocated slots."""
+        self.track_ids[slots] = track_ids
+        self.first_seen[slots] = now
+        self.head[slots] = 0
+        self.length[slots] = 0
+        self.detection_count[slots] = 0
+        self.has_range[slots] = False
+        self.box_scale[slots] = 0.0
+        self.radial_velocity[slots] = np.nan
+        self.time_to_collision[slots] = np.inf
+
+    def release(self, slots: np.ndarray):
+        self.active[slots] = False
+        self.class_names[slots] = None
+
+    def clear(self):
+        self._allocate(self.capacity)
+
+    @property
+    def slots(self) -> np.ndarray:
+        """Indices of the active slots."""
+        return np.flatnonzero(self.active)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the arrays (class name strings are shared, not counted)."""
+        return sum(getattr(self, name).nbytes for name in self.ARRAYS)
+
+    # --- Kalman (batched over slots) ---
+
+    def init_kalman(self, slots: np.ndarray, boxes: np.ndarray):
+        self.kalman_x[slots] = 0.0
+        self.kalman_x[slots, :4] = boxes_to_measurements(boxes)
+        self.kalman_P[slots] = KALMAN_P0
+
+    def predict(self, slots: np.ndarray) -> np.ndarray:
+        """Advance the Kalman state of `slots` one frame; returns predicted boxes."""
+        x = self.kalman_x[slots]
+        # Area must stay positive
+        x[x[:, 2] + x[:, 6] <= 0, 6] = 0.0
+
+        self.kalman_x[slots] = x @ KALMAN_F.T
+        self.kalman_P[slots] = KALMAN_F @ self.kalman_P[slots] @ KALMAN_F.T + KALMAN_Q
+        return states_to_boxes(self.kalman_x[slots])
+
+    def correct(self, slots: np.ndarray, boxes: np.ndarray):
+        """Kalman measurement update of `slots` with matched boxes (H = [I4 | 0])."""
+        x, P = self.kalman_x[slots], self.kalman_P[slots]
+
+        y = boxes_to_measurements(boxes) - x[:, :4]
+        S = P[:, :4, :4] + KALMAN_R
+        K = P[:, :, :4] @ np.linalg.inv(S)
+
+        self.kalman_x[slots] = x + (K @ y[:, :, None])[:, :, 0]
+        self.kalman_P[slots] = P - K @ P[:, :4, :]
+
+    # --- History (batched over slots) ---
+
+    def push(self, slots: np.ndarray, centers: np.ndarray, confidences: np.ndarray,
+             distances: np.ndarray, now: float):
+        """Append one observation to the ring buffers of `slots`."""
+        idx = self.head[slots]
+        self.positions[slots, idx] = centers
+        self.confidences[slots, idx] = confidences
+        self.distances[slots, idx] = distances
+        self.timestamps[slots, idx] = now
+
+        self.head[slots] = (idx + 1) % self.history
+        self.length[slots] = np.minimum(self.length[slots] + 1, self.history)
+        self.detection_count[slots] += 1
+        self.last_seen[slots] = now
+
+    def _valid_mask(self, slots: np.ndarray) -> np.ndarray:
+        return np.arange(self.history)[None, :] < self.length[slots, None]
+
+    def _recent(self, array: np.ndarray, slots: np.ndarray, back: int) -> np.ndarray:
+        """Entry `back` steps ago (1 = latest) of each slot's ring buffer."""
+        return array[slots, (self.head[slots] - back) % self.history]
+
+    def update_stability(self, slots: np.ndarray):
+        """Position variance based stability (0-1); 0.5 until 3 observations."""
+        mask = self._valid_mask(slots)
+        n = np.maximum(self.length[slots], 1)[:, None]
+
+        positions = self.positions[slots]
+        mean = (positions * mask[:, :, None]).sum(axis=1) / n
+        variance = (((positions - mean[:, None, :]) ** 2) * mask[:, :, None]).sum(axis=1) / n
+
+        stability = np.clip(1.0 - variance.mean(axis=1) / 100.0, 0.0, 1.0)
+        self.stability[slots] = np.where(self.length[slots] >= 3, stability, 0.5)
+
+    def average(self, array: np.ndarray, slots: np.ndarray) -> np.ndarray:
+        """Mean over the valid history entries of `slots`."""
+        mask = self._valid_mask(slots)
+        return (array[slots] * mask).sum(axis=1) / np.maximum(self.length[slots], 1)
+
+    def update_range(self, slots: np.ndarray, distances: np.ndarray, boxes: np.ndarray, now: float):
+        """
+        O(1) radial motion update of `slots` from one observation each.
+
+        Distance: alpha-beta filter over the depth-sampled distance; the first rate is the raw
+        finite difference. Scale: for d ~ 1/size, dd/dt = -d * (ds/dt) / s with s = sqrt(box area).
+        Non-positive distances (no depth) leave the state untouched.
+        """
+        scales = np.sqrt(np.maximum(np.prod(boxes[:, 2:] - boxes[:, :2], axis=1), 0.0))
+        valid = distances > 0
+
+        # First valid distance: initialise the filter
+        start = valid & ~self.has_range[slots]
+        if start.any():
+            started = slots[start]
+            self.has_range[started] = True
+            self.range_time[started] = now
+            self.range_distance[started] = distances[start]
+            self.box_scale[started] = scales[start]
+
+        dt = now - self.range_time[slots]
+        step = valid & ~start & (dt > 1e-3)
+        if not step.any():
+            return
+
+        slots, z, scale, dt = slots[step], distances[step], scales[step], dt[step]
+        d, v = self.range_distance[slots], self.radial_velocity[slots]
+        known = ~np.isnan(v)
+        v = np.where(known, v, 0.0)
+
+        predicted = d + v * dt
+        residual = z - predicted
+        d_new = np.where(known, predicted + RANGE_ALPHA * residual, z)
+        v_new = np.where(known, v + RANGE_BETA * residual / dt, (z - d) / dt)
+
+        previous_scale = self.box_scale[slots]
+        has_scale = (previous_scale > 0) & (scale > 0)
+        scale_rate = -d_new * (scale / np.where(has_scale, previous_scale, 1.0) - 1.0) / dt
+        v_new = np.where(has_scale, (1 - SCALE_RATE_WEIGHT) * v_new + SCALE_RATE_WEIGHT * scale_rate, v_new)
+
+        self.range_time[slots] = now
+        self.range_distance[slots] = d_new
+        self.box_scale[slots] = scale
+        self.radial_velocity[slots] = v_new
+        self.time_to_collision[slots] = np.where(v_new < 0, d_new / np.maximum(-v_new, 1e-9), np.inf)
+
+    def velocity(self, slots: np.ndarray) -> np.ndarray:
+        """Centre velocity (pixels/second) between the last two observations; 0 if unknown."""
+        dt = self._recent(self.timestamps, slots, 1) - self._recent(self.timestamps, slots, 2)
+        delta = self._recent(self.positions, slots, 1) - self._recent(self.positions, slots, 2)
+        ok = (self.length[slots] >= 2) & (dt > 1e-3)
+        return np.where(ok[:, None], delta / np.where(ok, dt, 1.0)[:, None], 0.0)
 
 
 class ObjectTrackingService:
     """
     Service for tracking detected objects across frames.
-    
+
     Features:
     - Temporal smoothing to reduce false positives
     - Object persistence tracking
     - Movement direction detection
     - Stability scoring
     """
-    
+
     def __init__(
         self,
         max_age: float = 2.0,           # Max seconds without detection before removal
         min_detections: int = 2,         # Min detections before considering object "confirmed"
         iou_threshold: float = 0.3,      # IoU threshold for matching
-        position_threshold: float = 50.0  # Max pixel distance for matching
+        position_threshold: float = 50.0,  # Max pixel distance for matching
+        min_approach_speed: float = 0.1    # Min closing speed (distance units/s) to count as approaching
     ):
         """Initialize tracking service."""
-        self.tracked_objects: Dict[str, TrackedObject] = {}
+        self.store = TrackStore()
         self.max_age = max_age
         self.min_detections = min_detections
         self.iou_threshold = iou_threshold
         self.position_threshold = position_threshold
+        self.min_approach_speed = min_approach_speed
         self.next_id = 0
-        
+
         logger.info(
             f"ObjectTrackingService initialized: "
             f"max_age={max_age}s, min_detections={min_detections}"
         )
-    
-    def _calculate_iou(self, box1: List[float], box2: List[float]) -> float:
-        """Calculate Intersection over Union between two bounding boxes."""
-        x1_min, y1_min, x1_max, y1_max = box1
-        x2_min, y2_min, x2_max, y2_max = box2
-        
-        # Intersection area
-        inter_x_min = max(x1_min, x2_min)
-        inter_y_min = max(y1_min, y2_min)
-        inter_x_max = min(x1_max, x2_max)
-        inter_y_max = min(y1_max, y2_max)
-        
-        if inter_x_max < inter_x_min or inter_y_max < inter_y_min:
-            return 0.0
-        
-        inter_area = (inter_x_max - inter_x_min) * (inter_y_max - inter_y_min)
-        
-        # Union area
-        box1_area = (x1_max - x1_min) * (y1_max - y1_min)
-        box2_area = (x2_max - x2_min) * (y2_max - y2_min)
-        union_area = box1_area + box2_area - inter_area
-        
-        if union_area == 0:
-            return 0.0
-        
-        return inter_area / union_area
-    
-    def _get_bbox_center(self, bbox: List[float]) -> Tuple[float, float]:
-        """Get center point of bounding box."""
-        x_min, y_min, x_max, y_max = bbox
-        center_x = (x_min + x_max) / 2
-        center_y = (y_min + y_max) / 2
-        return (center_x, center_y)
-    
-    def _euclidean_distance(self, p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
-        """Calculate Euclidean distance between two points."""
-        return np.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
-    
+
+    @property
+    def num_tracks(self) -> int:
+        """Number of live tracks."""
+        return int(self.store.active.sum())
+
+    def _associate(
+        self,
+        det_boxes: np.ndarray,
+        det_classes: List[str],
+        track_boxes: np.ndarray,
+        track_classes: List[str]
+    ) -> List[Tuple[int, int]]:
+        """
+        Assign detections to (predicted) track boxes.
+
+        Cost = (1 - IoU) + normalized centre distance; pairs of different classes, or
+        with IoU below iou_threshold and centres further than position_threshold,
+        are not allowed. Solved with the Hungarian algorithm.
+
+        Returns:
+            List of (detection index, track index) pairs
+        """
+        if len(det_boxes) == 0 or len(track_boxes) == 0:
+            return []
+
+        iou = iou_matrix(det_boxes, track_boxes)
+
+        det_centers = (det_boxes[:, :2] + det_boxes[:, 2:]) / 2
+        track_centers = (track_boxes[:, :2] + track_boxes[:, 2:]) / 2
+        center_dist = np.linalg.norm(det_centers[:, None] - track_centers[None], axis=2) / self.position_threshold
+
+        same_class = np.asarray(det_classes, dtype=object)[:, None] == np.asarray(track_classes, dtype=object)[None]
+        valid = same_class & ((iou >= self.iou_threshold) | (center_dist < 1.0))
+
+        cost = np.where(valid, (1.0 - iou) + np.minimum(center_dist, 1.0), INVALID_COST)
+        rows, cols = linear_sum_assignment(cost)
+
+        keep = valid[rows, cols]
+        return list(zip(rows[keep].tolist(), cols[keep].tolist()))
+
+    def _track_infos(self, slots: np.ndarray, current_time: float) -> List[Dict]:
+        """Per-slot summaries, statistics computed for all slots in one pass."""
+        store = self.store
+        confidence = store.average(store.confidences, slots)
+        distance = store.average(store.distances, slots)
+        velocity = store.velocity(slots)
+        radial_velocity = store.radial_velocity[slots]
+        ttc = store.time_to_collision[slots]
+        approaching = radial_velocity < -self.min_approach_speed
+
+        return [
+            {
+                'track_id': f"track_{store.track_ids[slot]}",
+                'name': store.class_names[slot],  # ✅ Fixed: return 'name' not 'class_name'
+                'confidence': float(confidence[i]),
+                'distance': float(distance[i]),
+                'stability': float(store.stability[slot]),
+                'is_approaching': bool(approaching[i]),
+                'velocity': velocity[i].tolist(),
+                'radial_velocity': None if np.isnan(radial_velocity[i]) else float(radial_velocity[i]),
+                'time_to_collision': float(ttc[i]) if np.isfinite(ttc[i]) else None,
+                'detection_count': int(store.detection_count[slot]),
+                'age': current_time - float(store.first_seen[slot]),
+                'confirmed': bool(store.detection_count[slot] >= self.min_detections)
+            }
+            for i, slot in enumerate(slots.tolist())
+        ]
+
     def update(self, detections: List[Dict]) -> List[Dict]:
         """
         Update tracker with new detections.
-        
+
         Args:
             detections: List of detected objects with keys:
-                - class_name: str
+                - name: str
                 - bbox: [x_min, y_min, x_max, y_max]
                 - confidence: float
                 - distance: float
-        
+
         Returns:
-            List of tracked objects (filtered and smoothed)
+            Track info per detection, in the same order as `detections`
+            (track_id, stability, is_approaching, velocity, radial_velocity,
+            time_to_collision, confirmed, ...)
         """
         current_time = time.time()
-        
-        # Match detections to existing tracks
-        matched_tracks = set()
-        matched_detections = set()
-        
-        for det_idx, detection in enumerate(detections):
-            best_match_id = None
-            best_match_score = 0.0
-            
-            bbox = detection.get('bbox', [0, 0, 0, 0])
-            bbox_center = self._get_bbox_center(bbox)
-            class_name = detection.get('name', 'unknown')  # ✅ Fixed: 'name' not 'class_name'
-            
-            # Find best matching track
-            for track_id, track in self.tracked_objects.items():
-                if track_id in matched_tracks:
-                    continue
-                
-                # Must be same class
-                if track.class_name != class_name:
-                    continue
-                
-                # Check position distance
-                if track.positions:
-                    last_pos = track.positions[-1]
-                    distance = self._euclidean_distance(bbox_center, last_pos)
-                    
-                    if distance < self.position_threshold:
-                        # Use distance as matching score (closer = better)
-                        score = 1.0 - (distance / self.position_threshold)
-                        
-                        if score > best_match_score:
-                            best_match_score = score
-                            best_match_id = track_id
-            
-            # Update matched track or create new one
-            if best_match_id is not None and best_match_score > 0.5:
-                # Update existing track
-                track = self.tracked_objects[best_match_id]
-                track.update(
-                    bbox_center,
-                    detection.get('confidence', 0.0),
-                    detection.get('distance', 0.0)
-                )
-                matched_tracks.add(best_match_id)
-                matched_detections.add(det_idx)
-                
-            else:
-                # Create new track
-                new_id = f"track_{self.next_id}"
-                self.next_id += 1
-                
-                new_track = TrackedObject(
-                    object_id=new_id,
-                    class_name=class_name,
-                    first_seen=current_time,
-                    last_seen=current_time
-                )
-                new_track.update(
-                    bbox_center,
-                    detection.get('confidence', 0.0),
-                    detection.get('distance', 0.0)
-                )
-                
-                self.tracked_objects[new_id] = new_track
-                matched_detections.add(det_idx)
-        
+        store = self.store
+
+        # Predict every track forward one frame
+        track_slots = store.slots
+        track_boxes = store.predict(track_slots)
+
+        det_boxes = np.array([d.get('bbox', [0, 0, 0, 0]) for d in detections], dtype=np.float64).reshape(-1, 4)
+        det_classes = [d.get('name', 'unknown') for d in detections]  # ✅ Fixed: 'name' not 'class_name'
+
+        matches = self._associate(det_boxes, det_classes, track_boxes, store.class_names[track_slots].tolist())
+
+        det_slots = np.full(len(detections), -1, dtype=np.int64)
+        for det_idx, track_idx in matches:
+            det_slots[det_idx] = track_slots[track_idx]
+
+        matched = det_slots >= 0
+        if matched.any():
+            store.correct(det_slots[matched], det_boxes[matched])
+
+        # New tracks for unmatched detections
+        unmatched = np.flatnonzero(~matched)
+        if len(unmatched):
+            new_slots = store.allocate_slots(len(unmatched))
+            count = len(new_slots)
+            store.reset_slots(new_slots, np.arange(self.next_id, self.next_id + count), current_time)
+            self.next_id += count
+            for slot, det_idx in zip(new_slots.tolist(), unmatched.tolist()):
+                store.class_names[slot] = det_classes[det_idx]
+            store.init_kalman(new_slots, det_boxes[unmatched])
+            det_slots[unmatched] = new_slots
+
+        if len(detections):
+            distances = np.array([d.get('distance', 0.0) for d in detections], dtype=np.float64)
+            store.push(
+                det_slots,
+                (det_boxes[:, :2] + det_boxes[:, 2:]) / 2,
+                np.array([d.get('confidence', 0.0) for d in detections]),
+                distances,
+                current_time
+            )
+            store.update_stability(det_slots)
+            store.update_range(det_slots, distances, det_boxes, current_time)
+
         # Remove old tracks
-        expired_tracks = []
-        for track_id, track in self.tracked_objects.items():
-            age = current_time - track.last_seen
-            if age > self.max_age:
-                expired_tracks.append(track_id)
-        
-        for track_id in expired_tracks:
-            del self.tracked_objects[track_id]
-        
-        # Build output: only confirmed tracks
-        confirmed_objects = []
-        for track in self.tracked_objects.values():
-            # Must have minimum detections to be confirmed
-            if track.detection_count >= self.min_detections:
-                confirmed_objects.append({
-                    'track_id': track.object_id,
-                    'name': track.class_name,  # ✅ Fixed: return 'name' not 'class_name'
-                    'confidence': track.get_average_confidence(),
-                    'distance': track.get_average_distance(),
-                    'stability': track.stability,
-                    'is_approaching': track.is_moving_towards_camera(),
-                    'detection_count': track.detection_count,
-                    'age': current_time - track.first_seen
-                })
-        
+        self._expire(current_time)
+
+        results = self._track_infos(det_slots, current_time)
+
         logger.debug(
-            f"Tracking: {len(detections)} detections → "
-            f"{len(confirmed_objects)} confirmed objects "
-            f"(total tracks: {len(self.tracked_objects)})"
+            f"Tracking: {len(detections)} detections, {len(matches)} matched "
+            f"(total tracks: {self.num_tracks})"
         )
-        
-        # ✅ Proactive cleanup if too many tracks
-        if len(self.tracked_objects) > 50:
-            self._cleanup_old_tracks()
-        
-        return confirmed_objects
-    
-    def _cleanup_old_tracks(self):
-        """Cleanup old tracks to prevent memory leak."""
-        current_time = time.time()
-        removed = 0
-        
-        # Remove tracks older than max_age
-        expired = [
-            track_id for track_id, track in self.tracked_objects.items()
-            if (current_time - track.last_seen) > self.max_age
-        ]
-        
-        for track_id in expired:
-            del self.tracked_objects[track_id]
-            removed += 1
-        
-        if removed > 0:
-            logger.info(f"Cleaned up {removed} old tracks (total: {len(self.tracked_objects)})")
-    
+
+        return results
+
+    def get_confirmed_objects(self) -> List[Dict]:
+        """Get all confirmed tracks (tracks with at least min_detections)."""
+        slots = self.store.slots
+        slots = slots[self.store.detection_count[slots] >= self.min_detections]
+        return self._track_infos(slots, time.time())
+
+    def _expire(self, current_time: float) -> int:
+        """Free the slots of tracks not seen for max_age seconds."""
+        slots = self.store.slots
+        expired = slots[current_time - self.store.last_seen[slots] > self.max_age]
+        self.store.release(expired)
+        return len(expired)
+
     def get_critical_objects(self) -> List[Dict]:
         """Get list of critical objects that are approaching."""
-        critical = []
-        for track in self.tracked_objects.values():
-            if track.detection_count >= self.min_detections:
-                if track.is_moving_towards_camera():
-                    critical.append({
-                        'track_id': track.object_id,
-                        'name': track.class_name,  # ✅ Fixed
-                        'distance': track.get_average_distance(),
-                        'approaching': True
-                    })
-        return critical
-    
+        return [
+            {
+                'track_id': info['track_id'],
+                'name': info['name'],  # ✅ Fixed
+                'distance': info['distance'],
+                'time_to_collision': info['time_to_collision'],
+                'approaching': True
+            }
+            for info in self.get_confirmed_objects()
+            if info['is_approaching']
+        ]
+
     def reset(self):
         """Reset all tracking state."""
-        self.tracked_objects.clear()
+        self.store.clear()
         self.next_id = 0
         logger.info("Tracking state reset")
 
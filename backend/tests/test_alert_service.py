@@ -139,3 +139,74 @@ class TestAlertService:
         # Should trigger warning
         assert result['alert_level'] in [AlertLevel.DANGER, AlertLevel.NEAR]
         assert len(result['warnings']) > 0
+    
+    def test_single_pass_matches_masks(self):
+        """Zone statistics agree with per-region boolean masks, including NaN/Inf pixels."""
+        service = AlertService()
+        
+        rng = np.random.default_rng(0)
+        depth_map = rng.uniform(0.0, 4.0, (61, 97)).astype(np.float32)
+        depth_map[rng.integers(0, 61, 30), rng.integers(0, 97, 30)] = np.nan
+        depth_map[rng.integers(0, 61, 10), rng.integers(0, 97, 10)] = np.inf
+        depth_map[5, 5] = service.min_distance
+        
+        result = service.analyze_depth(depth_map)
+        valid = depth_map[np.isfinite(depth_map)]
+        
+        assert result['distance_stats']['min'] == float(valid.min())
+        assert result['distance_stats']['max'] == float(valid.max())
+        assert result['distance_stats']['avg'] == pytest.approx(float(valid.mean()), rel=1e-6)
+        assert result['area_percentages']['danger'] == float(np.sum(depth_map < service.min_distance) / depth_map.size) * 100
+        
+        third = depth_map.shape[1] // 3
+        regions = {
+            'left': depth_map[:, :third],
+            'center': depth_map[:, third:2 * third],
+            'right': depth_map[:, 2 * third:]
+        }
+        for name, region in regions.items():
+            regional = result['regional_alerts'][name]
+            near = (region >= service.min_distance) & (region < service.warning_distance)
+            assert regional['min_distance'] == float(region[np.isfinite(region)].min())
+            assert regional['near_percentage'] == float(np.sum(near) / region.size) * 100
+    
+    def test_overlapping_zones(self):
+        """Rect, polygon and grid zones may overlap; each matches its own mask."""
+        from services.alert_zones import expand_zones, zone_mask
+        
+        service = AlertService()
+        service.zone_specs = [
+            {'name': 'grid', 'grid': [3, 3]},
+            {'name': 'corridor', 'polygon': [[0.4, 0.55], [0.6, 0.55], [0.85, 1.0], [0.15, 1.0]]},
+            {'name': 'head', 'rect': [0.25, 0.0, 0.75, 0.25]}
+        ]
+        
+        rng = np.random.default_rng(1)
+        depth_map = rng.uniform(0.0, 4.0, (120, 160)).astype(np.float32)
+        result = service.analyze_depth(depth_map)
+        
+        specs = expand_zones(service.zone_specs)
+        assert [zone['name'] for zone in result['zones']] == [spec['name'] for spec in specs]
+        assert result['regional_alerts'] is None
+        
+        for spec, zone in zip(specs, result['zones']):
+            values = depth_map[zone_mask(spec, depth_map.shape)]
+            assert zone['min_distance'] == float(values.min())
+            assert zone['avg_distance'] == pytest.approx(float(values.mean()), rel=1e-6)
+            assert zone['danger_percentage'] == float(np.sum(values < service.min_distance) / values.size) * 100
+    
+    @pytest.mark.parametrize("width", [480, 640, 720])
+    def test_thirds_match_integer_split(self, width):
+        """left/center/right from config split at width // 3 and 2 * width // 3."""
+        from core.config import get_settings
+        from services.alert_zones import zone_mask
+        
+        specs = {spec['name']: spec for spec in get_settings().alert_zones}
+        edges = {
+            name: np.flatnonzero(zone_mask(specs[name], (4, width))[0])[[0, -1]]
+            for name in ('left', 'center', 'right')
+        }
+        
+        assert list(edges['left']) == [0, width // 3 - 1]
+        assert list(edges['center']) == [width // 3, 2 * width // 3 - 1]
+        assert list(edges['right']) == [2 * width // 3, width - 1]
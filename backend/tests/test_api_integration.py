@@ -15,6 +15,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from fastapi.testclient import TestClient
 from main import app
+from routers import analyze, contextual_assistant, frames
 
 
 @pytest.fixture
@@ -23,6 +24,13 @@ def client():
     return TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limits():
+    """Start every test with empty rate-limit counters, whatever ran just before it."""
+    for router_module in (analyze, contextual_assistant, frames):
+        router_module.limiter.reset()
+
+
 @pytest.fixture
 def sample_image_file():
     """Create a sample image file for testing."""
@@ -64,6 +72,41 @@ class TestAnalyzeEndpoint:
         # Should reject non-image content type
         assert response.status_code in [400, 422]
     
+    def test_raw_frame_size_mismatch(self, client):
+        """Raw frame whose length does not match its headers is rejected."""
+        response = client.post(
+            "/api/analyze",
+            files={"image": ("frame.nv21", b"\x00" * 100, "application/octet-stream")},
+            headers={"X-Frame-Format": "nv21", "X-Frame-Width": "640", "X-Frame-Height": "480"}
+        )
+        assert response.status_code == 400
+    
+    def test_raw_body_invalid_content_type(self, client):
+        """Raw body route only takes image/jpeg, image/png and octet-stream bodies."""
+        response = client.post(
+            "/api/analyze-raw",
+            content=b"not_an_image",
+            headers={"Content-Type": "text/plain"}
+        )
+        assert response.status_code == 400
+    
+    def test_raw_body_too_large(self, client):
+        """Raw body over 10MB is rejected with 413."""
+        response = client.post(
+            "/api/analyze-raw",
+            content=b"\x00" * (10 * 1024 * 1024 + 1),
+            headers={"Content-Type": "application/octet-stream"}
+        )
+        assert response.status_code == 413
+    
+    def test_depth_grid_invalid_encoding(self, client):
+        """Unknown depth grid encoding is rejected before any inference."""
+        response = client.post(
+            "/api/analyze?depth_grid=true&depth_grid_encoding=png",
+            files={"image": ("test.jpg", b"fake", "image/jpeg")}
+        )
+        assert response.status_code == 400
+    
     def test_rate_limiting(self, client):
         """Test rate limiting (5 requests/second)."""
         # Note: This is a basic test. Real rate limiting test would be more complex
@@ -100,6 +143,20 @@ class TestHealthEndpoint:
         assert isinstance(data, dict)
         assert 'status' in data
         assert isinstance(data['status'], str)
+    
+    def test_health_lists_raw_formats(self, client):
+        """Health endpoint advertises the raw frame formats."""
+        data = client.get("/health").json()
+        assert 'nv21' in data['input_formats']['raw']
+
+
+class TestFramesEndpoint:
+    """Test suite for deferred depth visualizations."""
+    
+    def test_unknown_frame(self, client):
+        """Unknown or expired frame ids return 404."""
+        response = client.get("/api/frames/unknown/depth.jpg")
+        assert response.status_code == 404
 
 
 class TestDocsEndpoint:
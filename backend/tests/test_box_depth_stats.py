@@ -0,0 +1,59 @@
+"""
+Unit tests for per-box depth statistics.
+"""
+
+import pytest
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.box_depth_stats import box_distances, box_means, crop_rects, integral_image
+
+
+@pytest.fixture
+def person_in_front_of_wall():
+    """Wall at 4m with a 'person' at 1.5m that has a gap (background) at its centre."""
+    depth = np.full((480, 640), 4.0, dtype=np.float32)
+    depth[100:400, 250:390] = 1.5
+    depth[230:400, 310:330] = 4.0  # gap between the legs, through the box centre
+    box = np.array([[250, 100, 390, 400]], dtype=np.float32)
+    return depth, box
+
+
+class TestBoxDepthStats:
+    """Test suite for box_depth_stats."""
+    
+    def test_box_means_match_numpy(self, sample_depth_map):
+        """Summed-area table means equal direct crop means."""
+        boxes = np.array([[0, 0, 640, 480], [10.5, 20.2, 200.7, 300.1], [600, 450, 700, 600]], dtype=np.float32)
+        rects = crop_rects(boxes, sample_depth_map.shape, crop=0.5)
+        means = box_means(integral_image(sample_depth_map), rects)
+        
+        for (x0, y0, x1, y1), mean in zip(rects, means):
+            assert mean == pytest.approx(sample_depth_map[y0:y1, x0:x1].mean(), rel=1e-5)
+    
+    def test_center_matches_single_sample(self, sample_depth_map):
+        """The 'center' method is the previous single-pixel sample."""
+        boxes = np.array([[100, 100, 301, 251], [-50, -50, 10, 10]], dtype=np.float32)
+        distances = box_distances(sample_depth_map, boxes, method='center')
+        
+        assert distances[0] == sample_depth_map[175, 200]
+        assert distances[1] == sample_depth_map[0, 0]
+    
+    def test_robust_methods_ignore_gap(self, person_in_front_of_wall):
+        """Centre sample hits the background, crop statistics find the person."""
+        depth, box = person_in_front_of_wall
+        
+        assert box_distances(depth, box, method='center')[0] == 4.0
+        assert box_distances(depth, box, method='min')[0] == pytest.approx(1.5, abs=0.1)
+        assert box_distances(depth, box, method='percentile', percentile=20)[0] == pytest.approx(1.5, abs=0.1)
+        assert box_distances(depth, box, method='mean')[0] < 4.0
+    
+    def test_empty_and_unknown(self, sample_depth_map):
+        """No boxes gives an empty result; unknown methods raise."""
+        assert box_distances(sample_depth_map, np.zeros((0, 4), dtype=np.float32), method='percentile').shape == (0,)
+        
+        with pytest.raises(ValueError):
+            box_distances(sample_depth_map, np.array([[0, 0, 10, 10]], dtype=np.float32), method='median')
@@ -0,0 +1,66 @@
+"""
+Unit tests for the coarse depth grid.
+"""
+
+import base64
+
+import pytest
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.depth_grid import depth_grid, encode_depth_grid, uint8_step
+
+
+@pytest.fixture
+def depth_map():
+    return np.full((480, 640), 4.0, dtype=np.float32)
+
+
+def decode(packed):
+    """Response dict -> (rows, cols) float32 meters."""
+    dtype = '<f2' if packed['encoding'] == 'float16' else np.uint8
+    values = np.frombuffer(base64.b64decode(packed['data']), dtype=dtype)
+    return values.astype(np.float32).reshape(packed['rows'], packed['cols']) * packed['scale']
+
+
+class TestDepthGrid:
+    """Test suite for depth_grid / encode_depth_grid."""
+
+    def test_close_obstacle_shows_in_its_cell(self, depth_map):
+        """A small near object sets the minimum of the cell it falls in only."""
+        depth_map[100:120, 400:420] = 0.8
+        grid = depth_grid(depth_map, 12, 16)
+
+        assert grid.shape == (12, 16)
+        assert grid[2, 10] < 1.0
+        grid[2, 10] = 4.0
+        assert np.allclose(grid, 4.0)
+
+    def test_single_pixel_outlier_is_ignored(self, depth_map):
+        """One noisy pixel does not turn a cell into an obstacle."""
+        depth_map[200, 300] = 0.1
+        assert depth_grid(depth_map, 12, 16).min() > 3.5
+
+    @pytest.mark.parametrize("encoding, size, tolerance", [
+        ('float16', 16 * 12 * 2, 0.01),
+        ('uint8', 16 * 12, 0.01),
+    ])
+    def test_encoding_round_trip(self, encoding, size, tolerance):
+        """Both encodings decode back to the grid within their precision."""
+        grid = np.linspace(0.3, 5.0, 16 * 12, dtype=np.float32).reshape(12, 16)
+        packed = encode_depth_grid(grid, encoding, max_depth=5.0)
+
+        assert len(base64.b64decode(packed['data'])) == size
+        assert np.abs(decode(packed) - grid).max() <= tolerance + 1e-6
+
+    def test_uint8_step_is_whole_centimetres(self):
+        """The uint8 step covers max_depth in 255 units."""
+        assert uint8_step(5.0) == 0.02
+        assert uint8_step(10.0) * 255 >= 10.0
+
+    def test_unknown_encoding(self, depth_map):
+        with pytest.raises(ValueError):
+            encode_depth_grid(depth_grid(depth_map, 12, 16), 'png', max_depth=5.0)
@@ -0,0 +1,151 @@
+"""
+Unit tests for Depth Anything V2 tiers and their routing from the analyze pipeline.
+"""
+
+import pytest
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.config import get_settings
+from routers import analyze
+from services import depth_service_v2
+from services.depth_service_v2 import DepthServiceV2
+
+
+@pytest.fixture
+def service():
+    service = DepthServiceV2()
+    service.is_loaded = True
+    service.tiers_used = []
+
+    def estimate(image, target_size=None, tier=None):
+        service.tiers_used.append(tier)
+        return np.full(image.shape[:2], 0.5, dtype=np.float32)
+
+    service.estimate = estimate
+    return service
+
+
+class FullModel:
+    """Relative model stand-in; the fast tier must not run it."""
+
+    pretrained = 'shared-encoder'
+
+    def infer_image(self, image, merge_ratio=0.0):
+        raise AssertionError("full model used for the shallow tier")
+
+
+class ShallowMetricModel:
+    """Metric DepthAnythingV2 stand-in: far (20 m) at the top, near (1 m) at the bottom."""
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.layer_idx = [1, 3, 5, 7]
+        self.pretrained = None
+        self.head_state = None
+
+        class Head:
+            def load_state_dict(head, state):
+                self.head_state = state
+
+        self.depth_head = Head()
+
+    def eval(self):
+        return self
+
+    def infer_image(self, image, merge_ratio=0.0):
+        height, width = image.shape[:2]
+        return np.repeat(np.linspace(20.0, 1.0, height)[:, None], width, axis=1).astype(np.float32)
+
+
+@pytest.fixture
+def shallow_service(tmp_path, monkeypatch):
+    head_path = tmp_path / "shallow_head.pth"
+    head_path.touch()
+    settings = get_settings()
+    monkeypatch.setattr(settings, 'depth_tiers', {
+        **settings.depth_tiers,
+        'fast': {'shallow': True, 'head_checkpoint': str(head_path), 'max_depth': 20.0},
+    })
+    monkeypatch.setattr(depth_service_v2, 'METRIC_DEPTH_AVAILABLE', True)
+    monkeypatch.setattr(depth_service_v2, 'MetricDepthAnythingV2', ShallowMetricModel, raising=False)
+    # train.py checkpoint: DDP state dict of the whole model under 'model'
+    monkeypatch.setattr(depth_service_v2.torch, 'load', lambda path, map_location=None: {
+        'model': {'module.depth_head.scratch.output_conv2.0.weight': 'head', 'module.pretrained.blocks.0': 'encoder'}
+    }, raising=False)
+
+    service = DepthServiceV2()
+    service.model = FullModel()
+    service.is_loaded = True
+    return service
+
+
+class TestShallowTier:
+    """The fast tier runs the shallow metric head on the shared encoder."""
+
+    def test_fast_tier_uses_shallow_model(self, shallow_service):
+        depth = shallow_service.estimate(np.zeros((48, 64, 3), dtype=np.uint8), tier='fast')
+
+        model = shallow_service.tier_models['fast']
+        assert isinstance(model, ShallowMetricModel)
+        assert model.kwargs['shallow'] and model.kwargs['max_depth'] == 20.0
+        assert model.kwargs['encoder'] == shallow_service.model_type
+        assert model.pretrained == 'shared-encoder'
+        assert model.head_state == {'scratch.output_conv2.0.weight': 'head'}
+
+        # Metric depth converted to normalized disparity: near (bottom) = 1, far (top) = 0
+        assert depth.shape == (48, 64)
+        assert depth[-1].min() > 0.99 and depth[0].max() < 0.01
+
+    def test_missing_head_falls_back_to_full_model(self, shallow_service, monkeypatch):
+        monkeypatch.setattr(shallow_service.settings, 'depth_tiers', {'fast': {'shallow': True, 'head_checkpoint': 'missing.pth'}})
+        assert shallow_service._get_tier_model('fast', shallow_service.get_tier_config('fast')) is shallow_service.model
+        assert 'fast' not in shallow_service.metric_tiers
+
+
+class TestDepthTierRouting:
+    """Depth tiers are selectable per request when Depth Anything V2 is enabled."""
+
+    def test_resolve_tier(self, service):
+        """Unknown or missing tiers fall back to the configured default."""
+        assert service.resolve_tier('fast') == 'fast'
+        assert service.resolve_tier(None) == service.settings.depth_tier
+        assert service.resolve_tier('no-such-tier') == service.settings.depth_tier
+
+    def test_pipeline_uses_requested_tier(self, service, monkeypatch):
+        """With use_depth_anything_v2 the requested tier reaches estimate() and the metadata."""
+        settings = get_settings()
+        monkeypatch.setattr(settings, 'use_depth_anything_v2', True)
+        monkeypatch.setattr(analyze, 'get_depth_service_v2', lambda: service)
+        image = np.zeros((48, 64, 3), dtype=np.uint8)
+
+        depth_map, info = analyze._estimate_depth(image, 'fast')
+
+        assert service.tiers_used == ['fast']
+        assert info == {'model': 'depth_anything_v2', 'tier': 'fast'}
+        # Normalized disparity 0.5 -> halfway between max_depth and min_depth, in meters
+        expected = settings.max_depth - 0.5 * (settings.max_depth - settings.min_depth)
+        assert depth_map.shape == (48, 64) and np.allclose(depth_map, expected)
+
+        depth_map, info = analyze._estimate_depth(image, 'no-such-tier')
+        assert info['tier'] == settings.depth_tier
+
+    def test_pipeline_defaults_to_midas(self, monkeypatch):
+        """Without the flag MiDaS serves the frame and no depth tier is reported."""
+        monkeypatch.setattr(get_settings(), 'use_depth_anything_v2', False)
+
+        class MiDaS:
+            model_type = 'MiDaS_small'
+
+            def estimate(self, image):
+                return np.ones(image.shape[:2], dtype=np.float32)
+
+        monkeypatch.setattr(analyze, 'get_depth_service', lambda: MiDaS())
+
+        depth_map, info = analyze._estimate_depth(np.zeros((48, 64, 3), dtype=np.uint8), 'fast')
+
+        assert info == {'model': 'MiDaS_small', 'tier': None}
+        assert depth_map.shape == (48, 64)
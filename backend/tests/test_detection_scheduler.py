@@ -0,0 +1,109 @@
+"""
+Unit tests for keyframe detection scheduling.
+"""
+
+import pytest
+import numpy as np
+import cv2
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.object_detection_service import ObjectDetectionService
+from services.detection_scheduler import DetectionScheduler
+
+
+@pytest.fixture
+def textured_frame():
+    """Smooth random texture that optical flow can lock onto."""
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 255, (480, 640), dtype=np.uint8)
+    blurred = cv2.GaussianBlur(noise, (0, 0), 3)
+    return cv2.cvtColor(cv2.normalize(blurred, None, 0, 255, cv2.NORM_MINMAX), cv2.COLOR_GRAY2BGR)
+
+
+@pytest.fixture
+def scheduler():
+    service = ObjectDetectionService()
+    service._build_class_tables({0: 'person'})
+    service.detect_calls = 0
+    
+    def detect_boxes(image, confidence_threshold=0.5, tier=None):
+        service.detect_calls += 1
+        return np.array([[200, 150, 300, 350, 0.9, 0]], dtype=np.float32)
+    
+    service.detect_boxes = detect_boxes
+    
+    scheduler = DetectionScheduler(service)
+    scheduler.config = {
+        'enabled': True, 'keyframe_interval': 3, 'min_interval': 1, 'max_interval': 6,
+        'scene_change_threshold': 40.0, 'motion_low': 0.5, 'motion_high': 10.0,
+        'flow_grid': 5, 'session_ttl': 30.0
+    }
+    return scheduler
+
+
+class TestDetectionScheduler:
+    """Test suite for DetectionScheduler."""
+    
+    def test_without_session_every_frame_is_detected(self, scheduler, textured_frame):
+        """No session id: the detector runs on every frame."""
+        scheduler.detection_service.detect = lambda *args, **kwargs: [{'name': 'person'}]
+        
+        for _ in range(3):
+            detections, info = scheduler.process(None, textured_frame)
+            assert info['keyframe'] is True
+            assert detections[0]['source'] == 'detected'
+    
+    def test_boxes_follow_motion_between_keyframes(self, scheduler, textured_frame):
+        """Predicted boxes move with the image; the detector only runs on keyframes."""
+        detections, info = scheduler.process('s1', textured_frame)
+        assert info['keyframe'] and detections[0]['source'] == 'detected'
+        
+        shifted = np.roll(textured_frame, 8, axis=1)  # 8 px to the right
+        detections, info = scheduler.process('s1', shifted)
+        
+        assert not info['keyframe']
+        assert scheduler.detection_service.detect_calls == 1
+        assert detections[0]['source'] == 'predicted'
+        assert detections[0]['bbox'][0] == pytest.approx(208, abs=1.5)
+        assert detections[0]['bbox'][2] == pytest.approx(308, abs=1.5)
+    
+    def test_scene_change_forces_keyframe(self, scheduler, textured_frame):
+        """An abrupt scene change re-runs the detector immediately."""
+        scheduler.process('s1', textured_frame)
+        
+        detections, info = scheduler.process('s1', np.zeros_like(textured_frame))
+        
+        assert info['keyframe']
+        assert info['interval'] == 1
+        assert scheduler.detection_service.detect_calls == 2
+    
+    def test_interval_recovers_after_scene_change(self, scheduler, textured_frame):
+        """After a cut the interval drops to 1, then grows again while the scene is static."""
+        scheduler.process('s1', textured_frame)
+        scheduler.process('s1', np.zeros_like(textured_frame))
+        
+        intervals = [scheduler.process('s1', textured_frame)[1]['interval']]
+        keyframes = []
+        for _ in range(12):
+            detections, info = scheduler.process('s1', textured_frame)
+            intervals.append(info['interval'])
+            keyframes.append(info['keyframe'])
+        
+        assert intervals[-1] > 1
+        assert not all(keyframes)
+    
+    def test_lost_boxes_force_keyframe(self, scheduler, textured_frame):
+        """Losing most tracked boxes schedules a re-detection on the next frame."""
+        scheduler.process('s1', textured_frame)
+        
+        # Untrackable frame: no points survive the forward-backward check
+        noise = np.random.default_rng(1).integers(0, 255, textured_frame.shape, dtype=np.uint8)
+        scheduler.config['scene_change_threshold'] = 255.0
+        detections, info = scheduler.process('s1', noise)
+        
+        assert not info['keyframe'] and detections == []
+        assert scheduler.sessions['s1'].force_keyframe
+        assert scheduler.process('s1', noise)[1]['keyframe']
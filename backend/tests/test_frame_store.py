@@ -0,0 +1,64 @@
+"""
+Unit tests for the deferred visualization frame store.
+"""
+
+import pytest
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import services.frame_store as frame_store_module
+from services.frame_store import FrameStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(frame_store_module.time, "time", lambda: now[0])
+    return now
+
+
+def depth():
+    return np.zeros((4, 4), dtype=np.uint8)
+
+
+class TestFrameStore:
+    """Test suite for FrameStore."""
+
+    def test_frames_expire_after_ttl(self, clock):
+        """A frame is retrievable until ttl_s has passed."""
+        store = FrameStore(ttl_s=10.0, max_frames=8)
+        frame_id = store.put(depth(), "SAFE", {"min": 1.0})
+
+        clock[0] += 9.0
+        assert store.get(frame_id) is not None
+        clock[0] += 2.0
+        assert store.get(frame_id) is None
+        assert len(store) == 0
+
+    def test_oldest_frames_evicted_beyond_capacity(self, clock):
+        """The store never holds more than max_frames."""
+        store = FrameStore(ttl_s=10.0, max_frames=3)
+        frame_ids = [store.put(depth(), "SAFE", {}) for _ in range(5)]
+
+        assert len(store) == 3
+        assert store.get(frame_ids[0]) is None and store.get(frame_ids[1]) is None
+        assert all(store.get(frame_id) is not None for frame_id in frame_ids[2:])
+
+    def test_render_once_per_colormap(self, clock):
+        """The renderer runs on the first fetch of each colormap only."""
+        store = FrameStore()
+        frame_id = store.put(depth(), "SAFE", {})
+        calls = []
+
+        def renderer(frame, colormap):
+            calls.append(colormap)
+            return colormap.encode()
+
+        assert store.render(frame_id, "JET", renderer) == b"JET"
+        assert store.render(frame_id, "JET", renderer) == b"JET"
+        assert store.render(frame_id, "MAGMA", renderer) == b"MAGMA"
+        assert calls == ["JET", "MAGMA"]
+        assert store.render("unknown", "JET", renderer) is None
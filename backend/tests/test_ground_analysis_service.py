@@ -0,0 +1,131 @@
+"""
+Unit tests for the ground analysis service.
+"""
+
+import pytest
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.ground_analysis_service import GroundAnalysisService
+from services.ground_plane import focal_from_fov
+
+
+def loop_discontinuities(service, ground_region):
+    """Row-by-row reference: (row, depth change, changed columns) per feature row."""
+    height, width = ground_region.shape
+    threshold = service.depth_change_threshold * np.std(ground_region)
+    rows = []
+    for row in range(1, height):
+        columns = np.where(np.abs(ground_region[row] - ground_region[row - 1]) > threshold)[0]
+        if len(columns) > service.min_feature_size / width:
+            change = np.mean(ground_region[row, columns]) - np.mean(ground_region[row - 1, columns])
+            rows.append((row, float(change), len(columns)))
+    return rows
+
+
+def staircase(height=480, width=640, step_rows=40):
+    """Ground getting closer towards the bottom, in flat treads with sharp risers."""
+    rows = np.arange(height)
+    depth = 1.0 - 0.1 * (rows // step_rows)
+    return np.repeat(depth[:, None], width, axis=1).astype(np.float32)
+
+
+def level_ground(height=480, width=640, camera_height=1.4, pitch_deg=30.0, hfov_deg=65.0):
+    """Metric depth of flat ground seen from a camera at camera_height, pitched down by pitch_deg."""
+    focal = focal_from_fov(width, hfov_deg)
+    pitch = np.radians(pitch_deg)
+    ray_y = (np.arange(height) - height / 2) / focal
+    # Ray (x, y, 1) hits the ground where its height drop y*cos + sin reaches camera_height
+    drop = ray_y * np.cos(pitch) + np.sin(pitch)
+    depth = np.where(drop > 0, camera_height / np.maximum(drop, 1e-6), 50.0)
+    return np.repeat(np.minimum(depth, 50.0)[:, None], width, axis=1).astype(np.float32)
+
+
+class TestGroundAnalysisService:
+    """Test suite for GroundAnalysisService."""
+
+    def test_discontinuities_match_row_loop(self):
+        """Vectorized discontinuities agree with a row-by-row scan."""
+        service = GroundAnalysisService(min_feature_size=50)
+        rng = np.random.default_rng(0)
+        ground_region = rng.normal(0.5, 0.05, (120, 160)).astype(np.float32)
+        ground_region[40:] += 0.3
+        ground_region[80:, :100] -= 0.5
+
+        features = service._find_depth_discontinuities(ground_region, start_row=10)
+        reference = loop_discontinuities(service, ground_region)
+
+        assert len(features) == len(reference) > 0
+        for feature, (row, change, count) in zip(features, reference):
+            assert feature['row'] == 10 + row
+            assert feature['depth_change'] == pytest.approx(change, abs=1e-5)
+            assert feature['width_percentage'] == pytest.approx(count / 160)
+
+    def test_stairs_from_step_runs(self):
+        """Evenly spaced risers are one step each, whatever their thickness."""
+        service = GroundAnalysisService()
+        result = service.analyze(staircase())
+
+        assert result['stairs_detected']
+        assert result['stairs_info']['avg_spacing'] == pytest.approx(40)
+        assert result['stairs_info']['num_steps'] == len(result['features'])
+
+    def test_thick_edge_is_not_stairs(self):
+        """Consecutive rows of a single blurred edge form one run, not a staircase."""
+        service = GroundAnalysisService()
+        depth = np.full((480, 640), 0.8, dtype=np.float32)
+        depth[300:304] = np.array([0.65, 0.5, 0.35, 0.2])[:, None]
+        depth[304:] = 0.2
+
+        result = service.analyze(depth)
+
+        assert len(result['features']) > 2
+        assert not result['stairs_detected']
+
+    def test_latency_budget(self):
+        """Over budget, only every probe_interval-th frame is analyzed."""
+        service = GroundAnalysisService(budget_ms=5.0, probe_interval=3)
+        assert service.within_budget()
+
+        service.avg_time_ms = 20.0
+        decisions = [service.within_budget() for _ in range(6)]
+        assert decisions == [False, False, True, False, False, True]
+
+        service.avg_time_ms = 1.0
+        assert service.within_budget()
+
+    def test_probe_resets_budget_average(self):
+        """One slow frame turns analysis off only until the next fast probe."""
+        service = GroundAnalysisService(budget_ms=5.0, probe_interval=3)
+        service._record_time(1.0)
+        service._record_time(50.0)
+        assert service.avg_time_ms > 5.0
+
+        decisions = [service.within_budget() for _ in range(3)]
+        assert decisions == [False, False, True]
+
+        service._record_time(1.0)
+        assert service.avg_time_ms == 1.0
+        assert service.within_budget()
+
+    def test_ground_plane_on_level_ground(self):
+        """Camera height and pitch are recovered, and a hole shows up below the plane."""
+        service = GroundAnalysisService(plane_config={'plane_fit': True, 'camera_pitch_deg': 30.0})
+        depth = level_ground()
+
+        plane = service.analyze(depth, depth_range=(0.1, 50.0))['ground_plane']
+        assert plane['camera_height'] == pytest.approx(1.4, abs=0.01)
+        assert plane['pitch_deg'] == pytest.approx(30.0, abs=0.5)
+        assert abs(plane['slope_deg']) < 0.5
+        assert plane['dropoff_ratio'] == 0.0
+
+        # Hole in the lower middle of the frame: 50 cm deeper
+        holed = depth.copy()
+        holed[400:, 200:440] *= (1.4 + 0.5) / 1.4
+        result = service.analyze(holed, depth_range=(0.1, 50.0))
+        assert result['ground_plane']['camera_height'] == pytest.approx(1.4, abs=0.05)
+        assert result['ground_plane']['dropoff_ratio'] > 0.03
+        assert any(w['type'] in ('drop_off', 'hole_or_pit') for w in result['warnings'])
@@ -0,0 +1,86 @@
+"""
+Unit tests for the background ground analysis lane.
+"""
+
+import pytest
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.ground_analysis_service import GroundAnalysisService
+from services.ground_lane import GroundAnalysisLane
+
+
+@pytest.fixture
+def lane():
+    service = GroundAnalysisService()
+    service.analyze_calls = 0
+    service.critical = False
+
+    def analyze(depth_map, depth_range=None):
+        service.analyze_calls += 1
+        warnings = [{'type': 'hole_or_pit', 'severity': 'critical'}] if service.critical else []
+        return {'features': [], 'warnings': warnings, 'ground_hazard_count': len(warnings)}
+
+    service.analyze = analyze
+
+    lane = GroundAnalysisLane(service, config={
+        'enabled': True, 'async_lane': True, 'lane_every_n': 3, 'lane_interval_s': 60.0,
+        'lane_workers': 1, 'lane_max_age_s': 60.0, 'session_ttl': 30.0
+    })
+    yield lane
+    lane.shutdown()
+
+
+@pytest.fixture
+def depth_map():
+    return np.ones((48, 64), dtype=np.float32)
+
+
+class TestGroundAnalysisLane:
+    """Test suite for GroundAnalysisLane."""
+
+    def test_without_session_runs_inline(self, lane, depth_map):
+        """No session id: analysis runs on every frame, in the request."""
+        for _ in range(3):
+            result, info = lane.process(None, depth_map)
+            assert info['mode'] == 'inline' and info['ran']
+        assert lane.ground_service.analyze_calls == 3
+
+    def test_every_nth_frame_in_background(self, lane, depth_map):
+        """Within a session, every N-th frame is analyzed and the cached result is merged with its age."""
+        result, info = lane.process('s1', depth_map)
+        assert info['mode'] == 'async' and info['ran']
+        assert info['age_ms'] is None and result['warnings'] == []
+        lane.flush()
+
+        ran = []
+        for _ in range(6):
+            result, info = lane.process('s1', depth_map)
+            ran.append(info['ran'])
+            assert info['age_ms'] is not None
+            lane.flush()
+
+        assert ran == [False, False, True, False, False, True]
+        assert lane.ground_service.analyze_calls == 3
+
+    def test_critical_result_is_promoted(self, lane, depth_map):
+        """A critical finding reaches the next response and keeps the lane on every frame."""
+        lane.process('s1', depth_map)
+        lane.flush()
+
+        lane.ground_service.critical = True
+        lane.process('s1', depth_map)
+        lane.process('s1', depth_map)
+        lane.process('s1', depth_map)  # Third frame: submitted
+        lane.flush()
+
+        result, info = lane.process('s1', depth_map)
+        assert info['promoted'] and info['ran']
+        assert result['warnings'][0]['severity'] == 'critical'
+        lane.flush()
+
+        result, info = lane.process('s1', depth_map)
+        assert not info['promoted'] and info['ran']
@@ -0,0 +1,134 @@
+"""
+Unit tests for image decoding.
+"""
+
+import pytest
+import numpy as np
+import cv2
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from services.image_service import ImageService, encode_jpeg, jpeg_size, raw_frame_error, reduced_decode_flag
+
+
+def gradient(width, height, brightness=1.0):
+    """Smooth gradient scene of the given size."""
+    x, y = np.meshgrid(np.linspace(0, 255, width), np.linspace(0, 255, height))
+    image = np.stack([x, y, (x + y) / 2], axis=-1)
+    return np.clip(image * brightness, 0, 255).astype(np.uint8)
+
+
+def encoded(width, height, brightness=1.0, ext='.jpg'):
+    """Gradient scene, encoded."""
+    return cv2.imencode(ext, gradient(width, height, brightness))[1].tobytes()
+
+
+def to_nv21(image):
+    """BGR -> NV21 (Y plane, then interleaved V/U at half resolution)."""
+    i420 = cv2.cvtColor(image, cv2.COLOR_BGR2YUV_I420)
+    height, width = image.shape[:2]
+    y = i420[:height]
+    u = i420[height:height + height // 4].reshape(-1)
+    v = i420[height + height // 4:].reshape(-1)
+    vu = np.stack([v, u], axis=-1).reshape(height // 2, width)
+    return np.concatenate([y, vu]).tobytes()
+
+
+class TestImageService:
+    """Test suite for ImageService decoding."""
+
+    def test_jpeg_size_from_header(self):
+        """Frame size is read from the JPEG header; other formats are not parsed."""
+        assert jpeg_size(encoded(1920, 1080)) == (1920, 1080)
+        assert jpeg_size(encoded(64, 48, ext='.png')) is None
+
+    @pytest.mark.parametrize("size, flag", [
+        ((1920, 1080), cv2.IMREAD_REDUCED_COLOR_2),
+        ((4032, 3024), cv2.IMREAD_REDUCED_COLOR_4),
+        ((3024, 4032), cv2.IMREAD_REDUCED_COLOR_4),
+        ((1280, 720), cv2.IMREAD_COLOR),
+        ((640, 480), cv2.IMREAD_COLOR),
+    ])
+    def test_reduction_never_undershoots_target(self, size, flag):
+        """The largest DCT reduction that still covers 640x480 is chosen."""
+        assert reduced_decode_flag(size, (640, 480)) == flag
+
+    def test_reduced_decode_matches_full_decode(self):
+        """A phone-size JPEG decodes to the target size, close to decode-then-resize."""
+        service = ImageService()
+        image_bytes = encoded(1920, 1080)
+
+        image = service.decode_image(image_bytes)
+        reference = cv2.resize(
+            cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR),
+            (service.target_width, service.target_height)
+        )
+
+        assert image.shape == reference.shape
+        assert np.abs(image.astype(np.int16) - reference).mean() < 2.0
+
+    def test_dark_frame_is_enhanced(self):
+        """Frames below the brightness threshold get CLAHE, bright ones are left alone."""
+        service = ImageService()
+
+        dark_bytes = encoded(640, 480, brightness=0.2)
+        dark = cv2.imdecode(np.frombuffer(dark_bytes, np.uint8), cv2.IMREAD_COLOR)
+        assert service.decode_image(dark_bytes).mean() > dark.mean() + 5
+
+        bright_bytes = encoded(640, 480)
+        bright = cv2.imdecode(np.frombuffer(bright_bytes, np.uint8), cv2.IMREAD_COLOR)
+        assert np.array_equal(service.decode_image(bright_bytes), bright)
+
+    def test_raw_nv21_frame(self):
+        """An NV21 buffer converts to the target size, like the image it came from."""
+        service = ImageService()
+        image = gradient(1280, 960)
+
+        decoded = service.decode_raw(to_nv21(image), 'nv21', 1280, 960)
+        reference = cv2.resize(image, (service.target_width, service.target_height))
+
+        assert decoded.shape == reference.shape
+        assert np.abs(decoded.astype(np.int16) - reference).mean() < 4.0
+
+    def test_raw_gray_frame(self):
+        """A grayscale buffer becomes a 3-channel image."""
+        service = ImageService()
+        gray = cv2.cvtColor(gradient(service.target_width, service.target_height), cv2.COLOR_BGR2GRAY)
+
+        decoded = service.decode_frame(gray.tobytes(), 'GRAY', service.target_width, service.target_height)
+
+        assert decoded.shape == (service.target_height, service.target_width, 3)
+        assert np.array_equal(decoded[:, :, 0], gray)
+
+    def test_raw_frame_validation(self):
+        """Bad formats, sizes and lengths are reported instead of decoded."""
+        assert raw_frame_error('nv21', 640, 480, 640 * 480 * 3 // 2) is None
+        assert raw_frame_error('gray', 641, 480, 641 * 480) is None
+        assert 'Unsupported' in raw_frame_error('rgb565', 640, 480, 0)
+        assert 'even' in raw_frame_error('nv21', 641, 480, 641 * 480 * 3 // 2)
+        assert 'bytes' in raw_frame_error('yuv420', 640, 480, 640 * 480)
+        assert raw_frame_error('gray', None, 480, 0) is not None
+        assert ImageService().decode_raw(b'\x00' * 10, 'nv21', 640, 480) is None
+
+    def test_colormap_uses_fixed_depth_range(self):
+        """The same distance gets the same color whatever else is in the frame."""
+        service = ImageService()
+        near = np.full((48, 64), 1.0, dtype=np.float32)
+        mixed = near.copy()
+        mixed[:, 32:] = 4.0
+
+        lut = service.colormap_luts['JET']
+        colored = service.apply_colormap(mixed, 'JET', depth_range=(0.5, 5.0))
+
+        assert np.array_equal(service.apply_colormap(near, 'JET', depth_range=(0.5, 5.0))[:, :32], colored[:, :32])
+        assert np.array_equal(colored[0, 0], lut[round(0.5 / 4.5 * 255), 0])
+        # Close is hot (red), far is cold (blue)
+        assert colored[0, 0, 2] > colored[0, 0, 0] and colored[0, -1, 0] > colored[0, -1, 2]
+
+    def test_encode_jpeg_round_trip(self):
+        """Encoded visualization decodes back to the same image."""
+        image = gradient(320, 240)
+        decoded = cv2.imdecode(np.frombuffer(encode_jpeg(image), np.uint8), cv2.IMREAD_COLOR)
+        assert np.abs(decoded.astype(np.int16) - image).mean() < 2.0
@@ -4,6 +4,7 @@ Unit tests for object detection service.
 
 import pytest
 import numpy as np
+import yaml
 from unittest.mock import MagicMock, patch
 
 import sys
@@ -158,3 +159,73 @@ class TestObjectDetectionService:
         # Should handle gracefully
         result = service.detect(np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8))
         assert isinstance(result, list)
+    
+    def test_parse_boxes_vectorized(self, monkeypatch):
+        """Test vectorized box parsing: regions, priorities, distances and ordering."""
+        service = ObjectDetectionService()
+        monkeypatch.setattr(service.settings, 'object_distance_method', 'center')
+        service._build_class_tables({0: 'person', 1: 'chair', 2: 'mystery'})
+        
+        depth_map = np.full((480, 640), 3.0, dtype=np.float32)
+        depth_map[240, 320] = 1.5
+        
+        # [x1, y1, x2, y2, conf, cls]
+        data = np.array([
+            [0, 0, 100, 100, 0.9, 2],       # left, default priority 5
+            [300, 220, 340, 260, 0.6, 0],   # center, person (10)
+            [600, 400, 700, 600, 0.95, 1],  # right, chair (8), center clamped to the map
+        ], dtype=np.float32)
+        
+        detections = service.parse_boxes(data, (480, 640), max_objects=2, depth_map=depth_map)
+        
+        assert [d['name'] for d in detections] == ['person', 'chair']
+        assert detections[0]['region'] == 'center'
+        assert detections[0]['distance'] == 1.5
+        assert detections[0]['direction_message'] == "Önünüzde insan var. Durun!"
+        assert detections[1]['region'] == 'right'
+        assert detections[1]['priority'] == 8
+        assert detections[1]['distance'] == 3.0
+        assert detections[1]['bbox'] == [600.0, 400.0, 700.0, 600.0]
+    
+    def test_detection_tiers(self):
+        """Test tier resolution and the navigation class whitelist."""
+        service = ObjectDetectionService()
+        service._build_class_tables({0: 'person', 1: 'bottle', 2: 'chair'})
+        
+        assert service._navigation_class_ids == [0, 2]
+        assert service.resolve_tier('fast') == 'fast'
+        assert service.resolve_tier('no-such-tier') == service.settings.detection_tier
+        assert service.get_tier_config('fast')['imgsz'] < service.get_tier_config('full')['imgsz']
+    
+    @pytest.mark.parametrize("backend", ["pytorch", "openvino_static", "openvino_dynamic"])
+    @pytest.mark.parametrize("tier", ["full", "navigation", "fast"])
+    def test_tiers_run_on_every_backend(self, tmp_path, backend, tier):
+        """Every tier returns detections on every backend; a static IR gets its export size."""
+        export_size = [640, 640]
+        if backend != "pytorch":
+            metadata = {'imgsz': export_size, 'args': {'dynamic': backend == "openvino_dynamic"}}
+            (tmp_path / "metadata.yaml").write_text(yaml.safe_dump(metadata))
+        
+        service = ObjectDetectionService()
+        service._build_class_tables({0: 'person'})
+        service.static_imgsz = (
+            ObjectDetectionService._static_export_size(tmp_path) if backend != "pytorch" else None
+        )
+        
+        def model(image, imgsz, **kwargs):
+            if backend == "openvino_static" and list(np.broadcast_to(imgsz, 2)) != export_size:
+                raise RuntimeError(f"static IR expects {export_size}, got {imgsz}")
+            result = MagicMock()
+            result.boxes.data.cpu.return_value.numpy.return_value = np.array(
+                [[10, 10, 50, 90, 0.9, 0]], dtype=np.float32
+            )
+            result.boxes.__len__.return_value = 1
+            model.imgsz = imgsz
+            return [result]
+        
+        service.model = model
+        detections = service.detect(np.zeros((480, 640, 3), dtype=np.uint8), tier=tier)
+        
+        assert [d['name'] for d in detections] == ['person']
+        expected = export_size if backend == "openvino_static" else service.get_tier_config(tier)['imgsz']
+        assert model.imgsz == expected
@@ -0,0 +1,137 @@
+"""
+Unit tests for the object tracking service.
+"""
+
+import pytest
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import services.object_tracking_service as tracking_module
+from services.object_tracking_service import ObjectTrackingService, TrackStore, iou_matrix
+
+
+def make_detection(name, bbox, distance=2.0):
+    return {'name': name, 'bbox': bbox, 'confidence': 0.9, 'distance': distance}
+
+
+class TestObjectTrackingService:
+    """Test suite for ObjectTrackingService."""
+    
+    def test_iou_matrix(self):
+        """Pairwise IoU against hand-computed values."""
+        a = np.array([[0, 0, 10, 10], [100, 100, 110, 110]], dtype=float)
+        b = np.array([[5, 0, 15, 10], [0, 0, 10, 10]], dtype=float)
+        iou = iou_matrix(a, b)
+        
+        assert iou.shape == (2, 2)
+        assert iou[0, 0] == pytest.approx(50 / 150)
+        assert iou[0, 1] == pytest.approx(1.0)
+        assert iou[1].sum() == 0.0
+    
+    def test_same_class_objects_get_separate_tracks(self):
+        """Two people keep their own track ids while walking."""
+        tracker = ObjectTrackingService()
+        
+        ids = None
+        for step in range(5):
+            infos = tracker.update([
+                make_detection('person', [100 + 5 * step, 100, 160 + 5 * step, 300]),
+                make_detection('person', [400 - 5 * step, 100, 460 - 5 * step, 300]),
+            ])
+            step_ids = [info['track_id'] for info in infos]
+            assert step_ids[0] != step_ids[1]
+            if ids is not None:
+                assert step_ids == ids
+            ids = step_ids
+        
+        assert all(info['confirmed'] for info in infos)
+        assert len(tracker.get_confirmed_objects()) == 2
+    
+    def test_order_follows_detections(self):
+        """Track info is aligned with the detection order, not the track order."""
+        tracker = ObjectTrackingService()
+        a = make_detection('person', [100, 100, 160, 300])
+        b = make_detection('car', [400, 100, 600, 250])
+        
+        first = tracker.update([a, b])
+        swapped = tracker.update([b, a])
+        
+        assert swapped[0]['track_id'] == first[1]['track_id']
+        assert swapped[1]['track_id'] == first[0]['track_id']
+    
+    def test_class_change_starts_new_track(self):
+        """A detection of another class never continues an existing track."""
+        tracker = ObjectTrackingService()
+        
+        first = tracker.update([make_detection('person', [100, 100, 160, 300])])
+        second = tracker.update([make_detection('dog', [100, 100, 160, 300])])
+        
+        assert first[0]['track_id'] != second[0]['track_id']
+        assert tracker.num_tracks == 2
+    
+    def test_track_store_ring_buffer_statistics(self):
+        """Vectorized statistics match a per-track computation after the ring wraps."""
+        store = TrackStore(capacity=2, history=4)
+        slots = store.allocate_slots(3)
+        assert store.capacity == 4
+        
+        rng = np.random.default_rng(0)
+        history = {slot: [] for slot in slots.tolist()}
+        for step in range(6):
+            centers = rng.uniform(0, 20, (3, 2))
+            distances = rng.uniform(1, 5, 3)
+            store.push(slots, centers, np.full(3, 0.8), distances, now=float(step))
+            for i, slot in enumerate(slots.tolist()):
+                history[slot].append((centers[i], distances[i]))
+        store.update_stability(slots)
+        
+        velocity = store.velocity(slots)
+        averages = store.average(store.distances, slots)
+        for i, slot in enumerate(slots.tolist()):
+            recent = history[slot][-4:]
+            positions = np.array([c for c, _ in recent])
+            distances = [d for _, d in recent]
+            expected = np.clip(1.0 - np.var(positions, axis=0).mean() / 100.0, 0.0, 1.0)
+            assert store.stability[slot] == pytest.approx(expected)
+            assert averages[i] == pytest.approx(np.mean(distances))
+            assert velocity[i] == pytest.approx(positions[-1] - positions[-2])
+        
+        store.release(slots[:1])
+        assert store.allocate_slots(1).tolist() == slots[:1].tolist()
+    
+    def test_time_to_collision_constant_approach(self, monkeypatch):
+        """An object closing at 1 m/s, 10 fps: TTC ~ distance, box grows as 1/distance."""
+        clock = [1000.0]
+        monkeypatch.setattr(tracking_module.time, 'time', lambda: clock[0])
+        tracker = ObjectTrackingService()
+        
+        for step in range(20):
+            distance = 8.0 - 0.1 * step
+            half = 100.0 / distance
+            infos = tracker.update([make_detection('person', [320 - half, 240 - 2 * half, 320 + half, 240 + 2 * half], distance)])
+            clock[0] += 0.1
+        
+        info = infos[0]
+        assert info['radial_velocity'] == pytest.approx(-1.0, rel=0.05)
+        assert info['time_to_collision'] == pytest.approx(distance, rel=0.05)
+        assert info['is_approaching']
+    
+    def test_static_object_has_no_time_to_collision(self, monkeypatch):
+        """A static object: no closing speed, no TTC, not approaching."""
+        clock = [1000.0]
+        monkeypatch.setattr(tracking_module.time, 'time', lambda: clock[0])
+        tracker = ObjectTrackingService()
+        
+        first = tracker.update([make_detection('chair', [100, 100, 160, 200], 3.0)])
+        assert first[0]['radial_velocity'] is None
+        
+        for _ in range(5):
+            clock[0] += 0.1
+            infos = tracker.update([make_detection('chair', [100, 100, 160, 200], 3.0)])
+        
+        assert infos[0]['radial_velocity'] == pytest.approx(0.0)
+        assert infos[0]['time_to_collision'] is None
+        assert not infos[0]['is_approaching']
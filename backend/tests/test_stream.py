@@ -0,0 +1,117 @@
+"""
+Unit tests for the shared MJPEG publisher.
+"""
+
+import asyncio
+
+import pytest
+import numpy as np
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.state import app_state
+from routers.stream import FramePublisher, render_depth, render_video
+
+
+class FakeRequest:
+    """Just enough of starlette's Request for FramePublisher.frames."""
+
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+@pytest.fixture
+def publisher():
+    calls = []
+
+    def render(snapshot):
+        calls.append(snapshot['version'])
+        return f"jpeg {snapshot['version']}".encode()
+
+    publisher = FramePublisher(render, "Test feed", max_fps=1000.0)
+    publisher.calls = calls
+    return publisher
+
+
+def update():
+    app_state.update_state(np.zeros((48, 64, 3), dtype=np.uint8), np.ones((48, 64), dtype=np.float32))
+
+
+class TestFramePublisher:
+    """Test suite for FramePublisher."""
+
+    def test_viewers_share_one_render_per_version(self, publisher):
+        """Each app_state version is rendered once and every viewer gets the same bytes."""
+        async def scenario():
+            viewers = [publisher.frames(FakeRequest()) for _ in range(3)]
+            first = await asyncio.gather(*(anext(v) for v in viewers))
+
+            update()
+            second = await asyncio.gather(*(anext(v) for v in viewers))
+
+            for viewer in viewers:
+                await viewer.aclose()
+            return first, second
+
+        first, second = asyncio.run(scenario())
+
+        assert len(set(first)) == 1 and len(set(second)) == 1
+        assert first[0] != second[0]
+        assert len(publisher.calls) == 2
+        assert second[0].startswith(b'--frame') and second[0].endswith(b'\r\n')
+
+    def test_idle_feed_renders_nothing(self, publisher):
+        """Without state updates, connected viewers cause no further renders."""
+        async def scenario():
+            viewer = publisher.frames(FakeRequest())
+            await anext(viewer)
+            waiting = asyncio.ensure_future(anext(viewer))
+            await asyncio.sleep(0.1)
+            assert not waiting.done()
+
+            # Cancelled like starlette does when the client disconnects
+            waiting.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiting
+
+        asyncio.run(scenario())
+        assert len(publisher.calls) == 1
+        assert publisher.subscribers == 0
+
+    def test_disconnected_viewer_is_cleaned_up(self, publisher, monkeypatch):
+        """A viewer that went away ends its stream; the last one stops the render task."""
+        monkeypatch.setattr('routers.stream.DISCONNECT_POLL_S', 0.01)
+        listeners = len(app_state._listeners)
+
+        async def scenario():
+            request = FakeRequest()
+            viewer = publisher.frames(request)
+            await anext(viewer)
+            assert publisher.subscribers == 1
+
+            request.disconnected = True
+            with pytest.raises(StopAsyncIteration):
+                await anext(viewer)
+            await asyncio.sleep(0)
+
+        asyncio.run(scenario())
+        assert publisher.subscribers == 0 and publisher._task is None
+        assert len(app_state._listeners) == listeners
+
+    def test_render_does_not_draw_on_shared_frame(self):
+        """Detection boxes are drawn on a copy of the frame held by app_state."""
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        snapshot = {
+            'frame': frame,
+            'depth': np.linspace(0.5, 5.0, 120 * 160, dtype=np.float32).reshape(120, 160),
+            'analysis': {'objects': [{'name': 'chair', 'confidence': 0.9, 'bbox': [10, 30, 80, 100]}]}
+        }
+
+        assert render_video(snapshot)[:2] == b'\xff\xd8'
+        assert render_depth(snapshot)[:2] == b'\xff\xd8'
+        assert not frame.any()
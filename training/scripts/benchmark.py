@@ -0,0 +1,66 @@
+"""
+Gören Göz - Export Variant Benchmark
+
+Her export varyantı (PyTorch, ONNX, OpenVINO FP16/INT8) için validate.py ile mAP50
+ve CPU gecikmesini yan yana raporlar.
+
+Kullanım:
+    python scripts/benchmark.py --models-dir ../backend/models
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from ultralytics import YOLO
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from export import ARTIFACT_NAMES
+from validate import validate
+
+VARIANTS = [('pytorch', 'yolo11n_turkish.pt')] + [(fmt, name) for fmt, name in ARTIFACT_NAMES.items()]
+
+
+def cpu_latency_ms(model_path, imgsz, iters):
+    """Mean single-image predict latency on CPU (preprocess + inference + NMS)."""
+    model = YOLO(model_path, task='detect')
+    image = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+
+    for _ in range(3):
+        model(image, imgsz=imgsz, device='cpu', verbose=False)
+
+    start = time.perf_counter()
+    for _ in range(iters):
+        model(image, imgsz=imgsz, device='cpu', verbose=False)
+    return (time.perf_counter() - start) * 1000 / iters
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--models-dir', type=str, default='../backend/models')
+    parser.add_argument('--data', type=str, default='configs/dataset.yaml')
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--iters', type=int, default=50)
+    args = parser.parse_args()
+
+    rows = []
+    for variant, name in VARIANTS:
+        path = Path(args.models_dir) / name
+        if not path.exists():
+            print(f"⏭️  {variant}: {path} bulunamadı")
+            continue
+
+        # Aynı cihazda (CPU) ölç: OpenVINO/ONNX varyantları ile adil karşılaştırma
+        metrics = validate(str(path), args.data, args.imgsz, device='cpu')
+        rows.append((variant, metrics.box.map50, metrics.box.map, cpu_latency_ms(str(path), args.imgsz, args.iters)))
+
+    print(f"\n{'variant':>14} | {'mAP50':>7} | {'mAP50-95':>8} | {'CPU ms':>8}")
+    for variant, map50, map5095, ms in rows:
+        print(f"{variant:>14} | {map50:7.4f} | {map5095:8.4f} | {ms:8.1f}")
+
+
+if __name__ == '__main__':
+    main()
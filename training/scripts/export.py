@@ -1,5 +1,9 @@
 """
 Gören Göz - Model Export Script
+
+Kullanım:
+    python scripts/export.py --model runs/train/goren_goz_turkish_v1/weights/best.pt
+    python scripts/export.py --model best.pt --formats openvino_fp16 openvino_int8 --fraction 0.2
 """
 
 import argparse
@@ -7,24 +11,51 @@ import shutil
 from pathlib import Path
 from ultralytics import YOLO
 
+# Backend'in aradığı artefakt adları (ObjectDetectionService)
+ARTIFACT_NAMES = {
+    'onnx': 'yolo11n_turkish.onnx',
+    'openvino_fp16': 'yolo11n_turkish_openvino_fp16',
+    'openvino_int8': 'yolo11n_turkish_openvino_int8',
+}
+
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--model', type=str, required=True)
-    parser.add_argument('--output', type=str, default='../../backend/models')
+    parser.add_argument('--output', type=str, default='../backend/models')
+    parser.add_argument('--formats', type=str, nargs='+', default=['onnx', 'openvino_fp16', 'openvino_int8'],
+                        choices=list(ARTIFACT_NAMES))
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--data', type=str, default='configs/dataset.yaml',
+                        help='INT8 kalibrasyonu için dataset config')
+    parser.add_argument('--fraction', type=float, default=0.2,
+                        help='INT8 kalibrasyonunda kullanılacak eğitim seti oranı')
     args = parser.parse_args()
-    
+
     model = YOLO(args.model)
     output = Path(args.output)
     output.mkdir(exist_ok=True)
-    
+
     # PyTorch copy
     shutil.copy(args.model, output / 'yolo11n_turkish.pt')
     print(f"✅ Exported to {output / 'yolo11n_turkish.pt'}")
-    
-    # ONNX export
-    model.export(format='onnx', opset=17)
-    print("✅ ONNX export done")
+
+    for fmt in args.formats:
+        if fmt == 'onnx':
+            exported = model.export(format='onnx', opset=17, imgsz=args.imgsz)
+        elif fmt == 'openvino_fp16':
+            # Dinamik giriş: backend katmanları farklı imgsz (640/480/320) kullanır
+            exported = model.export(format='openvino', half=True, dynamic=True, imgsz=args.imgsz)
+        else:
+            # NNCF post-training quantization on a calibration subset of the training set
+            exported = model.export(format='openvino', int8=True, dynamic=True, data=args.data,
+                                    fraction=args.fraction, imgsz=args.imgsz)
+
+        target = output / ARTIFACT_NAMES[fmt]
+        if target.exists():
+            shutil.rmtree(target) if target.is_dir() else target.unlink()
+        shutil.move(str(exported), str(target))
+        print(f"✅ {fmt} export done: {target}")
 
 
 if __name__ == '__main__':
@@ -6,14 +6,24 @@ import argparse
 from ultralytics import YOLO
 
 
+def validate(model_path, data='configs/dataset.yaml', imgsz=640, device=None):
+    """Validate a .pt / ONNX / OpenVINO artifact, returns ultralytics DetMetrics.
+
+    device=None lets ultralytics pick (GPU if available).
+    """
+    model = YOLO(model_path, task='detect')
+    return model.val(data=data, imgsz=imgsz, device=device, plots=False)
+
+
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--model', type=str, required=True)
     parser.add_argument('--data', type=str, default='configs/dataset.yaml')
+    parser.add_argument('--imgsz', type=int, default=640)
+    parser.add_argument('--device', type=str, default=None, help='cpu, 0, 0,1 ... (varsayılan: otomatik)')
     args = parser.parse_args()
     
-    model = YOLO(args.model)
-    metrics = model.val(data=args.data)
+    metrics = validate(args.model, args.data, args.imgsz, args.device)
     
     print(f"\nmAP50: {metrics.box.map50:.4f}")
     print(f"mAP50-95: {metrics.box.map:.4f}")